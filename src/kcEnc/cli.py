@@ -0,0 +1,367 @@
+"""kcEnc komut satırı arayüzü (Qt gerektirmez).
+
+Örnekler:
+    python -m kcEnc list Kasam --json
+    printf '%s\\n' "$PAROLA" | python -m kcEnc add Kasam --password-stdin --jobs 4 tarama/*.pdf
+    python -m kcEnc extract Kasam ./cikti --password-fd 3 3<parola.txt
+    python -m kcEnc verify Kasam --password-stdin --jobs 8 < parola.txt
+    python -m kcEnc watch Kasam ~/Gelen --remove-sources --password-fd 3 3<parola.txt
+
+Hızlı başlangıç için çekirdek modüller (cryptography, sqlite3) yalnızca
+ilgili alt komut çalışırken import edilir.
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import sys
+
+EXIT_OK = 0
+EXIT_PARTIAL_FAILURE = 1
+EXIT_USAGE_ERROR = 2
+
+
+class CliError(Exception):
+    """Kullanıcıya gösterilip EXIT_USAGE_ERROR ile çıkılacak hata."""
+
+
+def _read_password(args) -> str:
+    """Parolayı --password-fd, --password-stdin veya etkileşimli istemden okur."""
+    if args.password_fd is not None:
+        try:
+            with os.fdopen(args.password_fd, 'r', closefd=False) as f:
+                line = f.readline()
+        except OSError as e:
+            raise CliError(f"Parola dosya tanımlayıcısından okunamadı (fd {args.password_fd}): {e}")
+    elif args.password_stdin:
+        line = sys.stdin.readline()
+    elif sys.stdin.isatty():
+        import getpass
+        line = getpass.getpass(f"'{args.vault}' parolası: ")
+    else:
+        raise CliError("Parola gerekli: --password-stdin veya --password-fd kullanın.")
+    password = line.rstrip('\r\n')
+    if not password:
+        raise CliError("Parola boş olamaz.")
+    return password
+
+
+def _unlock(args) -> bytes:
+    from .core import vault_manager
+    password = _read_password(args)
+    key = vault_manager.unlock_vault(args.vault, password)
+    if not key:
+        raise CliError(f"'{args.vault}' kasası açılamadı: geçersiz parola veya yapılandırma hatası.")
+    return key
+
+
+def _require_vault(vault_name: str):
+    from .core import vault_manager
+    if vault_manager.load_vault_config(vault_name) is None:
+        raise CliError(f"'{vault_name}' isimli kasa bulunamadı.")
+
+
+def _measure_peak(func):
+    """Tek bir işlemin Python tarafındaki tepe bellek kullanımını sonuca `peak_bytes` olarak ekler."""
+    import tracemalloc
+
+    def wrapper(item):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = func(item)
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1] - base
+        return result
+    return wrapper
+
+
+def _run_parallel(func, items, jobs: int) -> list:
+    """func'ı items üzerinde en fazla `jobs` thread ile çalıştırır, sırayı korur.
+
+    --memory-stats açıksa ve işlemler sıralı çalışıyorsa her sonuca işlem başına tepe bellek eklenir
+    (paralel çalışmada tracemalloc tepe değeri işlemler arasında ayrıştırılamaz).
+    """
+    import tracemalloc
+    if jobs <= 1 or len(items) <= 1:
+        if tracemalloc.is_tracing():
+            func = _measure_peak(func)
+        return [func(item) for item in items]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="kcEnc-cli") as executor:
+        return list(executor.map(func, items))
+
+
+def _format_timestamp(value) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else ""
+
+
+# --- Alt Komutlar --- #
+
+def cmd_list(args, out) -> int:
+    from .core import vault_manager
+    _require_vault(args.vault)
+    _unlock(args) # Dosya adları şifreli saklanır; listelemek için kasa açılmalı
+    files = vault_manager.list_files_in_vault(args.vault)
+    if args.json:
+        json.dump([{
+            "id": f['id'],
+            "name": f['original_filename'],
+            "type": f.get('file_type'),
+            "size": f.get('size_bytes'),
+            "created_at": _format_timestamp(f.get('created_at')),
+            "modified_at": _format_timestamp(f.get('modified_at')),
+        } for f in files], out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    else:
+        for f in files:
+            out.write(f"{f['id']}\t{f.get('size_bytes', '')}\t{_format_timestamp(f.get('modified_at'))}\t{f['original_filename']}\n")
+    return EXIT_OK
+
+
+def cmd_add(args, out) -> int:
+    from pathlib import Path
+    from .core import vault_manager
+    _require_vault(args.vault)
+    key = _unlock(args)
+
+    def add_one(path_str):
+        path = Path(path_str)
+        file_id = vault_manager.add_file_to_vault(args.vault, key, path)
+        return {"source": str(path), "id": file_id, "ok": file_id is not None}
+
+    results = _run_parallel(add_one, args.files, args.jobs)
+    _emit_results(args, out, results, lambda r: f"{r['id'] or '-'}\t{r['source']}")
+    return EXIT_OK if all(r['ok'] for r in results) else EXIT_PARTIAL_FAILURE
+
+
+def cmd_extract(args, out) -> int:
+    from pathlib import Path
+    from .core import vault_manager
+    from .core.bulk_extract import extract_files
+    _require_vault(args.vault)
+    key = _unlock(args)
+
+    file_ids = None
+    if args.ids:
+        listing = vault_manager.list_files_in_vault(args.vault)
+        missing = [file_id for file_id in args.ids if file_id not in listing]
+        if missing:
+            raise CliError(f"Bilinmeyen dosya ID'leri: {', '.join(missing)}")
+        file_ids = args.ids
+
+    dest_dir = Path(args.dest)
+    report = extract_files(args.vault, key, dest_dir, file_ids, max_workers=args.jobs)
+    if report is None:
+        raise CliError(f"Hedef dizin oluşturulamadı: {dest_dir}")
+    results = [{"id": r.file_id, "target": str(r.target), "ok": r.ok} for r in report.results]
+    _emit_results(args, out, results, lambda r: f"{r['id']}\t{r['target']}")
+    print(f"kcEnc: {report.succeeded}/{len(results)} dosya, {_format_bytes(report.total_bytes)}, "
+          f"{report.elapsed:.1f} s ({_format_bytes(int(report.bytes_per_second))}/s)", file=sys.stderr)
+    return EXIT_OK if not report.failed else EXIT_PARTIAL_FAILURE
+
+
+def cmd_watch(args, out) -> int:
+    import time
+    from pathlib import Path
+    from .core.watch_folder import WatchFolderIngest
+    _require_vault(args.vault)
+    folder = Path(args.folder)
+    if not folder.is_dir():
+        raise CliError(f"İzlenecek klasör bulunamadı: {folder}")
+    key = _unlock(args)
+
+    def report_batch(report):
+        for source, file_id in report.added:
+            removed = " (kaynak silindi)" if source in report.removed else ""
+            out.write(f"OK\t{file_id}\t{source}{removed}\n")
+        for source in report.failed:
+            out.write(f"FAIL\t-\t{source}\n")
+        out.flush()
+
+    watcher = WatchFolderIngest(args.vault, key, folder, remove_sources=args.remove_sources,
+                                poll_interval=args.interval, settle_seconds=args.settle,
+                                max_workers=args.jobs, on_batch=report_batch)
+    if args.once:
+        # Tek geçiş: dosyaların oturması için iki tarama gerekir
+        watcher.scan()
+        time.sleep(args.settle)
+        report = watcher.run_once()
+        return EXIT_PARTIAL_FAILURE if report and report.failed else EXIT_OK
+    watcher.start()
+    try:
+        while watcher.is_running:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return EXIT_OK
+
+
+def cmd_rm(args, out) -> int:
+    from .core import vault_manager
+    _require_vault(args.vault)
+    deleted = set(vault_manager.remove_files_from_vault(args.vault, args.ids))
+    # Süreç kapanmadan şifreli dosyaları da sil (başarısızlar kuyrukta kalır, kasa açılınca yeniden denenir)
+    vault_manager.drain_pending_unlinks(args.vault)
+    results = [{"id": file_id, "ok": file_id in deleted} for file_id in args.ids]
+    _emit_results(args, out, results, lambda r: r['id'])
+    return EXIT_OK if all(r['ok'] for r in results) else EXIT_PARTIAL_FAILURE
+
+
+def cmd_verify(args, out) -> int:
+    from .core import vault_manager
+    _require_vault(args.vault)
+    key = _unlock(args)
+
+    files = vault_manager.list_files_in_vault(args.vault)
+
+    def verify_one(file_info):
+        metadata = vault_manager.get_file_metadata(args.vault, file_info['id'])
+        ok = metadata is not None and vault_manager.verify_file(args.vault, key, metadata)
+        return {"id": file_info['id'], "name": file_info['original_filename'], "ok": ok}
+
+    results = _run_parallel(verify_one, files, args.jobs)
+    # Sadece rapor: yetim dosyalara ve sahipsiz kayıtlara dokunma
+    report = vault_manager.reconcile_vault(args.vault, remove_orphans=False) or {}
+    orphans = report.get("orphans", [])
+    dangling = report.get("dangling", [])
+
+    if args.json:
+        json.dump({"files": results, "orphans": orphans, "dangling": dangling}, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    else:
+        for r in results:
+            out.write(f"{'OK' if r['ok'] else 'FAIL'}\t{r['id']}\t{r['name']}\n")
+        for name in orphans:
+            out.write(f"ORPHAN\t{name}\n")
+        for file_id in dangling:
+            out.write(f"DANGLING\t{file_id}\n")
+    failed = not report or orphans or dangling or not all(r['ok'] for r in results)
+    return EXIT_PARTIAL_FAILURE if failed else EXIT_OK
+
+
+def _emit_results(args, out, results: list, text_line):
+    if args.json:
+        json.dump(results, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    else:
+        for r in results:
+            peak = f"\t{_format_bytes(r['peak_bytes'])}" if "peak_bytes" in r else ""
+            out.write(f"{'OK' if r['ok'] else 'FAIL'}\t{text_line(r)}{peak}\n")
+
+
+def _format_bytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MiB"
+
+
+def _report_memory_stats():
+    """Komutun toplam tepe bellek kullanımını stderr'e yazar."""
+    import resource
+    import tracemalloc
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        max_rss *= 1024 # Linux'ta KiB, macOS'ta byte
+    print(f"kcEnc: bellek: Python tepe {_format_bytes(peak)}, süreç tepe RSS {_format_bytes(max_rss)}", file=sys.stderr)
+
+
+# --- Argüman Ayrıştırma --- #
+
+def build_parser() -> argparse.ArgumentParser:
+    def add_common_options(p, default):
+        p.add_argument("--json", action="store_true", default=default, help="Makine tarafından okunabilir JSON çıktı üret")
+        p.add_argument("-v", "--verbose", action="store_true", default=default, help="Çekirdek log mesajlarını stderr'e yaz")
+        p.add_argument("--memory-stats", action="store_true", default=default,
+                       help="İşlem başına ve toplam tepe bellek kullanımını raporla (tracemalloc)")
+
+    parser = argparse.ArgumentParser(prog="kcEnc", description="kcEnc kasalarını komut satırından yönetir.")
+    add_common_options(parser, False)
+    # Ortak seçenekler alt komuttan sonra da yazılabilir ("kcEnc list Kasam --json").
+    # Alt komutta verilmezlerse SUPPRESS sayesinde üst seviyedeki değer ezilmez.
+    common = argparse.ArgumentParser(add_help=False)
+    add_common_options(common, argparse.SUPPRESS)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_parser = functools.partial(subparsers.add_parser, parents=[common])
+
+    def add_password_options(p):
+        group = p.add_mutually_exclusive_group()
+        group.add_argument("--password-stdin", action="store_true", help="Parolayı stdin'in ilk satırından oku")
+        group.add_argument("--password-fd", type=int, metavar="FD", help="Parolayı verilen dosya tanımlayıcısından oku")
+
+    def add_jobs_option(p):
+        p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                       help="Paralel işçi sayısı (varsayılan: CPU sayısı)")
+
+    p = add_parser("list", help="Kasadaki dosyaları listele")
+    p.add_argument("vault")
+    add_password_options(p)
+    p.set_defaults(func=cmd_list)
+
+    p = add_parser("add", help="Dosyaları kasaya şifreleyerek ekle")
+    p.add_argument("vault")
+    p.add_argument("files", nargs="+")
+    add_password_options(p)
+    add_jobs_option(p)
+    p.set_defaults(func=cmd_add)
+
+    p = add_parser("extract", help="Dosyaları (veya tüm kasayı) bir dizine çıkar")
+    p.add_argument("vault")
+    p.add_argument("dest")
+    p.add_argument("ids", nargs="*", help="Çıkarılacak dosya ID'leri (boşsa tümü)")
+    add_password_options(p)
+    add_jobs_option(p)
+    p.set_defaults(func=cmd_extract)
+
+    p = add_parser("watch", help="Bir klasörü izleyip bırakılan dosyaları kasaya ekle (Ctrl+C ile durur)")
+    p.add_argument("vault")
+    p.add_argument("folder")
+    p.add_argument("--remove-sources", action="store_true",
+                   help="Şifreli kopya doğrulandıktan sonra şifresiz kaynak dosyayı sil")
+    p.add_argument("--interval", type=float, default=2.0, help="Tarama aralığı, saniye (varsayılan: 2)")
+    p.add_argument("--settle", type=float, default=3.0,
+                   help="Boyutu bu kadar saniye değişmeyen dosya eklenir (varsayılan: 3)")
+    p.add_argument("--once", action="store_true", help="Klasörü bir kez işle ve çık")
+    add_password_options(p)
+    add_jobs_option(p)
+    p.set_defaults(func=cmd_watch)
+
+    p = add_parser("rm", help="Dosyaları kasadan sil")
+    p.add_argument("vault")
+    p.add_argument("ids", nargs="+")
+    p.set_defaults(func=cmd_rm)
+
+    p = add_parser("verify", help="Tüm dosyaların bütünlüğünü doğrula")
+    p.add_argument("vault")
+    add_password_options(p)
+    add_jobs_option(p)
+    p.set_defaults(func=cmd_verify)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, "jobs", 1) < 1:
+        print("kcEnc: hata: --jobs en az 1 olmalı.", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+
+    out = sys.stdout
+    # Çekirdek modüller print ile log basar; stdout makine çıktısına ayrıldığı için
+    # bu mesajlar --verbose ile stderr'e, aksi halde hiçbir yere gider.
+    log_target = sys.stderr if args.verbose else open(os.devnull, 'w')
+    if args.memory_stats:
+        import tracemalloc
+        tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(log_target):
+            return args.func(args, out)
+    except CliError as e:
+        print(f"kcEnc: hata: {e}", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+    finally:
+        if log_target is not sys.stderr:
+            log_target.close()
+        if args.memory_stats:
+            _report_memory_stats()
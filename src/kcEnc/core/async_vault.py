@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from . import vault_manager
+from . import database_manager
+from .vault_lock import acquire_write_lock, release_write_lock, VaultBusyError
+from .unlink_queue import schedule_pending_unlinks
+from .file_listing import FileListing
+from .file_stream import DecryptedFileStream
+
+
+def _close_stream(stream: DecryptedFileStream, chunks):
+    """Yarım kalan parça üreticisini (havuzdan aldığı tamponu geri verir) ve akışı kapatır."""
+    try:
+        chunks.close()
+    finally:
+        stream.close()
+
+
+class AsyncVault:
+    """vault_manager/database_manager için asyncio arayüzü.
+
+    Kriptografi ve dosya G/Ç'si yönetilen bir thread havuzunda, SQLite çağrıları
+    ise tek bir ayrılmış thread üzerinde çalışır. Böylece tek bir event loop
+    aynı anda çok sayıda isteğe hizmet verebilir ve SQLite erişimi sıralı kalır.
+
+    Kullanım:
+        async with await AsyncVault.open("Kasam", parola) as vault:
+            file_id = await vault.add_file(Path("rapor.pdf"))
+            async for chunk in vault.stream_file(file_id):
+                ...
+    """
+
+    def __init__(self, vault_name: str, max_workers: Optional[int] = None):
+        self.vault_name = vault_name
+        self._vault_key: Optional[bytes] = None
+        self._io_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kcEnc-io")
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kcEnc-db")
+        self._closed = False
+
+    @classmethod
+    async def open(cls, vault_name: str, password: str, max_workers: Optional[int] = None) -> "AsyncVault":
+        """Kasayı açar; parola geçersizse ValueError fırlatır."""
+        vault = cls(vault_name, max_workers=max_workers)
+        if not await vault.unlock(password):
+            await vault.close()
+            raise ValueError(f"'{vault_name}' kasası açılamadı: geçersiz parola veya yapılandırma hatası.")
+        return vault
+
+    async def __aenter__(self) -> "AsyncVault":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def is_unlocked(self) -> bool:
+        return self._vault_key is not None
+
+    # --- Yardımcılar --- #
+
+    async def _run_io(self, func, *args) -> Any:
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, functools.partial(func, *args))
+
+    async def _run_db(self, func, *args) -> Any:
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, functools.partial(func, *args))
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError(f"'{self.vault_name}' için AsyncVault kapatılmış.")
+
+    @contextlib.asynccontextmanager
+    async def _write_lock(self):
+        """Kasanın yazar kilidi (bkz. vault_lock); bekleme thread havuzunda yapılır."""
+        await self._run_io(acquire_write_lock, self.vault_name)
+        try:
+            yield
+        finally:
+            await self._run_io(release_write_lock, self.vault_name)
+
+    def _require_key(self) -> bytes:
+        if self._vault_key is None:
+            raise RuntimeError(f"'{self.vault_name}' kasası kilitli.")
+        return self._vault_key
+
+    # --- Kasa İşlemleri --- #
+
+    async def unlock(self, password: str) -> bool:
+        """Anahtar türetmeyi (PBKDF2) thread havuzunda çalıştırarak kasayı açar."""
+        key = await self._run_io(vault_manager.unlock_vault, self.vault_name, password)
+        if key:
+            self._vault_key = key
+            return True
+        return False
+
+    async def add_file(self, source_file_path: Path) -> Optional[str]:
+        """Dosyayı şifreleyip kasaya ekler, başarılıysa dosya ID'sini döndürür."""
+        key = self._require_key()
+        try:
+            async with self._write_lock():
+                file_info = await self._run_io(vault_manager.encrypt_file_into_vault, self.vault_name, key, Path(source_file_path))
+                if not file_info:
+                    return None
+                file_id = await self._run_db(database_manager.add_file_record, self.vault_name, file_info)
+                if not file_id:
+                    await self._run_io(vault_manager.discard_encrypted_file, self.vault_name, file_info['encrypted_filename'])
+                    return None
+                vault_manager.release_uncommitted_files(self.vault_name, [file_info['encrypted_filename']])
+                return file_id
+        except VaultBusyError as e:
+            print(f"HATA: {e}")
+            return None
+
+    async def list_files(self) -> FileListing:
+        """Kasadaki dosyaların ada göre sıralı listesini döndürür."""
+        return await self._run_db(vault_manager.list_files_in_vault, self.vault_name)
+
+    async def get_file_metadata(self, file_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run_db(database_manager.get_file_metadata, self.vault_name, file_id)
+
+    async def read_file(self, file_id: str) -> Optional[bytes]:
+        """Dosyanın şifresini çözüp tüm içeriğini döndürür."""
+        key = self._require_key()
+        metadata = await self.get_file_metadata(file_id)
+        if not metadata:
+            print(f"HATA: Dosya meta verisi bulunamadı (ID: {file_id})")
+            return None
+        return await self._run_io(vault_manager.decrypt_file_from_metadata, self.vault_name, key, metadata)
+
+    async def stream_file(self, file_id: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Dosyanın çözülmüş içeriğini [start, end) aralığında parça parça verir.
+
+        Her parça thread havuzunda okunup çözülür; dosyanın tamamı belleğe alınmaz.
+        Dosya bulunamaz veya açılamazsa FileNotFoundError fırlatır.
+        """
+        key = self._require_key()
+        metadata = await self.get_file_metadata(file_id)
+        if not metadata:
+            raise FileNotFoundError(f"Dosya meta verisi bulunamadı (ID: {file_id})")
+        stream = await self._run_io(vault_manager.open_decrypted_stream, self.vault_name, key, metadata)
+        if stream is None:
+            raise FileNotFoundError(f"Dosya açılamadı (ID: {file_id})")
+        chunks = stream.iter_range(start, end)
+        try:
+            while True:
+                chunk = await self._run_io(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            close = functools.partial(_close_stream, stream, chunks)
+            if self._closed:
+                close() # Thread havuzu kapatılmış: tanıtıcı ve tampon burada bırakılır
+            else:
+                try:
+                    await self._run_io(close)
+                except RuntimeError:
+                    close() # Kapatma bu sırada yapıldı
+
+    async def delete_file(self, file_id: str) -> bool:
+        """Dosyayı kasadan siler (şifreli dosya arka plandaki silme kuyruğunda silinir)."""
+        return file_id in await self.delete_files([file_id])
+
+    async def delete_files(self, file_ids: List[str]) -> List[str]:
+        """Dosyaların kayıtlarını tek transaction'da siler; silinen ID'leri döndürür."""
+        try:
+            async with self._write_lock():
+                deleted = await self._run_db(database_manager.delete_files_and_queue_unlinks, self.vault_name, file_ids)
+        except VaultBusyError as e:
+            print(f"HATA: {e}")
+            return []
+        if deleted:
+            schedule_pending_unlinks(self.vault_name)
+        return deleted or []
+
+    async def close(self):
+        """Anahtarı unutur ve thread havuzlarını kapatır (bekleyen işler tamamlanır)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._vault_key = None
+        await asyncio.to_thread(self._io_executor.shutdown, True)
+        await asyncio.to_thread(self._db_executor.shutdown, True)
+        vault_manager.lock_vault(self.vault_name)
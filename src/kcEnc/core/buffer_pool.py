@@ -0,0 +1,72 @@
+import contextlib
+import threading
+from typing import Dict, Iterator, List
+
+# Havuz başına boşta tutulacak en fazla tampon (fazlası çöpe bırakılır)
+DEFAULT_MAX_IDLE_BUFFERS = 16
+
+
+class BufferPool:
+    """Sabit boyutlu, yeniden kullanılabilir bytearray tamponları.
+
+    Parça parça şifreleme/çözme her parça için yeni bytes nesnesi ayırmak yerine
+    havuzdan aldığı tamponu kullanır; toplu işlemlerde bellek ayırıcı çalkantısı
+    ve RSS sıçramaları böylece azalır. Thread güvenlidir.
+
+    Kullanım:
+        with get_buffer_pool(size).borrow() as buf:
+            n = f.readinto(buf)
+    """
+
+    def __init__(self, buffer_size: int, max_idle: int = DEFAULT_MAX_IDLE_BUFFERS):
+        self.buffer_size = buffer_size
+        self._max_idle = max_idle
+        self._idle: List[bytearray] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bytearray:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return bytearray(self.buffer_size)
+
+    def release(self, buffer: bytearray):
+        if len(buffer) != self.buffer_size:
+            return # Boyutu değiştirilmiş tampon havuza geri alınmaz
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(buffer)
+
+    @contextlib.contextmanager
+    def borrow(self) -> Iterator[bytearray]:
+        buffer = self.acquire()
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    def clear(self):
+        """Boştaki tamponları sıfırlayıp bırakır (örn. kasa kilitlenince; içlerinde düz metin kalmış olabilir)."""
+        with self._lock:
+            for buffer in self._idle:
+                buffer[:] = bytes(len(buffer))
+            self._idle.clear()
+
+
+_pools: Dict[int, BufferPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_buffer_pool(buffer_size: int) -> BufferPool:
+    """Verilen boyut için süreç genelinde paylaşılan havuzu döndürür."""
+    with _pools_lock:
+        pool = _pools.get(buffer_size)
+        if pool is None:
+            pool = _pools[buffer_size] = BufferPool(buffer_size)
+        return pool
+
+
+def clear_buffer_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.clear()
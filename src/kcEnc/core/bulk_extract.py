@@ -0,0 +1,127 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from . import vault_manager
+from .database_manager import get_file_listing, get_files_by_ids, get_file_metadata
+from .progress import ProgressToken
+
+# Çözülen dosyalar parça parça (havuzdaki tamponlarla) yazılır: bellek kullanımı
+# dosya boyutundan bağımsız olarak yaklaşık işçi sayısı x parça boyutu kadardır.
+DEFAULT_FILENAME = "dosya"
+# Dosya adında bulunmaması gereken karakterler (yol ayırıcıları, NUL ve Windows'ta geçersiz olanlar)
+_UNSAFE_FILENAME_CHARS = str.maketrans({c: "_" for c in '/\\\0:*?"<>|'})
+
+
+class ExtractResult(NamedTuple):
+    file_id: str
+    target: Optional[Path]  # Kayıt bulunamadıysa None
+    ok: bool
+
+
+class ExtractReport(NamedTuple):
+    results: List[ExtractResult]
+    total_bytes: int        # Başarıyla çıkarılan düz metin boyutu
+    elapsed: float          # saniye
+    cancelled: bool
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> List[ExtractResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.total_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def safe_filename(filename: str) -> str:
+    """Kasadaki adı hedef dizinin dışına çıkamayacak, tek parçalı bir dosya adına çevirir."""
+    name = filename.translate(_UNSAFE_FILENAME_CHARS).strip()
+    if name in ("", ".", ".."):
+        return DEFAULT_FILENAME
+    return name
+
+
+def unique_target(dest_dir: Path, filename: str, taken: Set[str]) -> Path:
+    """Hedef dizinde çakışmayan güvenli bir yol seçer ("ad (1).ext" biçiminde).
+
+    taken, bu çıkarma işleminde zaten seçilmiş adları (casefold) tutar; büyük/küçük
+    harf duyarsız dosya sistemlerinde (macOS) "A.txt" ve "a.txt" de çakışır.
+    """
+    safe_name = safe_filename(filename)
+    stem, suffix = os.path.splitext(safe_name)
+    candidate = dest_dir / safe_name
+    counter = 1
+    while candidate.name.casefold() in taken or candidate.exists():
+        candidate = dest_dir / f"{stem} ({counter}){suffix}"
+        counter += 1
+    taken.add(candidate.name.casefold())
+    return candidate
+
+
+def plan_extraction(files: Iterable[Dict], dest_dir: Path) -> List[Tuple[Dict, Path]]:
+    """Her kayıt için hedef yolu sıralı olarak belirler (thread'ler arasında ad çakışması olmasın)."""
+    taken: Set[str] = set()
+    return [(file_info, unique_target(dest_dir, file_info['original_filename'], taken)) for file_info in files]
+
+
+def extract_files(vault_name: str, vault_key: bytes, dest_dir: Path, file_ids: Optional[List[str]] = None,
+                  max_workers: Optional[int] = None, progress: Optional[ProgressToken] = None) -> Optional[ExtractReport]:
+    """Seçili dosyaları (file_ids None ise tüm kasayı) dest_dir'e paralel çözerek çıkarır.
+
+    Hedef dizin yoksa oluşturulur, hata durumunda None döndürülür. Sonuçlar
+    file_ids sırasıyla (tüm kasada ad sırasıyla) döner. progress verilirse toplam
+    byte/dosya sayısı eklenir ve her dosya ilerlemesi bildirilir; iptal edilirse
+    başlamamış dosyalar atlanır, yarım kalan çıktı silinir.
+    """
+    try:
+        dest_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"HATA: Hedef dizin oluşturulamadı: {dest_dir}\n{e}")
+        return None
+
+    if file_ids is None:
+        files = get_file_listing(vault_name)
+        missing = []
+    else:
+        by_id = {f['id']: f for f in get_files_by_ids(vault_name, file_ids)}
+        files = [by_id[file_id] for file_id in file_ids if file_id in by_id]
+        missing = [file_id for file_id in file_ids if file_id not in by_id]
+    jobs = plan_extraction(files, dest_dir)
+    if progress:
+        progress.add_total(sum(f.get('size_bytes') or 0 for f in files), len(files))
+
+    def extract_one(job: Tuple[Dict, Path]) -> ExtractResult:
+        file_info, target_path = job
+        if progress and progress.is_cancelled:
+            return ExtractResult(file_info['id'], target_path, False)
+        metadata = get_file_metadata(vault_name, file_info['id'])
+        ok = metadata is not None and vault_manager.write_decrypted_file(vault_name, vault_key, metadata, target_path, progress)
+        return ExtractResult(file_info['id'], target_path, ok)
+
+    started = time.monotonic()
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        results = [extract_one(job) for job in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kcEnc-extract") as executor:
+            results = list(executor.map(extract_one, jobs))
+    elapsed = time.monotonic() - started
+    total_bytes = sum(file_info.get('size_bytes') or 0 for (file_info, _), r in zip(jobs, results) if r.ok)
+
+    if missing:
+        print(f"Uyarı: {len(missing)} dosya kasada bulunamadı, atlandı.")
+        order = {file_id: i for i, file_id in enumerate(file_ids)}
+        results.extend(ExtractResult(file_id, None, False) for file_id in missing)
+        results.sort(key=lambda r: order[r.file_id])
+
+    report = ExtractReport(results, total_bytes, elapsed, bool(progress and progress.is_cancelled))
+    print(f"'{vault_name}': {report.succeeded}/{len(results)} dosya çıkarıldı "
+          f"({total_bytes / (1024 * 1024):.1f} MB, {report.bytes_per_second / (1024 * 1024):.1f} MB/s).")
+    return report
@@ -0,0 +1,47 @@
+import threading
+from typing import Callable, Iterable, List, NamedTuple, Tuple
+
+# Kasa içeriğindeki değişiklikler (eklenen, güncellenen, silinen dosya kayıtları)
+# database_manager'daki yazma fonksiyonları tarafından commit'ten sonra bildirilir.
+# Görünümler listeyi baştan kurmak yerine yalnızca değişen satırları günceller.
+# Dinleyiciler değişikliği yapan thread'den çağrılır (GUI, Qt sinyaliyle kendi
+# thread'ine aktarmalıdır). Yalnızca bu süreçteki değişiklikler bildirilir.
+
+
+class VaultChange(NamedTuple):
+    vault_name: str
+    inserted: Tuple[str, ...] = ()  # Dosya ID'leri
+    updated: Tuple[str, ...] = ()
+    deleted: Tuple[str, ...] = ()
+
+
+_listeners: List[Callable[[VaultChange], None]] = []
+_listeners_lock = threading.Lock()
+
+
+def add_change_listener(listener: Callable[[VaultChange], None]):
+    with _listeners_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_change_listener(listener: Callable[[VaultChange], None]):
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def notify_change(vault_name: str, inserted: Iterable[str] = (), updated: Iterable[str] = (),
+                  deleted: Iterable[str] = ()):
+    """Dinleyicilere değişikliği bildirir; boş değişiklikler bildirilmez."""
+    change = VaultChange(vault_name, tuple(inserted), tuple(updated), tuple(deleted))
+    if not (change.inserted or change.updated or change.deleted):
+        return
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(change)
+        except Exception as e:
+            # Bir dinleyicinin hatası yazma işlemini başarısız göstermemeli
+            print(f"HATA: Kasa değişikliği dinleyicisi hata verdi: {e}")
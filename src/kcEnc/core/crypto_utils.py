@@ -1,8 +1,10 @@
 import os
 import base64
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import hashlib
+import time
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 from cryptography.exceptions import InvalidTag
 
 # PRD'de belirtilen iterasyon sayısı (ayarlanabilir)
@@ -14,35 +16,164 @@ AES_GCM_TAG_SIZE_BYTES = 16 # AES-GCM için 128 bit tag
 
 CHECK_BLOCK_PLAINTEXT = b"kcEnc Vault Check"
 
+# --- Dosya Alt Anahtarları --- #
+# Her dosya, kasa anahtarından HKDF ile türetilen kendi anahtarıyla şifrelenir.
+# Rastgele 96 bit IV'lerin çakışma sınırı böylece kasa başına değil dosya başına
+# geçerli olur; kasa anahtarı altında şifrelenen veri miktarı dosya sayısıyla büyümez.
+FILE_KEY_SALT_SIZE_BYTES = 32
+FILE_KEY_HKDF_INFO = b"kcEnc file key v1"
+
+# --- Zarf Şifreleme (Envelope) --- #
+# Dosyalar rastgele bir veri anahtarıyla (DEK) şifrelenir; DEK ise paroladan veya
+# kurtarma anahtarından türetilen anahtarla (KEK) sarmalanıp vault_config.json'da saklanır.
+# Parola değişikliği yalnızca sarmalamayı yeniler, dosyalara dokunulmaz.
+KEY_SLOT_AAD_PREFIX = b"kcEnc key slot:"
+RECOVERY_KEY_SIZE_BYTES = 32
+RECOVERY_KEY_HKDF_INFO = b"kcEnc recovery key v1"
+RECOVERY_KEY_GROUP_SIZE = 4 # Kullanıcıya gösterilirken karakter grubu uzunluğu
+
+# --- Şifre (AEAD) Seçimi --- #
+# Her iki algoritma da 256 bit anahtar, 96 bit nonce ve 128 bit tag kullanır;
+# bu yüzden dosya formatı ve IV/tag boyutları algoritmadan bağımsızdır.
+CIPHER_AES_256_GCM = "aes-256-gcm"
+CIPHER_CHACHA20_POLY1305 = "chacha20-poly1305"
+DEFAULT_CIPHER = CIPHER_AES_256_GCM # Kayıtta algoritma yoksa (eski kasalar/dosyalar) bu kabul edilir
+SUPPORTED_CIPHERS = {
+    CIPHER_AES_256_GCM: AESGCM,
+    CIPHER_CHACHA20_POLY1305: ChaCha20Poly1305,
+}
+CIPHER_DISPLAY_NAMES = {
+    CIPHER_AES_256_GCM: "AES-256-GCM",
+    CIPHER_CHACHA20_POLY1305: "ChaCha20-Poly1305",
+}
+
+# cryptography >= 45: sonucu çağıranın tamponuna yazan encrypt_into/decrypt_into
+AEAD_SUPPORTS_INTO = hasattr(AESGCM, "encrypt_into") and hasattr(ChaCha20Poly1305, "decrypt_into")
+
+BENCHMARK_SAMPLE_SIZE = 1024 * 1024
+BENCHMARK_DURATION_SECONDS = 0.05 # Algoritma başına
+
+def get_aead(key: bytes, cipher: str | None = None):
+    """Algoritma kimliğine göre AEAD nesnesi döndürür (None = DEFAULT_CIPHER)."""
+    try:
+        aead_class = SUPPORTED_CIPHERS[cipher or DEFAULT_CIPHER]
+    except KeyError:
+        raise ValueError(f"Desteklenmeyen şifreleme algoritması: {cipher}")
+    return aead_class(key)
+
+def benchmark_ciphers(sample_size: int = BENCHMARK_SAMPLE_SIZE,
+                      duration: float = BENCHMARK_DURATION_SECONDS) -> dict[str, float]:
+    """Her algoritmanın bu makinedeki şifreleme hızını (MB/s) ölçer."""
+    key = os.urandom(KEY_SIZE_BYTES)
+    nonce = os.urandom(AES_GCM_IV_SIZE_BYTES)
+    sample = os.urandom(sample_size)
+    results = {}
+    for cipher in SUPPORTED_CIPHERS:
+        aead = get_aead(key, cipher)
+        aead.encrypt(nonce, sample, None) # Isınma
+        processed = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < duration:
+            aead.encrypt(nonce, sample, None)
+            processed += sample_size
+            elapsed = time.perf_counter() - start
+        results[cipher] = processed / elapsed / (1024 * 1024)
+    return results
+
+def choose_fastest_cipher() -> str:
+    """Hız testine göre bu makinede en hızlı algoritmayı seçer."""
+    results = benchmark_ciphers()
+    fastest = max(results, key=results.get)
+    print("Şifreleme hız testi: " + ", ".join(f"{CIPHER_DISPLAY_NAMES[c]} {mbps:.0f} MB/s" for c, mbps in results.items()))
+    return fastest
+
 def derive_key(password: str, salt: bytes, iterations: int = DEFAULT_ITERATIONS) -> bytes:
-    """Verilen parola ve salt'tan PBKDF2HMAC kullanarak anahtar türetir."""
+    """Verilen parola ve salt'tan PBKDF2-HMAC-SHA256 kullanarak anahtar türetir."""
     if not password or not salt:
         raise ValueError("Parola ve salt boş olamaz.")
-    kdf = PBKDF2HMAC(
+    # hashlib (OpenSSL) hesaplama boyunca GIL'i bırakır; kasa açılırken veritabanının
+    # paralel hazırlanabilmesi için gerekli. Çıktı PBKDF2-HMAC-SHA256 ile birebir aynıdır.
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations, KEY_SIZE_BYTES)
+
+def generate_salt() -> bytes:
+    """Güvenli bir rastgele salt oluşturur."""
+    return os.urandom(SALT_SIZE_BYTES)
+
+def generate_file_key_salt() -> bytes:
+    """Dosya alt anahtarı için rastgele HKDF salt'ı üretir."""
+    return os.urandom(FILE_KEY_SALT_SIZE_BYTES)
+
+def derive_file_key(vault_key: bytes, key_salt: bytes) -> bytes:
+    """Kasa anahtarından ve dosyaya özgü salt'tan HKDF-SHA256 ile dosya anahtarı türetir."""
+    hkdf = HKDF(
+        algorithm=hashes.SHA256(),
+        length=KEY_SIZE_BYTES,
+        salt=key_salt,
+        info=FILE_KEY_HKDF_INFO,
+    )
+    return hkdf.derive(vault_key)
+
+def generate_data_key() -> bytes:
+    """Kasa dosyalarını şifreleyen rastgele veri anahtarını (DEK) üretir."""
+    return os.urandom(KEY_SIZE_BYTES)
+
+def wrap_key(kek: bytes, data_key: bytes, slot_type: str, cipher: str | None = None) -> tuple[bytes, bytes]:
+    """Veri anahtarını KEK ile sarmalar (iv, wrapped_key). Slot türü AAD olarak bağlanır."""
+    aead = get_aead(kek, cipher)
+    iv = os.urandom(AES_GCM_IV_SIZE_BYTES)
+    return iv, aead.encrypt(iv, data_key, KEY_SLOT_AAD_PREFIX + slot_type.encode('ascii'))
+
+def unwrap_key(kek: bytes, iv: bytes, wrapped_key: bytes, slot_type: str, cipher: str | None = None) -> bytes | None:
+    """Sarmalanmış veri anahtarını çözer; KEK yanlışsa None döndürür."""
+    aead = get_aead(kek, cipher)
+    try:
+        return aead.decrypt(iv, wrapped_key, KEY_SLOT_AAD_PREFIX + slot_type.encode('ascii'))
+    except InvalidTag:
+        return None
+
+def generate_recovery_key() -> tuple[str, bytes]:
+    """Rastgele kurtarma anahtarı üretir: (kullanıcıya gösterilecek metin, ham anahtar)."""
+    raw = os.urandom(RECOVERY_KEY_SIZE_BYTES)
+    text = base64.b32encode(raw).decode('ascii').rstrip("=")
+    groups = [text[i:i + RECOVERY_KEY_GROUP_SIZE] for i in range(0, len(text), RECOVERY_KEY_GROUP_SIZE)]
+    return "-".join(groups), raw
+
+def parse_recovery_key(text: str) -> bytes | None:
+    """Kurtarma anahtarı metnini ham anahtara çevirir; biçim uymuyorsa None döndürür."""
+    compact = "".join(text.split()).replace("-", "").upper()
+    try:
+        raw = base64.b32decode(compact + "=" * (-len(compact) % 8))
+    except (ValueError, base64.binascii.Error):
+        return None
+    return raw if len(raw) == RECOVERY_KEY_SIZE_BYTES else None
+
+def derive_recovery_kek(recovery_key: bytes, salt: bytes) -> bytes:
+    """Kurtarma anahtarından KEK türetir (anahtar zaten tam entropili olduğu için HKDF yeterli)."""
+    hkdf = HKDF(
         algorithm=hashes.SHA256(),
         length=KEY_SIZE_BYTES,
         salt=salt,
-        iterations=iterations,
+        info=RECOVERY_KEY_HKDF_INFO,
     )
-    key = kdf.derive(password.encode('utf-8'))
-    return key
+    return hkdf.derive(recovery_key)
 
-def generate_salt() -> bytes:
-    """Güvenli bir rastgele salt oluşturur."""
-    return os.urandom(SALT_SIZE_BYTES)
+def generate_iv() -> bytes:
+    """AES-GCM için rastgele 96 bit IV oluşturur."""
+    return os.urandom(AES_GCM_IV_SIZE_BYTES)
 
-def encrypt_check_block(key: bytes) -> tuple[bytes, bytes]:
+def encrypt_check_block(key: bytes, cipher: str | None = None) -> tuple[bytes, bytes]:
     """Doğrulama bloğunu şifreler (iv, ciphertext_with_tag)."""
-    aesgcm = AESGCM(key)
+    aead = get_aead(key, cipher)
     iv = os.urandom(AES_GCM_IV_SIZE_BYTES)
-    ciphertext_with_tag = aesgcm.encrypt(iv, CHECK_BLOCK_PLAINTEXT, None)
+    ciphertext_with_tag = aead.encrypt(iv, CHECK_BLOCK_PLAINTEXT, None)
     return iv, ciphertext_with_tag
 
-def verify_check_block(key: bytes, iv: bytes, ciphertext_with_tag: bytes) -> bool:
+def verify_check_block(key: bytes, iv: bytes, ciphertext_with_tag: bytes, cipher: str | None = None) -> bool:
     """Şifreli doğrulama bloğunu çözerek anahtarı doğrular."""
-    aesgcm = AESGCM(key)
+    aead = get_aead(key, cipher)
     try:
-        plaintext = aesgcm.decrypt(iv, ciphertext_with_tag, None)
+        plaintext = aead.decrypt(iv, ciphertext_with_tag, None)
         return plaintext == CHECK_BLOCK_PLAINTEXT
     except InvalidTag:
         return False
@@ -67,4 +198,72 @@ def decrypt_data(key: bytes, iv: bytes, ciphertext_with_tag: bytes) -> bytes:
     aesgcm = AESGCM(key)
     # InvalidTag exception'ı çağıran kod tarafından yakalanmalı
     plaintext = aesgcm.decrypt(iv, ciphertext_with_tag, None)
-    return plaintext 
\ No newline at end of file
+    return plaintext 
+
+# --- Parçalı (chunked) Şifreleme: akış halinde ve rastgele erişimli okuma için --- #
+
+# Her parça ayrı bir AEAD mesajıdır: ciphertext + 16 byte tag.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def chunk_nonce(base_iv: bytes, index: int) -> bytes:
+    """Parça nonce'u: dosyaya özel rastgele IV ile parça sırasının XOR'u."""
+    counter = index.to_bytes(AES_GCM_IV_SIZE_BYTES, 'big')
+    return bytes(a ^ b for a, b in zip(base_iv, counter))
+
+def chunk_aad(index: int, is_last: bool) -> bytes:
+    """Parça sırası ve son parça bayrağı AAD'ye bağlanır (yer değiştirme/kesme tespiti)."""
+    return index.to_bytes(8, 'big') + (b"\x01" if is_last else b"\x00")
+
+def encrypted_chunk_size(chunk_size: int) -> int:
+    """Diskteki bir tam parçanın boyutu (plaintext + tag)."""
+    return chunk_size + AES_GCM_TAG_SIZE_BYTES
+
+def chunked_plaintext_size(encrypted_size: int, chunk_size: int) -> int:
+    """Parçalı şifreli dosyanın boyutundan plaintext boyutunu hesaplar."""
+    full = encrypted_chunk_size(chunk_size)
+    chunk_count = max(1, -(-encrypted_size // full))
+    return encrypted_size - chunk_count * AES_GCM_TAG_SIZE_BYTES
+
+class ChunkCipher:
+    """Tek bir dosyanın parçalarını şifreler/çözer (anahtar, IV ve algoritma dosya başına sabit)."""
+
+    def __init__(self, key: bytes, base_iv: bytes, cipher: str | None = None):
+        self._aead = get_aead(key, cipher)
+        self._base_iv = base_iv
+
+    def encrypt_chunk(self, index: int, plaintext: bytes, is_last: bool) -> bytes:
+        return self._aead.encrypt(chunk_nonce(self._base_iv, index), plaintext, chunk_aad(index, is_last))
+
+    def decrypt_chunk(self, index: int, ciphertext_with_tag: bytes, is_last: bool) -> bytes:
+        """Parçayı çözer. Başarısız olursa InvalidTag fırlatır."""
+        return self._aead.decrypt(chunk_nonce(self._base_iv, index), ciphertext_with_tag, chunk_aad(index, is_last))
+
+    def encrypt_chunk_into(self, index: int, plaintext, is_last: bool, out) -> int:
+        """Parçayı şifreleyip `out` tamponunun başına yazar; yazılan byte sayısını döndürür.
+
+        plaintext ve out herhangi bir bytes-like nesne olabilir (bytearray, memoryview, mmap).
+        """
+        size = len(plaintext) + AES_GCM_TAG_SIZE_BYTES
+        target = memoryview(out)[:size]
+        nonce = chunk_nonce(self._base_iv, index)
+        if AEAD_SUPPORTS_INTO:
+            self._aead.encrypt_into(nonce, plaintext, chunk_aad(index, is_last), target)
+        else:
+            target[:] = self._aead.encrypt(nonce, bytes(plaintext), chunk_aad(index, is_last))
+        return size
+
+    def decrypt_chunk_into(self, index: int, ciphertext_with_tag, is_last: bool, out) -> int:
+        """Parçayı çözüp `out` tamponunun başına yazar; yazılan byte sayısını döndürür.
+
+        Başarısız olursa InvalidTag fırlatır (tamponun içeriği bu durumda tanımsızdır).
+        """
+        size = len(ciphertext_with_tag) - AES_GCM_TAG_SIZE_BYTES
+        if size < 0:
+            raise InvalidTag()
+        target = memoryview(out)[:size]
+        nonce = chunk_nonce(self._base_iv, index)
+        if AEAD_SUPPORTS_INTO:
+            self._aead.decrypt_into(nonce, ciphertext_with_tag, chunk_aad(index, is_last), target)
+        else:
+            target[:] = self._aead.decrypt(nonce, bytes(ciphertext_with_tag), chunk_aad(index, is_last))
+        return size
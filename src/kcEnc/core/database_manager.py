@@ -1,13 +1,30 @@
 import sqlite3
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import datetime
 import uuid
 
 from ..utils.file_utils import get_vault_path
+from .change_events import notify_change
+from .file_listing import FileListing, ListingRecord
+from .metadata_cache import get_cached_metadata, cache_metadata, metadata_cache_generation
+from .metadata_crypto import (
+    COLUMN_NAME, COLUMN_TYPE, COLUMN_SOURCE, MetadataKeys, get_metadata_keys,
+    blind_index, encrypt_field, decrypt_field, normalize_for_index
+)
 
 METADATA_DB_FILE = "metadata.db"
 
+# PRAGMA user_version ile tutulan şema sürümü. Eski kasalar db_connect içinde yükseltilir.
+SCHEMA_VERSION = 9
+_migrated_db_paths = set()
+
+# IN (...) sorgularında tek seferde gönderilen ID sayısı (SQLite değişken sınırının altında)
+ID_QUERY_BATCH_SIZE = 500
+
+# Başka bir süreç/thread yazarken "database is locked" yerine bu kadar beklenir
+DB_BUSY_TIMEOUT_SECONDS = 30.0
+
 def get_db_path(vault_name: str) -> Path:
     """Belirli bir kasanın metadata.db dosyasının yolunu döndürür."""
     return get_vault_path(vault_name) / METADATA_DB_FILE
@@ -15,11 +32,46 @@ def get_db_path(vault_name: str) -> Path:
 def db_connect(vault_name: str) -> sqlite3.Connection:
     """Veritabanı bağlantısı kurar ve cursor döndürür."""
     db_path = get_db_path(vault_name)
-    conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+    conn = sqlite3.connect(db_path, timeout=DB_BUSY_TIMEOUT_SECONDS,
+                           detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
     # Sözlük olarak sonuçları almak için row_factory ayarla
     conn.row_factory = sqlite3.Row
+    # WAL'da fsync yalnızca checkpoint'te; çökme durumunda son işlemler kaybolabilir ama DB bozulmaz
+    conn.execute("PRAGMA synchronous = NORMAL")
+    if db_path not in _migrated_db_paths:
+        try:
+            # WAL kalıcıdır (dosyaya yazılır): okuyucular yazarı, yazar okuyucuları beklemez
+            conn.execute("PRAGMA journal_mode = WAL")
+            migrate_schema(conn)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        _migrated_db_paths.add(db_path)
     return conn
 
+def migrate_schema(conn: sqlite3.Connection):
+    """Eski şema sürümündeki veritabanını SCHEMA_VERSION'a yükseltir."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    has_files_table = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='files'").fetchone()
+    if not has_files_table:
+        return # Yeni veritabanı; initialize_database güncel şemayı oluşturacak
+    # DDL dahil tüm adımlar tek transaction'da; sürüm kilit alındıktan sonra tekrar okunur
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            for statement in SCHEMA_MIGRATIONS.get(target, []):
+                conn.execute(statement)
+        if version < SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    if version < SCHEMA_VERSION:
+        print(f"Veritabanı şeması yükseltildi: sürüm {version} -> {SCHEMA_VERSION}")
+
 
 SQL_CREATE_FILES_TABLE = """
 CREATE TABLE IF NOT EXISTS files (
@@ -29,20 +81,167 @@ CREATE TABLE IF NOT EXISTS files (
     iv BLOB NOT NULL,             -- Initialization Vector used for AES-GCM (12 bytes)
     file_type TEXT,               -- Original file extension (e.g., '.jpg', '.txt', '.mp4') for preview hint
     size_bytes INTEGER,           -- Original file size
+    chunk_size INTEGER,           -- Plaintext chunk size of the chunked format (NULL = single AES-GCM blob)
+    cipher TEXT,                  -- AEAD algorithm id (e.g. 'chacha20-poly1305'; NULL = aes-256-gcm)
+    key_salt BLOB,                -- HKDF salt of the per-file subkey (NULL = encrypted with the vault key)
+    name_enc BLOB,                -- Encrypted original filename (NULL = plaintext in original_filename)
+    type_enc BLOB,                -- Encrypted file type (NULL = plaintext in file_type)
+    name_index BLOB,              -- Blind index (keyed HMAC) of the case-folded filename
+    type_index BLOB,              -- Blind index of the case-folded file type
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 """
 
+# Eski düz metin ad/türün şifrelenmesi (encrypt_plaintext_metadata: name_enc NULL -> dolu)
+# içerik değişikliği sayılmaz; yoksa ilk açılışta tüm kayıtların tarihi açılış anı olurdu
 SQL_CREATE_TRIGGER_UPDATE_MODIFIED_AT = """
 CREATE TRIGGER IF NOT EXISTS update_files_modified_at
 AFTER UPDATE ON files
 FOR EACH ROW
+WHEN NOT (OLD.name_enc IS NULL AND NEW.name_enc IS NOT NULL)
 BEGIN
     UPDATE files SET modified_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
 END;
 """
 
+# Kasa özet istatistikleri (tek satır). Trigger'lar sayesinde her ekleme/silmede
+# güncel kalır; kasa listesi COUNT/SUM sorgusu yapmadan okuyabilir.
+SQL_CREATE_VAULT_STATS_TABLE = """
+CREATE TABLE IF NOT EXISTS vault_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    file_count INTEGER NOT NULL DEFAULT 0,
+    total_size INTEGER NOT NULL DEFAULT 0,
+    last_modified TIMESTAMP
+);
+"""
+
+SQL_INIT_VAULT_STATS = """
+INSERT OR IGNORE INTO vault_stats (id, file_count, total_size, last_modified)
+SELECT 1, COUNT(*), COALESCE(SUM(size_bytes), 0), COALESCE(MAX(modified_at), CURRENT_TIMESTAMP) FROM files;
+"""
+
+# update_files_modified_at ile aynı koşul: eski kayıtların ad/türünün şifrelenmesi
+# kasanın son değişiklik zamanını da değiştirmez
+SQL_CREATE_VAULT_STATS_UPDATE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS vault_stats_after_update
+AFTER UPDATE ON files
+FOR EACH ROW
+WHEN NOT (OLD.name_enc IS NULL AND NEW.name_enc IS NOT NULL)
+BEGIN
+    UPDATE vault_stats SET total_size = total_size + COALESCE(NEW.size_bytes, 0) - COALESCE(OLD.size_bytes, 0),
+                           last_modified = CURRENT_TIMESTAMP
+    WHERE id = 1;
+END;
+"""
+
+SQL_CREATE_VAULT_STATS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS vault_stats_after_insert
+    AFTER INSERT ON files
+    FOR EACH ROW
+    BEGIN
+        UPDATE vault_stats SET file_count = file_count + 1,
+                               total_size = total_size + COALESCE(NEW.size_bytes, 0),
+                               last_modified = CURRENT_TIMESTAMP
+        WHERE id = 1;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS vault_stats_after_delete
+    AFTER DELETE ON files
+    FOR EACH ROW
+    BEGIN
+        UPDATE vault_stats SET file_count = file_count - 1,
+                               total_size = total_size - COALESCE(OLD.size_bytes, 0),
+                               last_modified = CURRENT_TIMESTAMP
+        WHERE id = 1;
+    END;
+    """,
+    SQL_CREATE_VAULT_STATS_UPDATE_TRIGGER,
+]
+
+# Kör indeksler üzerinde eşitlik aramaları (ad/tür araması, aynı ad kontrolü)
+SQL_CREATE_BLIND_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_files_name_index ON files (name_index)",
+    "CREATE INDEX IF NOT EXISTS idx_files_type_index ON files (type_index)",
+]
+
+# Kaydı silinmiş ama files/ altından henüz kaldırılmamış şifreli dosyalar. Kayıtlar
+# silinirken aynı transaction'da kuyruğa eklenir; arka plan işçisi dosyaları siler,
+# başarısız olanlar (attempts artırılarak) kuyrukta kalır ve sonra yeniden denenir.
+SQL_CREATE_PENDING_UNLINKS_TABLE = """
+CREATE TABLE IF NOT EXISTS pending_unlinks (
+    encrypted_filename TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Toplu içe aktarma işleri: uygulama kapanır veya çökerse iş kaldığı yerden sürer.
+# Kaynak yollar dosya adları gibi şifreli saklanır; eşleştirme kör indeks + boyut + mtime ile yapılır.
+# Tamamlanan işler (ve öğeleri) silinir; yalnızca yarım kalan işler kalıcıdır.
+SQL_CREATE_IMPORT_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS import_jobs (
+        id TEXT PRIMARY KEY,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS import_items (
+        id TEXT PRIMARY KEY,
+        job_id TEXT NOT NULL,          -- import_jobs.id
+        seq INTEGER NOT NULL,          -- İş içindeki sıra
+        source_enc BLOB NOT NULL,      -- Şifreli kaynak yol
+        source_index BLOB NOT NULL,    -- Kaynak yolun kör indeksi
+        size_bytes INTEGER NOT NULL,   -- İş oluşturulurken kaynağın boyutu
+        mtime_ns INTEGER NOT NULL,     -- ve değişiklik zamanı
+        state TEXT NOT NULL DEFAULT 'pending', -- pending | done | skipped | failed
+        file_id TEXT                   -- Eklenen (veya atlanırken eşleşen) dosya kaydı
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_import_items_job ON import_items (job_id, state, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_import_items_source ON import_items (source_index)",
+]
+
+IMPORT_PENDING = "pending"
+IMPORT_DONE = "done"
+IMPORT_SKIPPED = "skipped"
+IMPORT_FAILED = "failed"
+
+# Şifreli kayıtlarda düz metin sütunlarına yazılan değer (original_filename NOT NULL)
+ENCRYPTED_PLACEHOLDER_NAME = ""
+# Anahtar kayıtlı değilse veya alan çözülemezse gösterilen ad
+UNREADABLE_NAME = "(şifreli)"
+
+# Sürüm -> o sürüme yükseltirken sırayla çalıştırılacak ifadeler
+SCHEMA_MIGRATIONS = {
+    # 1: Parçalı şifreleme formatı (NULL = eski tek parça format)
+    1: ["ALTER TABLE files ADD COLUMN chunk_size INTEGER"],
+    # 2: Kasa özet istatistikleri
+    2: [SQL_CREATE_VAULT_STATS_TABLE, SQL_INIT_VAULT_STATS, *SQL_CREATE_VAULT_STATS_TRIGGERS],
+    # 3: Dosya başına şifreleme algoritması (NULL = aes-256-gcm)
+    3: ["ALTER TABLE files ADD COLUMN cipher TEXT"],
+    # 4: Dosya başına HKDF alt anahtarı (NULL = doğrudan kasa anahtarı)
+    4: ["ALTER TABLE files ADD COLUMN key_salt BLOB"],
+    # 5: Şifreli ad/tür ve kör indeksler (mevcut kayıtlar kasa açılınca şifrelenir)
+    5: ["ALTER TABLE files ADD COLUMN name_enc BLOB",
+        "ALTER TABLE files ADD COLUMN type_enc BLOB",
+        "ALTER TABLE files ADD COLUMN name_index BLOB",
+        "ALTER TABLE files ADD COLUMN type_index BLOB",
+        *SQL_CREATE_BLIND_INDEXES],
+    # 6: Kalıcı dosya silme kuyruğu
+    6: [SQL_CREATE_PENDING_UNLINKS_TABLE],
+    # 7: Devam ettirilebilir içe aktarma işleri
+    7: SQL_CREATE_IMPORT_TABLES,
+    # 8: Meta veri şifrelemesi modified_at'i değiştirmesin (trigger'a WHEN koşulu)
+    8: ["DROP TRIGGER IF EXISTS update_files_modified_at", SQL_CREATE_TRIGGER_UPDATE_MODIFIED_AT],
+    # 9: Meta veri şifrelemesi kasanın last_modified değerini de değiştirmesin
+    9: ["DROP TRIGGER IF EXISTS vault_stats_after_update", SQL_CREATE_VAULT_STATS_UPDATE_TRIGGER],
+}
+
 def initialize_database(vault_name: str):
     """Veritabanını ve gerekli tabloları/trigger'ları oluşturur."""
     conn = None
@@ -52,6 +251,16 @@ def initialize_database(vault_name: str):
         cursor = conn.cursor()
         cursor.execute(SQL_CREATE_FILES_TABLE)
         cursor.execute(SQL_CREATE_TRIGGER_UPDATE_MODIFIED_AT)
+        cursor.execute(SQL_CREATE_VAULT_STATS_TABLE)
+        cursor.execute(SQL_INIT_VAULT_STATS)
+        for statement in SQL_CREATE_VAULT_STATS_TRIGGERS:
+            cursor.execute(statement)
+        for statement in SQL_CREATE_BLIND_INDEXES:
+            cursor.execute(statement)
+        cursor.execute(SQL_CREATE_PENDING_UNLINKS_TABLE)
+        for statement in SQL_CREATE_IMPORT_TABLES:
+            cursor.execute(statement)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
         print(f"'{vault_name}' için veritabanı komutları çalıştırıldı ve commit edildi.")
 
@@ -74,26 +283,118 @@ def initialize_database(vault_name: str):
         if conn:
             conn.close()
 
+# --- Şifreli Meta Veri --- #
+
+def _encrypted_columns(keys: Optional[MetadataKeys], file_id: str, original_filename: str,
+                       file_type: Optional[str]) -> Dict[str, Any]:
+    """Kaydın ad/tür sütunlarını döndürür; anahtar varsa şifreli değerler ve kör indeksler."""
+    if keys is None:
+        return {"original_filename": original_filename, "file_type": file_type,
+                "name_enc": None, "type_enc": None, "name_index": None, "type_index": None}
+    has_type = file_type is not None
+    return {
+        "original_filename": ENCRYPTED_PLACEHOLDER_NAME,
+        "file_type": None,
+        "name_enc": encrypt_field(keys, COLUMN_NAME, file_id, original_filename),
+        "type_enc": encrypt_field(keys, COLUMN_TYPE, file_id, file_type) if has_type else None,
+        "name_index": blind_index(keys, COLUMN_NAME, original_filename),
+        "type_index": blind_index(keys, COLUMN_TYPE, file_type) if has_type else None,
+    }
+
+def _decrypt_name_type(keys: Optional[MetadataKeys], file_id: str, original_filename: str, name_enc: Optional[bytes],
+                       file_type: Optional[str], type_enc: Optional[bytes]) -> tuple:
+    """Kaydın (ad, tür) değerleri; şifreliyse çözülür, anahtar yoksa/çözülemezse UNREADABLE_NAME."""
+    if name_enc is not None:
+        name = decrypt_field(keys, COLUMN_NAME, file_id, name_enc) if keys else None
+        original_filename = name if name is not None else UNREADABLE_NAME
+    if type_enc is not None:
+        file_type = decrypt_field(keys, COLUMN_TYPE, file_id, type_enc) if keys else None
+    return original_filename, file_type
+
+def _decode_row(keys: Optional[MetadataKeys], row: sqlite3.Row) -> Dict[str, Any]:
+    """Satırı sözlüğe çevirir; şifreli ad/tür alanlarını çözüp düz sütun adlarıyla koyar."""
+    record = dict(row)
+    name_enc = record.pop('name_enc', None)
+    type_enc = record.pop('type_enc', None)
+    record['original_filename'], record['file_type'] = _decrypt_name_type(
+        keys, record['id'], record.get('original_filename'), name_enc, record.get('file_type'), type_enc)
+    return record
+
+def file_sort_key(record: Dict[str, Any]) -> tuple:
+    """Listelemenin sıralama anahtarı: büyük/küçük harf duyarsız ad, eşitlikte ID."""
+    return (normalize_for_index(COLUMN_NAME, record['original_filename']), record['id'])
+
+def encrypt_plaintext_metadata(vault_name: str) -> int:
+    """Düz metin ad/tür saklayan (eski) kayıtları kasanın meta veri anahtarıyla şifreler.
+
+    Kasa açılırken çağrılır; dönüştürülen kayıt sayısını döndürür. secure_delete ile
+    eski düz metin değerlerin serbest bırakılan sayfalarda kalması önlenir.
+    """
+    keys = get_metadata_keys(vault_name)
+    if keys is None:
+        return 0
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        rows = conn.execute("SELECT id, original_filename, file_type FROM files WHERE name_enc IS NULL").fetchall()
+        if not rows:
+            return 0
+        updates = []
+        for row in rows:
+            columns = _encrypted_columns(keys, row['id'], row['original_filename'], row['file_type'])
+            updates.append((columns['original_filename'], columns['file_type'], columns['name_enc'],
+                            columns['type_enc'], columns['name_index'], columns['type_index'], row['id']))
+        conn.execute("PRAGMA secure_delete = ON")
+        with conn:
+            conn.executemany("""UPDATE files SET original_filename = ?, file_type = ?, name_enc = ?,
+                                                 type_enc = ?, name_index = ?, type_index = ?
+                                WHERE id = ?""", updates)
+        print(f"'{vault_name}': {len(updates)} kaydın dosya adı ve türü şifrelendi.")
+        notify_change(vault_name, updated=[row['id'] for row in rows])
+        return len(updates)
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' meta verisi şifrelenemedi: {e}")
+        return 0
+    finally:
+        if conn:
+            conn.close()
+
 # --- Adım 4 ve 5 için Fonksiyonlar ---
 
+SQL_INSERT_FILE = """INSERT INTO files (id, original_filename, encrypted_filename, iv, file_type, size_bytes, chunk_size, cipher, key_salt,
+                                        name_enc, type_enc, name_index, type_index)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+def _file_record_row(keys: Optional[MetadataKeys], file_id: str, file_info: Dict[str, Any]) -> tuple:
+    # Kasa açıksa (anahtar kayıtlıysa) ad ve tür yalnızca şifreli olarak saklanır
+    columns = _encrypted_columns(keys, file_id, file_info['original_filename'], file_info.get('file_type'))
+    return (
+        file_id,
+        columns['original_filename'],
+        file_info['encrypted_filename'],
+        file_info['iv'],
+        columns['file_type'], # None olabilir
+        file_info.get('size_bytes'), # None olabilir
+        file_info.get('chunk_size'), # None = eski tek parça format
+        file_info.get('cipher'), # None = aes-256-gcm
+        file_info.get('key_salt'), # None = kasa anahtarı
+        columns['name_enc'],
+        columns['type_enc'],
+        columns['name_index'],
+        columns['type_index']
+    )
+
 def add_file_record(vault_name: str, file_info: Dict[str, Any]) -> Optional[str]:
     """Dosya meta verisini veritabanına ekler. Başarılı olursa ID döndürür."""
     file_id = str(uuid.uuid4())
-    sql = """INSERT INTO files (id, original_filename, encrypted_filename, iv, file_type, size_bytes)
-             VALUES (?, ?, ?, ?, ?, ?)"""
+    row = _file_record_row(get_metadata_keys(vault_name), file_id, file_info)
     try:
         conn = db_connect(vault_name)
         cursor = conn.cursor()
-        cursor.execute(sql, (
-            file_id,
-            file_info['original_filename'],
-            file_info['encrypted_filename'],
-            file_info['iv'],
-            file_info.get('file_type'), # None olabilir
-            file_info.get('size_bytes') # None olabilir
-        ))
+        cursor.execute(SQL_INSERT_FILE, row)
         conn.commit()
         print(f"Dosya kaydı eklendi: {file_info['original_filename']} (ID: {file_id})")
+        notify_change(vault_name, inserted=[file_id])
         return file_id
     except sqlite3.Error as e:
         print(f"HATA: '{vault_name}' veritabanına dosya kaydı eklenemedi: {e}")
@@ -102,33 +403,126 @@ def add_file_record(vault_name: str, file_info: Dict[str, Any]) -> Optional[str]
         if conn:
             conn.close()
 
-def get_all_files(vault_name: str) -> List[Dict[str, Any]]:
-    """Bir kasadaki tüm dosyaların meta verilerini listeler."""
-    sql = "SELECT id, original_filename, file_type, size_bytes, created_at, modified_at FROM files ORDER BY original_filename COLLATE NOCASE" 
-    files = []
+def add_file_records(vault_name: str, file_infos: List[Dict[str, Any]]) -> Optional[List[str]]:
+    """Birden fazla dosya kaydını tek transaction içinde ekler; ID listesini veya hata durumunda None döndürür."""
+    if not file_infos:
+        return []
+    keys = get_metadata_keys(vault_name)
+    file_ids = [str(uuid.uuid4()) for _ in file_infos]
+    rows = [_file_record_row(keys, file_id, info) for file_id, info in zip(file_ids, file_infos)]
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        with conn:
+            conn.executemany(SQL_INSERT_FILE, rows)
+        print(f"{len(rows)} dosya kaydı eklendi ('{vault_name}').")
+        notify_change(vault_name, inserted=file_ids)
+        return file_ids
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' veritabanına dosya kayıtları eklenemedi: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+# Listeleme sütunları; zamanlar datetime'a çevrilmeden UTC UNIX saniyesi olarak okunur
+SQL_SELECT_LISTING = """SELECT id, original_filename, name_enc, file_type, type_enc, size_bytes,
+                               CAST(strftime('%s', created_at) AS INTEGER), CAST(strftime('%s', modified_at) AS INTEGER)
+                        FROM files"""
+
+def _listing_records(keys: Optional[MetadataKeys], rows: Iterable[tuple]) -> Iterator[ListingRecord]:
+    for file_id, original_filename, name_enc, file_type, type_enc, size_bytes, created, modified in rows:
+        name, file_type = _decrypt_name_type(keys, file_id, original_filename, name_enc, file_type, type_enc)
+        yield (file_id, name, file_type, size_bytes, created, modified)
+
+def fetch_file_rows(vault_name: str) -> Optional[List[tuple]]:
+    """Listeleme satırlarını çözmeden okur; hata durumunda None döndürür.
+
+    Anahtar gerektirmez: kasa açılırken anahtar türetilirken paralel çağrılabilir
+    (bağlantı kurulur, şema kontrol edilir/yükseltilir ve satırlar belleğe alınır).
+    """
+    conn = None
     try:
         conn = db_connect(vault_name)
         cursor = conn.cursor()
-        cursor.execute(sql)
-        files = [dict(row) for row in cursor.fetchall()]
+        cursor.row_factory = None # sqlite3.Row yerine düz tuple
+        return cursor.execute(SQL_SELECT_LISTING).fetchall()
     except sqlite3.Error as e:
         print(f"HATA: '{vault_name}' veritabanından dosya listesi alınamadı: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def decode_file_rows(vault_name: str, rows: List[tuple]) -> FileListing:
+    """fetch_file_rows satırlarının ad/türlerini kasanın meta veri anahtarıyla çözer ve ada göre sıralı liste kurar."""
+    return FileListing.from_records(_listing_records(get_metadata_keys(vault_name), rows))
+
+def get_file_listing(vault_name: str) -> FileListing:
+    """Bir kasadaki tüm dosyaları ada göre sıralı, sütun tabanlı bir liste olarak döndürür.
+
+    Adlar şifreli saklandığından sıralama SQL'de değil, çözüldükten sonra yapılır.
+    Satırlar akış halinde okunur; hata durumunda boş liste döner.
+    """
+    keys = get_metadata_keys(vault_name)
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return FileListing.from_records(_listing_records(keys, cursor.execute(SQL_SELECT_LISTING)))
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' veritabanından dosya listesi alınamadı: {e}")
+        return FileListing()
+    finally:
+        if conn:
+            conn.close()
+
+def get_files_by_ids(vault_name: str, file_ids: List[str]) -> List[Dict[str, Any]]:
+    """Listeleme alanlarıyla (FileEntry.to_dict() ile aynı), yalnızca verilen ID'lerin kayıtlarını döndürür (sırasız)."""
+    keys = get_metadata_keys(vault_name)
+    files = []
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        for start in range(0, len(file_ids), ID_QUERY_BATCH_SIZE):
+            batch = file_ids[start:start + ID_QUERY_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            sql = f"""SELECT id, original_filename, name_enc, file_type, type_enc, size_bytes, created_at, modified_at
+                      FROM files WHERE id IN ({placeholders})"""
+            files.extend(_decode_row(keys, row) for row in conn.execute(sql, batch))
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' veritabanından dosya kayıtları alınamadı: {e}")
     finally:
         if conn:
             conn.close()
     return files
 
 def get_file_metadata(vault_name: str, file_id: str) -> Optional[Dict[str, Any]]:
-    """Belirli bir dosyanın meta verilerini ID ile alır."""
-    sql = "SELECT id, original_filename, encrypted_filename, iv, file_type, size_bytes FROM files WHERE id = ?"
+    """Belirli bir dosyanın meta verilerini ID ile alır.
+
+    Kasa açıkken (meta veri anahtarı kayıtlıyken) sonuç oturum önbelleğinden
+    gelir; bkz. metadata_cache. Dönen sözlük çağırana aittir.
+    """
+    keys = get_metadata_keys(vault_name)
+    if keys is not None:
+        cached = get_cached_metadata(vault_name, file_id)
+        if cached is not None:
+            return cached
+    generation = metadata_cache_generation(vault_name)
+    sql = """SELECT id, original_filename, name_enc, encrypted_filename, iv, file_type, type_enc,
+                    size_bytes, chunk_size, cipher, key_salt FROM files WHERE id = ?"""
     metadata = None
+    conn = None
     try:
         conn = db_connect(vault_name)
         cursor = conn.cursor()
         cursor.execute(sql, (file_id,))
         row = cursor.fetchone()
         if row:
-            metadata = dict(row)
+            metadata = _decode_row(keys, row)
+            if keys is not None:
+                cache_metadata(vault_name, file_id, metadata, generation)
     except sqlite3.Error as e:
         print(f"HATA: '{vault_name}' veritabanından meta veri alınamadı (ID: {file_id}): {e}")
     finally:
@@ -136,6 +530,38 @@ def get_file_metadata(vault_name: str, file_id: str) -> Optional[Dict[str, Any]]
             conn.close()
     return metadata
 
+def _find_by_blind_index(vault_name: str, column: str, value: str) -> List[Dict[str, Any]]:
+    """Ad veya türü `value` ile (harf duyarsız) eşleşen kayıtları kör indeks üzerinden bulur."""
+    index_column, plain_column = ("name_index", "original_filename") if column == COLUMN_NAME else ("type_index", "file_type")
+    sql = f"""SELECT id, original_filename, name_enc, file_type, type_enc, size_bytes, created_at, modified_at FROM files
+              WHERE {index_column} = ? OR ({index_column} IS NULL AND {plain_column} = ? COLLATE NOCASE)"""
+    keys = get_metadata_keys(vault_name)
+    index = blind_index(keys, column, value) if keys else None
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        records = [_decode_row(keys, row) for row in conn.execute(sql, (index, value))]
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' veritabanında arama yapılamadı: {e}")
+        return []
+    finally:
+        if conn:
+            conn.close()
+    # Kesilmiş HMAC çakışmalarına karşı çözülen değerle doğrula
+    wanted = normalize_for_index(column, value)
+    plain_key = 'original_filename' if column == COLUMN_NAME else 'file_type'
+    matches = [r for r in records if normalize_for_index(column, r.get(plain_key) or '') == wanted]
+    matches.sort(key=file_sort_key)
+    return matches
+
+def find_files_by_name(vault_name: str, filename: str) -> List[Dict[str, Any]]:
+    """Adı tam olarak `filename` olan kayıtlar (aynı ad kontrolü için; indeksli)."""
+    return _find_by_blind_index(vault_name, COLUMN_NAME, filename)
+
+def find_files_by_type(vault_name: str, file_type: str) -> List[Dict[str, Any]]:
+    """Türü (uzantısı) `file_type` olan kayıtlar (örn. '.jpg'; indeksli)."""
+    return _find_by_blind_index(vault_name, COLUMN_TYPE, file_type)
+
 def delete_file_record(vault_name: str, file_id: str) -> bool:
     """Dosya meta verisini veritabanından siler."""
     sql = "DELETE FROM files WHERE id = ?"
@@ -148,6 +574,7 @@ def delete_file_record(vault_name: str, file_id: str) -> bool:
         success = cursor.rowcount > 0 # Silme işlemi başarılı oldu mu?
         if success:
             print(f"Dosya kaydı silindi (ID: {file_id})")
+            notify_change(vault_name, deleted=[file_id])
         else:
              print(f"Uyarı: Silinecek dosya kaydı bulunamadı (ID: {file_id})")
     except sqlite3.Error as e:
@@ -155,4 +582,356 @@ def delete_file_record(vault_name: str, file_id: str) -> bool:
     finally:
         if conn:
             conn.close()
-    return success 
\ No newline at end of file
+    return success
+
+def get_encrypted_filename_map(vault_name: str) -> Optional[Dict[str, str]]:
+    """Tüm kayıtların encrypted_filename -> id eşlemesini tek sorguyla döndürür."""
+    sql = "SELECT encrypted_filename, id FROM files"
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        return {row[0]: row[1] for row in conn.execute(sql)}
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' veritabanından şifreli dosya adları alınamadı: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def delete_file_records(vault_name: str, file_ids: List[str]) -> int:
+    """Birden fazla dosya kaydını tek transaction içinde siler, silinen satır sayısını döndürür."""
+    if not file_ids:
+        return 0
+    sql = "DELETE FROM files WHERE id = ?"
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        with conn:
+            cursor = conn.executemany(sql, ((file_id,) for file_id in file_ids))
+        notify_change(vault_name, deleted=file_ids) # Bulunamayan ID'ler dinleyicilerce yok sayılır
+        return cursor.rowcount
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' veritabanından dosya kayıtları silinemedi: {e}")
+        return 0
+    finally:
+        if conn:
+            conn.close()
+
+# --- Silme Kuyruğu --- #
+
+def delete_files_and_queue_unlinks(vault_name: str, file_ids: List[str]) -> Optional[List[str]]:
+    """Kayıtları siler ve şifreli dosyalarını silme kuyruğuna ekler (tek transaction).
+
+    ID'ler ID_QUERY_BATCH_SIZE'lık gruplar halinde küme tabanlı sorgularla işlenir
+    (grup başına üç sorgu). Silinen kayıtların ID listesini (bulunamayanlar hariç)
+    veya hata durumunda None döndürür.
+    """
+    file_ids = list(dict.fromkeys(file_ids)) # Tekrarlananlar bir kez silinir
+    if not file_ids:
+        return []
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            deleted = []
+            for start in range(0, len(file_ids), ID_QUERY_BATCH_SIZE):
+                batch = file_ids[start:start + ID_QUERY_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                existing = {row[0] for row in conn.execute(f"SELECT id FROM files WHERE id IN ({placeholders})", batch)}
+                if not existing:
+                    continue
+                conn.execute(f"""INSERT OR IGNORE INTO pending_unlinks (encrypted_filename)
+                                 SELECT encrypted_filename FROM files WHERE id IN ({placeholders})""", batch)
+                conn.execute(f"DELETE FROM files WHERE id IN ({placeholders})", batch)
+                deleted.extend(file_id for file_id in batch if file_id in existing)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        print(f"{len(deleted)} dosya kaydı silindi, şifreli dosyalar silme kuyruğunda ('{vault_name}').")
+        notify_change(vault_name, deleted=deleted)
+        return deleted
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' veritabanından dosya kayıtları silinemedi: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def get_pending_unlinks(vault_name: str, after_rowid: int = 0, limit: int = 500) -> Optional[List[tuple]]:
+    """Silme kuyruğundan (rowid, encrypted_filename) çiftlerini rowid sırasıyla döndürür."""
+    sql = "SELECT rowid, encrypted_filename FROM pending_unlinks WHERE rowid > ? ORDER BY rowid LIMIT ?"
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        return [tuple(row) for row in conn.execute(sql, (after_rowid, limit))]
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' silme kuyruğu okunamadı: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def get_pending_unlink_names(vault_name: str) -> Optional[set]:
+    """Kuyruktaki tüm şifreli dosya adları (uzlaştırmada yetim sayılmazlar)."""
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        return {row[0] for row in conn.execute("SELECT encrypted_filename FROM pending_unlinks")}
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' silme kuyruğu okunamadı: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def complete_pending_unlinks(vault_name: str, removed: List[str], failed: List[tuple]) -> bool:
+    """Silinen dosyaları kuyruktan çıkarır, başarısızların (ad, hata) deneme sayısını artırır."""
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        with conn:
+            conn.executemany("DELETE FROM pending_unlinks WHERE encrypted_filename = ?",
+                             ((name,) for name in removed))
+            conn.executemany("UPDATE pending_unlinks SET attempts = attempts + 1, last_error = ? WHERE encrypted_filename = ?",
+                             ((error, name) for name, error in failed))
+        return True
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' silme kuyruğu güncellenemedi: {e}")
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+# --- İçe Aktarma İşleri --- #
+
+def create_import_job_records(vault_name: str, sources: List[tuple]) -> Optional[str]:
+    """Yeni içe aktarma işini öğeleriyle birlikte tek transaction'da oluşturur.
+
+    sources: (yol, boyut, mtime_ns, eşleşen_dosya_id) listesi; eşleşen_dosya_id doluysa
+    kaynak daha önce yarım kalan bir işte eklenmiştir ve öğe 'skipped' olarak kaydedilir.
+    Aynı kaynakların diğer yarım işlerdeki bekleyen öğeleri yeni işe devredilir (silinir).
+    İş ID'sini veya hata durumunda None döndürür.
+    """
+    keys = get_metadata_keys(vault_name)
+    if keys is None:
+        print(f"HATA: '{vault_name}' meta veri anahtarı yok; içe aktarma işi oluşturulamadı.")
+        return None
+    job_id = str(uuid.uuid4())
+    rows = []
+    for seq, (path, size_bytes, mtime_ns, matched_file_id) in enumerate(sources):
+        item_id = str(uuid.uuid4())
+        state = IMPORT_SKIPPED if matched_file_id else IMPORT_PENDING
+        rows.append((item_id, job_id, seq, encrypt_field(keys, COLUMN_SOURCE, item_id, path),
+                     blind_index(keys, COLUMN_SOURCE, path), size_bytes, mtime_ns, state, matched_file_id))
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        with conn:
+            conn.executemany("DELETE FROM import_items WHERE source_index = ? AND state = ?",
+                             ((row[4], IMPORT_PENDING) for row in rows))
+            conn.execute("INSERT INTO import_jobs (id) VALUES (?)", (job_id,))
+            conn.executemany("""INSERT INTO import_items (id, job_id, seq, source_enc, source_index, size_bytes,
+                                                          mtime_ns, state, file_id)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+            # Bekleyen öğesi kalmayan eski işler tamamlanmış sayılır
+            conn.execute("""DELETE FROM import_items WHERE job_id IN (
+                                SELECT id FROM import_jobs WHERE id != ? AND NOT EXISTS (
+                                    SELECT 1 FROM import_items i WHERE i.job_id = import_jobs.id AND i.state = ?))""",
+                         (job_id, IMPORT_PENDING))
+            conn.execute("""DELETE FROM import_jobs WHERE id != ? AND NOT EXISTS (
+                                SELECT 1 FROM import_items i WHERE i.job_id = import_jobs.id)""", (job_id,))
+        return job_id
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' içe aktarma işi oluşturulamadı: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def find_imported_sources(vault_name: str, paths: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Yarım kalan işlerde bu yollardan eklenmiş ve dosya kaydı hâlâ duran öğeleri bulur.
+
+    Kör indeksler ID_QUERY_BATCH_SIZE'lık gruplar halinde tek bağlantıda sorgulanır.
+    Yol -> eşleşmeler sözlüğü döndürür (eşleşmesi olmayan yollar yer almaz); her
+    eşleşme: source (çözülmüş yol), size_bytes, mtime_ns, file_id.
+    """
+    keys = get_metadata_keys(vault_name)
+    if keys is None or not paths:
+        return {}
+    wanted = set(paths)
+    indexes = list({blind_index(keys, COLUMN_SOURCE, path) for path in wanted})
+    matches: Dict[str, List[Dict[str, Any]]] = {}
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        for start in range(0, len(indexes), ID_QUERY_BATCH_SIZE):
+            batch = indexes[start:start + ID_QUERY_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            sql = f"""SELECT i.id, i.source_enc, i.size_bytes, i.mtime_ns, i.file_id FROM import_items i
+                      JOIN files f ON f.id = i.file_id
+                      WHERE i.source_index IN ({placeholders}) AND i.state IN (?, ?)"""
+            for row in conn.execute(sql, (*batch, IMPORT_DONE, IMPORT_SKIPPED)):
+                source = decrypt_field(keys, COLUMN_SOURCE, row['id'], row['source_enc'])
+                if source in wanted: # Kör indeks büyük/küçük harf duyarsızdır; yol tam eşleşmeli
+                    matches.setdefault(source, []).append({"source": source, "size_bytes": row['size_bytes'],
+                                                           "mtime_ns": row['mtime_ns'], "file_id": row['file_id']})
+        return matches
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' içe aktarma kayıtları okunamadı: {e}")
+        return {}
+    finally:
+        if conn:
+            conn.close()
+
+def get_import_jobs(vault_name: str) -> List[Dict[str, Any]]:
+    """Yarım kalan içe aktarma işlerini öğe sayıları ve bekleyen byte miktarıyla döndürür."""
+    sql = """SELECT j.id, j.created_at,
+                    COUNT(i.id) AS total_items,
+                    COALESCE(SUM(i.state = ?), 0) AS pending_items,
+                    COALESCE(SUM(CASE WHEN i.state = ? THEN i.size_bytes ELSE 0 END), 0) AS pending_bytes
+             FROM import_jobs j LEFT JOIN import_items i ON i.job_id = j.id
+             GROUP BY j.id ORDER BY j.created_at"""
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        return [dict(row) for row in conn.execute(sql, (IMPORT_PENDING, IMPORT_PENDING))]
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' içe aktarma işleri okunamadı: {e}")
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+def get_pending_import_items(vault_name: str, job_id: str) -> Optional[List[Dict[str, Any]]]:
+    """İşin bekleyen öğelerini sırasıyla (id, source, size_bytes, mtime_ns) döndürür."""
+    keys = get_metadata_keys(vault_name)
+    if keys is None:
+        print(f"HATA: '{vault_name}' meta veri anahtarı yok; içe aktarma işi okunamadı.")
+        return None
+    sql = "SELECT id, source_enc, size_bytes, mtime_ns FROM import_items WHERE job_id = ? AND state = ? ORDER BY seq"
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        items = []
+        for row in conn.execute(sql, (job_id, IMPORT_PENDING)):
+            source = decrypt_field(keys, COLUMN_SOURCE, row['id'], row['source_enc'])
+            if source is None:
+                print(f"HATA: İçe aktarma öğesinin kaynak yolu çözülemedi (ID: {row['id']})")
+                continue
+            items.append({"id": row['id'], "source": source,
+                          "size_bytes": row['size_bytes'], "mtime_ns": row['mtime_ns']})
+        return items
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' içe aktarma öğeleri okunamadı: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def complete_import_item(vault_name: str, item_id: str, file_info: Dict[str, Any],
+                         size_bytes: int, mtime_ns: int) -> Optional[str]:
+    """Dosya kaydını ekler ve öğeyi 'done' olarak işaretler (tek transaction: çökme sonrası
+    ya ikisi birden vardır ya hiçbiri). Eklenen dosya ID'sini döndürür."""
+    file_id = str(uuid.uuid4())
+    row = _file_record_row(get_metadata_keys(vault_name), file_id, file_info)
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        with conn:
+            conn.execute(SQL_INSERT_FILE, row)
+            conn.execute("UPDATE import_items SET state = ?, file_id = ?, size_bytes = ?, mtime_ns = ? WHERE id = ?",
+                         (IMPORT_DONE, file_id, size_bytes, mtime_ns, item_id))
+        notify_change(vault_name, inserted=[file_id])
+        return file_id
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' içe aktarılan dosya kaydedilemedi: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def mark_import_item_failed(vault_name: str, item_id: str) -> bool:
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        with conn:
+            conn.execute("UPDATE import_items SET state = ? WHERE id = ?", (IMPORT_FAILED, item_id))
+        return True
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' içe aktarma öğesi güncellenemedi: {e}")
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+def delete_import_job(vault_name: str, job_id: str) -> bool:
+    """İşi ve öğelerini siler (tamamlanınca veya kullanıcı vazgeçince)."""
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        with conn:
+            conn.execute("DELETE FROM import_items WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM import_jobs WHERE id = ?", (job_id,))
+        return True
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' içe aktarma işi silinemedi: {e}")
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+def get_vault_stats(vault_name: str) -> Optional[Dict[str, Any]]:
+    """Trigger'larla güncel tutulan kasa özetini (file_count, total_size, last_modified) döndürür."""
+    sql = "SELECT file_count, total_size, last_modified FROM vault_stats WHERE id = 1"
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        row = conn.execute(sql).fetchone()
+        return dict(row) if row else None
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' kasa istatistikleri alınamadı: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+def search_files(vault_name: str, query: str, limit: int = 200) -> List[Dict[str, Any]]:
+    """Dosya adında `query` geçen kayıtları sıralı döndürür.
+
+    rank: 0 = tam eşleşme, 1 = önek eşleşmesi, 2 = ad içinde geçiyor (küçük/büyük harf duyarsız).
+    Şifreli adlarda alt dize araması indeksle yapılamaz; adlar çözülüp bellekte süzülür.
+    """
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    sql = """SELECT id, original_filename, file_type, size_bytes, modified_at,
+                    CASE WHEN original_filename = ? COLLATE NOCASE THEN 0
+                         WHEN original_filename LIKE ? ESCAPE '\\' THEN 1
+                         ELSE 2 END AS rank
+             FROM files
+             WHERE name_enc IS NULL AND original_filename LIKE ? ESCAPE '\\'
+             ORDER BY rank, original_filename COLLATE NOCASE
+             LIMIT ?"""
+    sql_encrypted = "SELECT id, name_enc, file_type, type_enc, size_bytes, modified_at FROM files WHERE name_enc IS NOT NULL"
+    keys = get_metadata_keys(vault_name)
+    needle = normalize_for_index(COLUMN_NAME, query)
+    conn = None
+    try:
+        conn = db_connect(vault_name)
+        results = [dict(row) for row in conn.execute(sql, (query, escaped + "%", "%" + escaped + "%", limit))]
+        if keys is not None:
+            for row in conn.execute(sql_encrypted):
+                record = _decode_row(keys, row)
+                name = normalize_for_index(COLUMN_NAME, record['original_filename'])
+                if needle not in name:
+                    continue
+                record['rank'] = 0 if name == needle else 1 if name.startswith(needle) else 2
+                results.append(record)
+            results.sort(key=lambda r: (r['rank'], file_sort_key(r)))
+        return results[:limit]
+    except sqlite3.Error as e:
+        print(f"HATA: '{vault_name}' veritabanında arama yapılamadı: {e}")
+        return []
+    finally:
+        if conn:
+            conn.close()
@@ -0,0 +1,172 @@
+import datetime
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .metadata_crypto import COLUMN_NAME, normalize_for_index
+
+# Kasa listesi satır başına sözlük yerine sütunlarda tutulur: ad ve ID için birer
+# str, boyut ve zamanlar için array('q') içinde 8'er byte, tür için tekrar eden
+# değerlerin tablosuna 4 byte'lık bir indeks. Zaman damgaları UNIX saniyesi olarak
+# saklanır; datetime nesneleri yalnızca okunduklarında oluşturulur.
+
+_MISSING = -(2 ** 63) # Boyut/zaman sütunlarında NULL yerine
+_NO_TYPE = -1
+
+# FileEntry üzerinden sözlük gibi okunabilen alanlar (get_files_by_ids kayıtlarıyla aynı adlar)
+FIELDS = ("id", "original_filename", "file_type", "size_bytes", "created_at", "modified_at")
+
+# from_records'un beklediği satır: (id, ad, tür, boyut, oluşturma zamanı, değişiklik zamanı);
+# zamanlar UTC UNIX saniyesi, bilinmeyen değerler None
+ListingRecord = Tuple[str, str, Optional[str], Optional[int], Optional[int], Optional[int]]
+
+
+def _timestamp_to_datetime(value: int) -> Optional[datetime.datetime]:
+    """Saklanan saniyeyi, sqlite3'ün TIMESTAMP dönüştürücüsünün verdiği naive UTC datetime'a çevirir."""
+    if value == _MISSING:
+        return None
+    return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).replace(tzinfo=None)
+
+
+class FileEntry:
+    """FileListing'deki bir satırın görünümü; değerler okundukça sütunlardan alınır.
+
+    Eski sözlük kayıtlarıyla uyumlu olarak entry['id'] ve entry.get('file_type')
+    biçiminde de okunabilir.
+    """
+
+    __slots__ = ("_listing", "_index")
+
+    def __init__(self, listing: "FileListing", index: int):
+        self._listing = listing
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._listing._ids[self._index]
+
+    @property
+    def original_filename(self) -> str:
+        return self._listing._names[self._index]
+
+    @property
+    def file_type(self) -> Optional[str]:
+        code = self._listing._type_codes[self._index]
+        return None if code == _NO_TYPE else self._listing._types[code]
+
+    @property
+    def size_bytes(self) -> Optional[int]:
+        size = self._listing._sizes[self._index]
+        return None if size == _MISSING else size
+
+    @property
+    def created_at(self) -> Optional[datetime.datetime]:
+        return _timestamp_to_datetime(self._listing._created[self._index])
+
+    @property
+    def modified_at(self) -> Optional[datetime.datetime]:
+        return _timestamp_to_datetime(self._listing._modified[self._index])
+
+    def __getitem__(self, field: str) -> Any:
+        if field not in FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        return getattr(self, field) if field in FIELDS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __repr__(self) -> str:
+        return f"FileEntry(id={self.id!r}, original_filename={self.original_filename!r})"
+
+
+class FileListing:
+    """Kasadaki dosyaların ada göre (harf duyarsız, eşitlikte ID) sıralı, salt okunur listesi.
+
+    Kullanım:
+        listing = vault_manager.list_files_in_vault("Kasam")
+        for entry in listing:
+            print(entry.id, entry.original_filename, entry.size_bytes)
+        first_page = [listing[i] for i in range(min(100, len(listing)))]
+    """
+
+    __slots__ = ("_ids", "_names", "_types", "_type_codes", "_sizes", "_created", "_modified", "_positions")
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._names: List[str] = []
+        self._types: List[str] = []       # Farklı tür değerleri (her biri bir kez)
+        self._type_codes = array('i')     # Satırın _types indeksi veya _NO_TYPE
+        self._sizes = array('q')
+        self._created = array('q')
+        self._modified = array('q')
+        self._positions: Optional[Dict[str, int]] = None # index_of için, ilk kullanımda kurulur
+
+    @classmethod
+    def from_records(cls, records: Iterable[ListingRecord]) -> "FileListing":
+        """Satırları (sırasız, akış halinde) sütunlara ekler ve listeyi ada göre sıralar."""
+        listing = cls()
+        type_codes: Dict[str, int] = {}
+        for file_id, name, file_type, size_bytes, created, modified in records:
+            listing._ids.append(file_id)
+            listing._names.append(name)
+            if file_type is None:
+                listing._type_codes.append(_NO_TYPE)
+            else:
+                code = type_codes.get(file_type)
+                if code is None:
+                    code = type_codes[file_type] = len(listing._types)
+                    listing._types.append(file_type)
+                listing._type_codes.append(code)
+            listing._sizes.append(_MISSING if size_bytes is None else size_bytes)
+            listing._created.append(_MISSING if created is None else created)
+            listing._modified.append(_MISSING if modified is None else modified)
+        listing._sort()
+        return listing
+
+    def _sort(self):
+        names, ids = self._names, self._ids
+        order = sorted(range(len(ids)), key=lambda i: (normalize_for_index(COLUMN_NAME, names[i]), ids[i]))
+        if all(i == position for position, i in enumerate(order)):
+            return
+        self._ids = [ids[i] for i in order]
+        self._names = [names[i] for i in order]
+        for column in ("_type_codes", "_sizes", "_created", "_modified"):
+            values = getattr(self, column)
+            setattr(self, column, array(values.typecode, (values[i] for i in order)))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        for index in range(len(self._ids)):
+            yield FileEntry(self, index)
+
+    def __getitem__(self, index: int) -> FileEntry:
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("FileListing index out of range")
+        return FileEntry(self, index)
+
+    @property
+    def ids(self) -> List[str]:
+        """Sıralı dosya ID'leri (değiştirilmemeli)."""
+        return self._ids
+
+    def index_of(self, file_id: str) -> Optional[int]:
+        """ID'nin listedeki sırası; yoksa None."""
+        if self._positions is None:
+            self._positions = {file_id: index for index, file_id in enumerate(self._ids)}
+        return self._positions.get(file_id)
+
+    def get(self, file_id: str) -> Optional[FileEntry]:
+        index = self.index_of(file_id)
+        return None if index is None else FileEntry(self, index)
+
+    def __contains__(self, file_id: object) -> bool:
+        return isinstance(file_id, str) and self.index_of(file_id) is not None
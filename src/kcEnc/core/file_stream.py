@@ -0,0 +1,182 @@
+import mmap
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from .crypto_utils import (
+    ChunkCipher,
+    chunked_plaintext_size,
+    encrypted_chunk_size,
+)
+from .buffer_pool import get_buffer_pool
+
+
+class DecryptedFileStream:
+    """Şifreli bir kasa dosyasının çözülmüş içeriğine rastgele erişim sağlar.
+
+    Her tüketici (HTTP isteği, async okuyucu vb.) kendi akışını açmalıdır;
+    akış nesneleri thread'ler arasında paylaşılmak için tasarlanmamıştır.
+    """
+
+    size: int = 0
+
+    def iter_range(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """[start, end) aralığındaki plaintext'i parça parça verir."""
+        raise NotImplementedError
+
+    def read(self, offset: int = 0, length: Optional[int] = None) -> bytes:
+        end = None if length is None else offset + length
+        return b"".join(self.iter_range(offset, end))
+
+    def readinto(self, buffer, offset: int = 0) -> int:
+        """[offset, offset + len(buffer)) aralığını verilen tampona yazar; yazılan byte sayısını döndürür."""
+        target = memoryview(buffer)
+        written = 0
+        for chunk in self.iter_range(offset, offset + len(target)):
+            target[written:written + len(chunk)] = chunk
+            written += len(chunk)
+        return written
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _clamp(self, start: int, end: Optional[int]) -> tuple[int, int]:
+        end = self.size if end is None else min(end, self.size)
+        return max(0, start), end
+
+
+class ChunkedFileStream(DecryptedFileStream):
+    """Parçalı formatta şifrelenmiş dosya: yalnızca istenen aralığın parçaları okunup çözülür.
+
+    Şifreli dosya mmap ile eşlenir; parçalar ara kopya oluşturmadan doğrudan
+    eşlemden çözülür.
+    """
+
+    def __init__(self, path: Path, key: bytes, iv: bytes, chunk_size: int, cipher: Optional[str] = None):
+        self._file: BinaryIO = open(path, 'rb')
+        try:
+            encrypted_size = self._file.seek(0, 2)
+            # Boş dosya eşlenemez; o durumda normal okuma yapılır
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if encrypted_size else None
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._view = memoryview(self._map) if self._map is not None else None
+        self._encrypted_size = encrypted_size
+        self._cipher = ChunkCipher(key, iv, cipher)
+        self._chunk_size = chunk_size
+        self._encrypted_chunk_size = encrypted_chunk_size(chunk_size)
+        self.size = chunked_plaintext_size(encrypted_size, chunk_size)
+        self._chunk_count = max(1, -(-self.size // chunk_size))
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    def _encrypted_chunk(self, index: int):
+        start = index * self._encrypted_chunk_size
+        if self._view is None:
+            self._file.seek(start)
+            return self._file.read(self._encrypted_chunk_size)
+        return self._view[start:min(start + self._encrypted_chunk_size, self._encrypted_size)]
+
+    def read_chunk(self, index: int) -> bytes:
+        """Tek bir parçayı okuyup çözer. Bozulmuş veride InvalidTag fırlatır."""
+        return self._cipher.decrypt_chunk(index, self._encrypted_chunk(index), index == self._chunk_count - 1)
+
+    def read_chunk_into(self, index: int, out) -> int:
+        """Parçayı `out` tamponuna (en az chunk_size byte) çözer; yazılan byte sayısını döndürür."""
+        return self._cipher.decrypt_chunk_into(index, self._encrypted_chunk(index), index == self._chunk_count - 1, out)
+
+    def iter_range(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        start, end = self._clamp(start, end)
+        if start >= end:
+            if self.size == 0:
+                self.read_chunk(0) # Boş dosyada da tag doğrulansın
+            return
+        first = start // self._chunk_size
+        last = (end - 1) // self._chunk_size
+        for index in range(first, last + 1):
+            chunk_start = index * self._chunk_size
+            lo = max(start - chunk_start, 0)
+            hi = min(end - chunk_start, self._chunk_size)
+            if lo == 0 and hi >= min(self._chunk_size, self.size - chunk_start):
+                yield self.read_chunk(index) # Tam parça: doğrudan çözülen nesne
+                continue
+            # Kısmi parça: havuzdaki tampona çöz, yalnızca istenen aralığı kopyala
+            with get_buffer_pool(self._chunk_size).borrow() as buffer:
+                length = self.read_chunk_into(index, buffer)
+                yield bytes(buffer[lo:min(hi, length)])
+
+    def iter_chunks_into(self, buffer: bytearray) -> Iterator[memoryview]:
+        """Tüm parçaları sırayla aynı tampona çözer ve geçerli bölümün görünümünü verir.
+
+        Verilen görünüm bir sonraki adımda üzerine yazılır; tüketici (örn. dosyaya
+        yazma) onu hemen kullanmalı, saklamamalıdır.
+        """
+        # Sıralı tam okumada eşlem yerine readinto kullanılır: okunan sayfalar sürecin
+        # RSS'inde birikmez, şifreli parça da havuzdaki tek bir tampona okunur.
+        view = memoryview(buffer)
+        with get_buffer_pool(self._encrypted_chunk_size).borrow() as encrypted:
+            encrypted_view = memoryview(encrypted)
+            self._file.seek(0)
+            for index in range(self._chunk_count):
+                n = self._file.readinto(encrypted_view)
+                length = self._cipher.decrypt_chunk_into(index, encrypted_view[:n], index == self._chunk_count - 1, view)
+                yield view[:length]
+
+    def readinto(self, buffer, offset: int = 0) -> int:
+        """[offset, offset + len(buffer)) aralığını tampona çözer; yazılan byte sayısını döndürür.
+
+        Parça sınırına hizalı tam parçalar ara tampon olmadan doğrudan hedefe çözülür.
+        """
+        target = memoryview(buffer)
+        start, end = self._clamp(offset, offset + len(target))
+        written = 0
+        position = start
+        while position < end:
+            index = position // self._chunk_size
+            chunk_start = index * self._chunk_size
+            chunk_length = min(self._chunk_size, self.size - chunk_start)
+            if position == chunk_start and end - position >= chunk_length:
+                written += self.read_chunk_into(index, target[written:])
+            else:
+                with get_buffer_pool(self._chunk_size).borrow() as scratch:
+                    self.read_chunk_into(index, scratch)
+                    lo = position - chunk_start
+                    hi = min(end - chunk_start, chunk_length)
+                    target[written:written + hi - lo] = memoryview(scratch)[lo:hi]
+                    written += hi - lo
+            position = start + written
+        return written
+
+    def close(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class BufferedFileStream(DecryptedFileStream):
+    """Eski (tek parça) formattaki dosyalar: içerik açılışta bir kez çözülür, sonra bellekten sunulur."""
+
+    def __init__(self, plaintext: bytes, chunk_size: int):
+        self._view = memoryview(plaintext)
+        self._chunk_size = chunk_size
+        self.size = len(plaintext)
+
+    def iter_range(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        start, end = self._clamp(start, end)
+        for offset in range(start, end, self._chunk_size):
+            yield bytes(self._view[offset:min(offset + self._chunk_size, end)])
+
+    def close(self):
+        self._view.release()
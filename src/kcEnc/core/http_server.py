@@ -0,0 +1,278 @@
+import hmac
+import ipaddress
+import json
+import mimetypes
+import re
+import secrets
+import socket
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+from . import vault_manager
+from .database_manager import get_file_metadata
+from .crypto_utils import InvalidTag
+
+DEFAULT_HOST = "127.0.0.1"
+TOKEN_QUERY_PARAM = "token"
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+HANDLER_JOIN_TIMEOUT = 5.0 # stop() içinde süren isteklerin bitmesi için beklenen süre (saniye)
+
+
+class VaultHttpServer:
+    """Açık bir kasanın dosyalarını yalnızca loopback üzerinden, salt okunur sunar.
+
+    Her oturum için rastgele bir erişim belirteci üretilir; istekler bunu
+    `?token=` parametresi veya `Authorization: Bearer` başlığı ile göndermelidir.
+    Dosyalar diske düz metin yazılmadan, parçalı çözme akışıyla sunulur ve
+    HTTP Range istekleri (tek aralık) desteklenir.
+
+    Uç noktalar:
+        GET /files               -> JSON dosya listesi (id, ad, boyut, url)
+        GET|HEAD /files/<id>     -> dosya içeriği
+    """
+
+    def __init__(self, vault_name: str, vault_key: bytes, host: str = DEFAULT_HOST, port: int = 0):
+        if not ipaddress.ip_address(host).is_loopback:
+            raise ValueError(f"Sunucu yalnızca loopback adresinde çalışabilir: {host}")
+        self.vault_name = vault_name
+        self._vault_key: Optional[bytes] = vault_key
+        self.token = secrets.token_urlsafe(32)
+        self._httpd = ThreadingHTTPServer((host, port), _VaultRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.vault_server = self
+        self._thread: Optional[threading.Thread] = None
+        # İstek işleyen thread -> bağlantısı; stop() süren akışları bunlar üzerinden keser
+        self._handlers: Dict[threading.Thread, socket.socket] = {}
+        self._handlers_lock = threading.Lock()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._httpd.server_address[:2]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    def url_for(self, file_id: str) -> str:
+        """Belirteç dahil, doğrudan açılabilir dosya URL'si."""
+        return f"{self.base_url}/files/{quote(file_id)}?{TOKEN_QUERY_PARAM}={self.token}"
+
+    @property
+    def index_url(self) -> str:
+        return f"{self.base_url}/files?{TOKEN_QUERY_PARAM}={self.token}"
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="kcEnc-http", daemon=True)
+        self._thread.start()
+        print(f"Yerel sunucu başlatıldı: {self.base_url} (kasa: {self.vault_name})")
+
+    def stop(self):
+        """Sunucuyu durdurur, anahtarı unutur ve süren istekleri keser.
+
+        Akış döngüleri her parçadan önce anahtarı kontrol eder; yazmada bekleyen
+        işleyiciler ise bağlantıları kapatılarak uyandırılır.
+        """
+        self._vault_key = None
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+        with self._handlers_lock:
+            handlers = list(self._handlers.items())
+        for _, connection in handlers:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass # Zaten kapanmış
+        for thread, _ in handlers:
+            thread.join(HANDLER_JOIN_TIMEOUT)
+        print(f"Yerel sunucu durduruldu (kasa: {self.vault_name})")
+
+    def check_token(self, candidate: Optional[str]) -> bool:
+        return candidate is not None and hmac.compare_digest(candidate.encode('utf-8'), self.token.encode('utf-8'))
+
+    def get_vault_key(self) -> Optional[bytes]:
+        """Sunucu durdurulduysa None."""
+        return self._vault_key
+
+    def _register_handler(self, connection: socket.socket):
+        with self._handlers_lock:
+            self._handlers[threading.current_thread()] = connection
+
+    def _unregister_handler(self):
+        with self._handlers_lock:
+            self._handlers.pop(threading.current_thread(), None)
+
+
+def parse_range_header(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """Tek aralıklı `Range` başlığını [start, end) aralığına çevirir.
+
+    Sözdizimi desteklenmiyorsa (örn. çoklu aralık) ValueError, aralık
+    karşılanamıyorsa None döndürür.
+    """
+    match = _RANGE_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"Desteklenmeyen Range başlığı: {value}")
+    first, last = match.groups()
+    if first == "" and last == "":
+        raise ValueError(f"Geçersiz Range başlığı: {value}")
+    if first == "":
+        # Son N byte
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            return None
+        return max(0, size - suffix), size
+    start = int(first)
+    end = size if last == "" else min(int(last) + 1, size)
+    if start >= size or start >= end:
+        return None
+    return start, end
+
+
+class _VaultRequestHandler(BaseHTTPRequestHandler):
+    server_version = "kcEnc"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def vault_server(self) -> VaultHttpServer:
+        return self.server.vault_server
+
+    def setup(self):
+        super().setup()
+        self.vault_server._register_handler(self.connection)
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            self.vault_server._unregister_handler()
+
+    def log_message(self, format, *args):
+        # Erişim günlüğü (URL'lerde belirteç bulunduğu için) basılmaz
+        pass
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def _handle(self, send_body: bool):
+        url = urlsplit(self.path)
+        if not self._authorized(url.query):
+            self._send_error(HTTPStatus.UNAUTHORIZED)
+            return
+        vault_key = self.vault_server.get_vault_key()
+        if vault_key is None:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE)
+            return
+
+        path = url.path.rstrip("/")
+        if path == "/files":
+            self._send_index(send_body)
+        elif path.startswith("/files/"):
+            self._send_file(path[len("/files/"):], vault_key, send_body)
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND)
+
+    def _authorized(self, query: str) -> bool:
+        auth = self.headers.get("Authorization", "")
+        if auth.startswith("Bearer "):
+            return self.vault_server.check_token(auth[len("Bearer "):])
+        values = parse_qs(query).get(TOKEN_QUERY_PARAM)
+        return bool(values) and self.vault_server.check_token(values[0])
+
+    def _send_index(self, send_body: bool):
+        server = self.vault_server
+        files = vault_manager.list_files_in_vault(server.vault_name)
+        body = json.dumps([{
+            "id": f['id'],
+            "name": f['original_filename'],
+            "size": f.get('size_bytes'),
+            "url": server.url_for(f['id']),
+        } for f in files], ensure_ascii=False).encode('utf-8')
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_file(self, file_id: str, vault_key: bytes, send_body: bool):
+        server = self.vault_server
+        metadata = get_file_metadata(server.vault_name, file_id)
+        if not metadata:
+            self._send_error(HTTPStatus.NOT_FOUND)
+            return
+        stream = vault_manager.open_decrypted_stream(server.vault_name, vault_key, metadata)
+        if stream is None:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR)
+            return
+
+        with stream:
+            size = stream.size
+            start, end = 0, size
+            status = HTTPStatus.OK
+            range_header = self.headers.get("Range")
+            if range_header:
+                try:
+                    byte_range = parse_range_header(range_header, size)
+                except ValueError:
+                    byte_range = (0, size) # Desteklenmeyen biçim: tüm içerik
+                if byte_range is None:
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                start, end = byte_range
+                if (start, end) != (0, size):
+                    status = HTTPStatus.PARTIAL_CONTENT
+
+            content_type = mimetypes.guess_type(metadata['original_filename'])[0] or "application/octet-stream"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(end - start))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Disposition", f"inline; filename*=UTF-8''{quote(metadata['original_filename'])}")
+            if status == HTTPStatus.PARTIAL_CONTENT:
+                self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+            self.end_headers()
+            if not send_body:
+                return
+
+            try:
+                for chunk in stream.iter_range(start, end):
+                    if server.get_vault_key() is None:
+                        # Sunucu durduruldu (kasa kilitlendi): akışı kes
+                        self.close_connection = True
+                        return
+                    self.wfile.write(chunk)
+            except InvalidTag:
+                # Başlıklar gönderildi; bağlantıyı keserek istemcinin eksik veriyi fark etmesini sağla
+                print(f"HATA: Sunulan dosyada bozuk parça (ID: {file_id})")
+                self.close_connection = True
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True # İstemci bağlantıyı kapattı (örn. oynatıcı atladı)
+
+    def _send_error(self, status: HTTPStatus):
+        body = status.phrase.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
@@ -0,0 +1,170 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from . import vault_manager
+from .database_manager import (
+    create_import_job_records,
+    find_imported_sources,
+    get_import_jobs,
+    get_pending_import_items,
+    complete_import_item,
+    mark_import_item_failed,
+    delete_import_job,
+    find_files_by_name
+)
+from .metadata_crypto import get_metadata_keys, register_metadata_keys
+from .progress import ProgressToken
+from .vault_lock import vault_write_lock, VaultBusyError
+
+# Toplu içe aktarma bir "iş" olarak metadata.db'ye yazılır (import_jobs/import_items).
+# Her dosya eklendiğinde dosya kaydı ve öğenin 'done' durumu aynı transaction'da
+# yazılır; uygulama kapanır veya çökerse iş, bekleyen öğelerinden devam eder.
+# Aynı kaynaklar yeniden seçilirse (yol, boyut ve mtime aynıysa) yarım işte zaten
+# eklenmiş olanlar yeniden şifrelenmez.
+
+
+class ImportSummary(NamedTuple):
+    job_id: str
+    added: int
+    already_done: int       # Bu çalıştırmadan önce eklenmiş veya atlanmış öğeler
+    failed: List[str]       # Eklenemeyen kaynak yollar
+    cancelled: bool         # İptal edildi veya kasa meşguldü: iş devam ettirilebilir
+
+
+def _ensure_metadata_keys(vault_name: str, vault_key: bytes):
+    if get_metadata_keys(vault_name) is None:
+        register_metadata_keys(vault_name, vault_key)
+
+
+def _source_signature(path: Path):
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def create_import_job(vault_name: str, vault_key: bytes, paths: List[Path]) -> Optional[str]:
+    """Kaynak dosyalar için yeni bir içe aktarma işi oluşturur; iş ID'sini döndürür.
+
+    Yarım kalmış bir işte aynı yol, boyut ve mtime ile eklenmiş (ve kasada hâlâ
+    duran) kaynaklar 'skipped' olarak kaydedilir ve tekrar eklenmez.
+    """
+    _ensure_metadata_keys(vault_name, vault_key)
+    signed = []
+    for path in paths:
+        source = os.path.abspath(path)
+        try:
+            size_bytes, mtime_ns = _source_signature(Path(source))
+        except OSError:
+            size_bytes, mtime_ns = -1, -1 # Çalıştırılınca hata olarak raporlanır
+        signed.append((source, size_bytes, mtime_ns))
+    imported = find_imported_sources(vault_name, [source for source, _, _ in signed])
+
+    sources = []
+    skipped = 0
+    for source, size_bytes, mtime_ns in signed:
+        matched_file_id = None
+        for match in imported.get(source, ()):
+            if match['size_bytes'] == size_bytes and match['mtime_ns'] == mtime_ns:
+                matched_file_id = match['file_id']
+                skipped += 1
+                break
+        sources.append((source, size_bytes, mtime_ns, matched_file_id))
+    try:
+        with vault_write_lock(vault_name):
+            job_id = create_import_job_records(vault_name, sources)
+    except VaultBusyError as e:
+        print(f"HATA: {e}")
+        return None
+    if job_id and skipped:
+        print(f"{skipped} kaynak daha önce yarım kalan bir içe aktarmada eklenmiş; atlanacak.")
+    return job_id
+
+
+def import_files(vault_name: str, vault_key: bytes, paths: List[Path],
+                 progress: Optional[ProgressToken] = None) -> Optional[ImportSummary]:
+    """Kaynaklar için yeni bir iş oluşturup çalıştırır (ikisi de çağıran thread'de, örn. ilerleme diyaloğunda)."""
+    job_id = create_import_job(vault_name, vault_key, paths)
+    if not job_id:
+        return None
+    return run_import_job(vault_name, vault_key, job_id, progress)
+
+
+def get_unfinished_import_jobs(vault_name: str) -> List[Dict[str, Any]]:
+    """Bekleyen öğesi olan (yarım kalmış) işler: id, created_at, total_items, pending_items, pending_bytes."""
+    return [job for job in get_import_jobs(vault_name) if job['pending_items'] > 0]
+
+
+def discard_import_job(vault_name: str, job_id: str) -> bool:
+    """Yarım kalan işten vazgeçer (eklenmiş dosyalar kasada kalır)."""
+    return delete_import_job(vault_name, job_id)
+
+
+def run_import_job(vault_name: str, vault_key: bytes, job_id: str,
+                   progress: Optional[ProgressToken] = None) -> Optional[ImportSummary]:
+    """İşin bekleyen öğelerini sırayla şifreleyip ekler; yeni iş için de devam için de kullanılır.
+
+    progress verilirse bekleyen byte/dosya toplamı eklenir. İptal edilirse o anki
+    dosya geri alınır ve iş bekleyen öğeleriyle kalır. İş bitince (başarısız öğeler
+    olsa bile) kaydı silinir.
+    """
+    _ensure_metadata_keys(vault_name, vault_key)
+    jobs = {job['id']: job for job in get_import_jobs(vault_name)}
+    items = get_pending_import_items(vault_name, job_id)
+    if job_id not in jobs or items is None:
+        print(f"HATA: İçe aktarma işi bulunamadı (ID: {job_id})")
+        return None
+    already_done = jobs[job_id]['total_items'] - len(items)
+    if progress:
+        progress.add_total(sum(max(item['size_bytes'], 0) for item in items), len(items))
+
+    added = 0
+    failed = []
+    interrupted = False
+    for item in items:
+        if progress and progress.is_cancelled:
+            interrupted = True
+            break
+        source = Path(item['source'])
+        try:
+            with vault_write_lock(vault_name):
+                file_id = _import_item(vault_name, vault_key, item['id'], source, progress)
+        except VaultBusyError as e:
+            print(f"HATA: {e}; içe aktarma daha sonra devam ettirilebilir.")
+            interrupted = True
+            break
+        if file_id:
+            added += 1
+        elif progress and progress.is_cancelled:
+            interrupted = True
+            break
+        else:
+            mark_import_item_failed(vault_name, item['id'])
+            failed.append(str(source))
+        if progress:
+            progress.advance(done_items=1)
+
+    if not interrupted:
+        delete_import_job(vault_name, job_id)
+    print(f"İçe aktarma ({job_id}): {added} dosya eklendi, {already_done} önceden tamamlanmış, "
+          f"{len(failed)} başarısız{', yarıda kaldı' if interrupted else ''}.")
+    return ImportSummary(job_id, added, already_done, failed, interrupted)
+
+
+def _import_item(vault_name: str, vault_key: bytes, item_id: str, source: Path,
+                 progress: Optional[ProgressToken]) -> Optional[str]:
+    try:
+        size_bytes, mtime_ns = _source_signature(source)
+    except OSError as e:
+        print(f"HATA: Kaynak dosya okunamadı: {source}\n{e}")
+        return None
+    if find_files_by_name(vault_name, source.name):
+        print(f"Uyarı: Kasada '{source.name}' adlı bir dosya zaten var; yeni kopya ekleniyor.")
+    file_info = vault_manager.encrypt_file_into_vault(vault_name, vault_key, source, progress)
+    if not file_info:
+        return None
+    file_id = complete_import_item(vault_name, item_id, file_info, size_bytes, mtime_ns)
+    if file_id:
+        vault_manager.release_uncommitted_files(vault_name, [file_info['encrypted_filename']])
+    else:
+        vault_manager.discard_encrypted_file(vault_name, file_info['encrypted_filename'])
+    return file_id
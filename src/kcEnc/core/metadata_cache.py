@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from .change_events import VaultChange, add_change_listener
+
+# get_file_metadata sonuçları oturum boyunca ID'ye göre bellekte tutulur; tek bir
+# kullanıcı işlemi (görüntüle, farklı kaydet, silme onayı) veritabanına en fazla bir
+# kez gider. Bu süreçteki yazmalar (change_events) ilgili kayıtları commit'ten hemen
+# sonra geçersiz kılar. Kayıtlarda çözülmüş dosya adları bulunduğundan kasa
+# kilitlenince kasanın önbelleği silinmelidir (forget_cached_metadata).
+# Başka bir sürecin yaptığı değişiklikler bildirilmez; silinmiş bir dosyanın önbellekteki
+# kaydıyla açma denemesi dosya bulunamadı hatası verir.
+MAX_CACHED_ENTRIES = 1024 # Kasa başına; dolunca en uzun süredir kullanılmayan çıkarılır
+
+
+class _VaultMetadataCache:
+    def __init__(self):
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Her geçersiz kılmada artar: sorgusu geçersiz kılmadan önce başlamış
+        # (eski satırı okumuş olabilecek) bir sonuç önbelleğe yazılmaz
+        self.generation = 0
+
+
+_caches: Dict[str, _VaultMetadataCache] = {}
+_caches_lock = threading.Lock()
+
+
+def metadata_cache_generation(vault_name: str) -> int:
+    """Veritabanı sorgusundan önce alınır ve cache_metadata'ya verilir."""
+    with _caches_lock:
+        cache = _caches.get(vault_name)
+        return cache.generation if cache else 0
+
+
+def get_cached_metadata(vault_name: str, file_id: str) -> Optional[Dict[str, Any]]:
+    """Önbellekteki kaydın bir kopyasını döndürür; yoksa None."""
+    with _caches_lock:
+        cache = _caches.get(vault_name)
+        metadata = cache.entries.get(file_id) if cache else None
+        if metadata is None:
+            return None
+        cache.entries.move_to_end(file_id)
+    return dict(metadata) # Çağıranın değişiklikleri önbelleğe yansımasın
+
+
+def cache_metadata(vault_name: str, file_id: str, metadata: Dict[str, Any], generation: int):
+    """Sorgu sonucunu önbelleğe yazar; sorgu sürerken kasada değişiklik olduysa yazmaz."""
+    with _caches_lock:
+        cache = _caches.setdefault(vault_name, _VaultMetadataCache())
+        if cache.generation != generation:
+            return
+        cache.entries[file_id] = dict(metadata)
+        cache.entries.move_to_end(file_id)
+        while len(cache.entries) > MAX_CACHED_ENTRIES:
+            cache.entries.popitem(last=False)
+
+
+def invalidate_cached_metadata(vault_name: str, file_ids: Iterable[str]):
+    with _caches_lock:
+        cache = _caches.setdefault(vault_name, _VaultMetadataCache())
+        cache.generation += 1
+        for file_id in file_ids:
+            cache.entries.pop(file_id, None)
+
+
+def forget_cached_metadata(vault_name: str):
+    """Kasa kilitlenirken çağrılır."""
+    with _caches_lock:
+        cache = _caches.get(vault_name)
+        if cache:
+            cache.generation += 1
+            cache.entries.clear()
+
+
+def clear_metadata_cache():
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.generation += 1
+            cache.entries.clear()
+
+
+def _on_vault_changed(change: VaultChange):
+    # Eklenen ID'ler yenidir, önbellekte olamaz
+    if change.updated or change.deleted:
+        invalidate_cached_metadata(change.vault_name, (*change.updated, *change.deleted))
+
+
+add_change_listener(_on_vault_changed)
@@ -0,0 +1,107 @@
+import functools
+import hmac
+import hashlib
+import os
+import threading
+import unicodedata
+from typing import Dict, NamedTuple, Optional
+
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from .crypto_utils import KEY_SIZE_BYTES, AES_GCM_IV_SIZE_BYTES, InvalidTag
+
+# metadata.db'deki hassas sütunlar (dosya adı, tür) kasa anahtarından türetilen ayrı
+# anahtarlarla şifrelenir. Eşitlik aramaları için değerin anahtarlı HMAC'i ("kör indeks")
+# ayrı, indeksli bir sütunda tutulur: aynı değer aynı indeksi verir ama anahtarsız
+# değerin kendisi çıkarılamaz.
+METADATA_ENC_HKDF_INFO = b"kcEnc metadata encryption key v1"
+METADATA_INDEX_HKDF_INFO = b"kcEnc metadata blind index key v1"
+BLIND_INDEX_SIZE_BYTES = 16 # Kesilmiş HMAC-SHA256; eşleşmeler çözülerek ayrıca doğrulanır
+
+COLUMN_NAME = "name"
+COLUMN_TYPE = "type"
+COLUMN_SOURCE = "source" # İçe aktarma işlerindeki kaynak dosya yolu
+
+
+class MetadataKeys(NamedTuple):
+    enc_key: bytes
+    index_key: bytes
+
+
+def derive_metadata_keys(vault_key: bytes) -> MetadataKeys:
+    """Kasa anahtarından meta veri şifreleme ve kör indeks anahtarlarını türetir."""
+    def derive(info: bytes) -> bytes:
+        return HKDF(algorithm=hashes.SHA256(), length=KEY_SIZE_BYTES, salt=None, info=info).derive(vault_key)
+    return MetadataKeys(derive(METADATA_ENC_HKDF_INFO), derive(METADATA_INDEX_HKDF_INFO))
+
+
+def normalize_for_index(column: str, value: str) -> str:
+    """Kör indeks öncesi normalleştirme: aramalar büyük/küçük harf duyarsızdır (eski NOCASE gibi)."""
+    return unicodedata.normalize("NFC", value).casefold()
+
+
+def blind_index(keys: MetadataKeys, column: str, value: str) -> bytes:
+    """Değerin sütuna özgü anahtarlı HMAC'i (farklı sütunlardaki aynı değer farklı indeks verir)."""
+    message = column.encode() + b"\0" + normalize_for_index(column, value).encode("utf-8")
+    return hmac.new(keys.index_key, message, hashlib.sha256).digest()[:BLIND_INDEX_SIZE_BYTES]
+
+
+@functools.lru_cache(maxsize=16)
+def _field_aead(enc_key: bytes) -> AESGCM:
+    # Listeleme her satır için alan çözer; AESGCM nesnesini her seferinde kurmamak için
+    return AESGCM(enc_key)
+
+
+def _field_aad(column: str, file_id: str) -> bytes:
+    # Şifreli değer satıra ve sütuna bağlanır; başka satıra kopyalanırsa çözülemez
+    return f"kcEnc metadata:{column}:{file_id}".encode("utf-8")
+
+
+def encrypt_field(keys: MetadataKeys, column: str, file_id: str, value: str) -> bytes:
+    """Değeri AES-GCM ile şifreler: nonce || şifreli metin+tag."""
+    nonce = os.urandom(AES_GCM_IV_SIZE_BYTES)
+    return nonce + _field_aead(keys.enc_key).encrypt(nonce, value.encode("utf-8"), _field_aad(column, file_id))
+
+
+def decrypt_field(keys: MetadataKeys, column: str, file_id: str, blob: bytes) -> Optional[str]:
+    """encrypt_field'in tersi. Yanlış anahtar veya bozuk veri için None döndürür."""
+    try:
+        nonce, ciphertext = blob[:AES_GCM_IV_SIZE_BYTES], blob[AES_GCM_IV_SIZE_BYTES:]
+        return _field_aead(keys.enc_key).decrypt(nonce, ciphertext, _field_aad(column, file_id)).decode("utf-8")
+    except (InvalidTag, ValueError, UnicodeDecodeError):
+        return None
+
+
+# --- Açık kasaların meta veri anahtarları --- #
+# Veritabanı fonksiyonları kasa adıyla çağrılır; anahtarlar kasa açılınca burada
+# kaydedilir, kilitlenince unutulur. Anahtarı kayıtlı olmayan kasada şifreli
+# alanlar çözülemez (liste yine döner, ad yerine yer tutucu görünür).
+
+_registered_keys: Dict[str, MetadataKeys] = {}
+_registered_lock = threading.Lock()
+
+
+def register_metadata_keys(vault_name: str, vault_key: bytes) -> MetadataKeys:
+    keys = derive_metadata_keys(vault_key)
+    with _registered_lock:
+        _registered_keys[vault_name] = keys
+    return keys
+
+
+def get_metadata_keys(vault_name: str) -> Optional[MetadataKeys]:
+    with _registered_lock:
+        return _registered_keys.get(vault_name)
+
+
+def forget_metadata_keys(vault_name: str):
+    with _registered_lock:
+        _registered_keys.pop(vault_name, None)
+    _field_aead.cache_clear()
+
+
+def clear_metadata_keys():
+    with _registered_lock:
+        _registered_keys.clear()
+    _field_aead.cache_clear()
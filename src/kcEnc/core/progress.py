@@ -0,0 +1,113 @@
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+
+class OperationCancelled(Exception):
+    """İşlem ProgressToken.cancel() ile iptal edildi."""
+
+
+class ProgressSnapshot(NamedTuple):
+    done_bytes: int
+    total_bytes: int
+    done_items: int
+    total_items: int
+    elapsed: float                 # saniye
+    bytes_per_second: float
+    items_per_second: float
+    eta_seconds: Optional[float]   # Toplam bilinmiyorsa veya hız ölçülemediyse None
+
+    @property
+    def fraction(self) -> Optional[float]:
+        if self.total_bytes > 0:
+            return min(1.0, self.done_bytes / self.total_bytes)
+        if self.total_items > 0:
+            return min(1.0, self.done_items / self.total_items)
+        return None
+
+
+class ProgressToken:
+    """Uzun süren kasa işlemleri için ilerleme bildirimi ve iptal belirteci.
+
+    Çekirdek fonksiyonlar her parçada advance() ve check() çağırır; iptal istenmişse
+    check() OperationCancelled fırlatır ve işlem yarım kalan çıktısını temizleyerek
+    sonlanır (fonksiyonun kendisi None/False döndürür). Callback en fazla
+    `min_interval` saniyede bir, işlemi yürüten thread'den çağrılır. Birden fazla thread aynı belirteci paylaşabilir.
+    """
+
+    def __init__(self, total_bytes: int = 0, total_items: int = 0,
+                 callback: Optional[Callable[[ProgressSnapshot], None]] = None,
+                 min_interval: float = 0.1):
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._callback = callback
+        self._min_interval = min_interval
+        self._started = time.monotonic()
+        self._last_report = 0.0
+        self.total_bytes = total_bytes
+        self.total_items = total_items
+        self.done_bytes = 0
+        self.done_items = 0
+
+    # --- İptal --- #
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise OperationCancelled()
+
+    # --- İlerleme --- #
+
+    def add_total(self, total_bytes: int = 0, total_items: int = 0):
+        with self._lock:
+            self.total_bytes += total_bytes
+            self.total_items += total_items
+
+    def advance(self, done_bytes: int = 0, done_items: int = 0):
+        """İlerlemeyi kaydeder ve gerekiyorsa callback'i çağırır."""
+        now = time.monotonic()
+        with self._lock:
+            self.done_bytes += done_bytes
+            self.done_items += done_items
+            report = self._callback is not None and (now - self._last_report >= self._min_interval or
+                                                     (done_items and self.done_items >= self.total_items))
+            if report:
+                self._last_report = now
+        if report:
+            self._callback(self.snapshot())
+
+    def snapshot(self) -> ProgressSnapshot:
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            bytes_rate = self.done_bytes / elapsed
+            items_rate = self.done_items / elapsed
+            eta = None
+            if self.total_bytes > 0 and bytes_rate > 0:
+                eta = max(0.0, (self.total_bytes - self.done_bytes) / bytes_rate)
+            elif self.total_items > 0 and items_rate > 0:
+                eta = max(0.0, (self.total_items - self.done_items) / items_rate)
+            return ProgressSnapshot(self.done_bytes, self.total_bytes, self.done_items, self.total_items,
+                                    elapsed, bytes_rate, items_rate, eta)
+
+
+def format_progress(snapshot: ProgressSnapshot) -> str:
+    """İlerlemeyi kullanıcıya gösterilecek tek satırlık metne çevirir."""
+    parts = []
+    if snapshot.total_items > 1:
+        parts.append(f"{snapshot.done_items}/{snapshot.total_items} dosya")
+    mb = 1024 * 1024
+    if snapshot.total_bytes:
+        parts.append(f"{snapshot.done_bytes / mb:.1f}/{snapshot.total_bytes / mb:.1f} MB")
+    parts.append(f"{snapshot.bytes_per_second / mb:.1f} MB/s")
+    if snapshot.total_items > 1:
+        parts.append(f"{snapshot.items_per_second:.1f} dosya/s")
+    if snapshot.eta_seconds is not None:
+        minutes, seconds = divmod(int(snapshot.eta_seconds + 0.5), 60)
+        parts.append(f"kalan ~{minutes}:{seconds:02d}")
+    return " · ".join(parts)
@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .database_manager import search_files
+
+DEFAULT_RESULT_LIMIT_PER_VAULT = 200
+DEFAULT_MAX_WORKERS = 8
+
+
+def search_result_sort_key(result: Dict) -> Tuple:
+    """Farklı kasalardan gelen sonuçları birleştirmek için sıralama anahtarı."""
+    return (result['rank'], result['original_filename'].casefold(), result['vault_name'].casefold())
+
+
+def search_vaults(vault_names: Iterable[str], query: str,
+                  limit_per_vault: int = DEFAULT_RESULT_LIMIT_PER_VAULT,
+                  max_workers: int = DEFAULT_MAX_WORKERS,
+                  is_cancelled: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, List[Dict]]]:
+    """Aramayı kasaların metadata veritabanlarında paralel yürütür.
+
+    Her kasa tamamlandıkça (vault_name, sonuçlar) verir; sonuçlar kasa içinde
+    sıralıdır ve her birine 'vault_name' eklenir. Birleştirme için
+    search_result_sort_key kullanılabilir. is_cancelled True dönerse kalan
+    kasaların sonuçları beklenmez.
+    """
+    names = list(vault_names)
+    query = query.strip()
+    if not names or not query:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(names)), thread_name_prefix="kcEnc-search")
+    try:
+        futures = {executor.submit(search_files, name, query, limit_per_vault): name for name in names}
+        for future in as_completed(futures):
+            if is_cancelled and is_cancelled():
+                return
+            vault_name = futures[future]
+            results = future.result()
+            for result in results:
+                result['vault_name'] = vault_name
+            yield vault_name, results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
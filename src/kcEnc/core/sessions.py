@@ -0,0 +1,48 @@
+import threading
+from typing import Dict, List, Optional
+
+
+class VaultSessions:
+    """Aynı anda açık tutulan kasaların (kasa adı -> anahtar) kaydı.
+
+    GUI ve arka plan işleri (örn. kasalar arası arama) aynı nesneyi paylaşabilir;
+    erişim bir kilitle korunur ve dışarıya anlık kopyalar verilir.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def add(self, vault_name: str, vault_key: bytes):
+        with self._lock:
+            self._keys[vault_name] = vault_key
+
+    def get_key(self, vault_name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._keys.get(vault_name)
+
+    def remove(self, vault_name: str) -> bool:
+        """Kasanın anahtarını unutur. Kasa açık değilse False döndürür."""
+        with self._lock:
+            return self._keys.pop(vault_name, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._keys, key=str.casefold)
+
+    def snapshot(self) -> Dict[str, bytes]:
+        """Açık kasaların anlık kopyası (arka plan işlerine verilmek üzere)."""
+        with self._lock:
+            return dict(self._keys)
+
+    def __contains__(self, vault_name: str) -> bool:
+        with self._lock:
+            return vault_name in self._keys
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
@@ -0,0 +1,95 @@
+import threading
+import time
+from typing import Dict, Tuple
+
+from ..utils.file_utils import get_vault_path
+from .database_manager import get_pending_unlinks, complete_pending_unlinks
+
+# Kayıtları silinmiş şifreli dosyalar (pending_unlinks tablosu) bu modüldeki tek bir
+# arka plan thread'i tarafından silinir; silme işlemi kullanıcıyı bekletmez.
+# Silinemeyen dosyalar kuyrukta kalır ve RETRY_DELAY_SECONDS sonra (ve kasa bir
+# sonraki açılışında) yeniden denenir. Kuyruk metadata.db'de olduğundan uygulama
+# kapansa bile iş kaybolmaz.
+UNLINK_BATCH_SIZE = 500
+RETRY_DELAY_SECONDS = 30.0
+
+VAULT_FILES_DIR = "files" # vault_manager.VAULT_FILES_DIR (döngüsel import olmasın diye)
+
+
+def drain_pending_unlinks(vault_name: str) -> Tuple[int, int]:
+    """Kuyruktaki dosyaları bir kez silmeyi dener; (silinen, başarısız) sayılarını döndürür.
+
+    Kasa kilidi gerekmez: kuyruktaki dosyaların kaydı yoktur ve yeni eklenen dosyalar
+    farklı (UUID) adlar alır. Aynı dosyayı iki süreç silmeye çalışırsa biri "yok" görür.
+    """
+    files_dir = get_vault_path(vault_name) / VAULT_FILES_DIR
+    removed_count = failed_count = 0
+    last_rowid = 0
+    while True:
+        batch = get_pending_unlinks(vault_name, last_rowid, UNLINK_BATCH_SIZE)
+        if not batch:
+            break
+        removed, failed = [], []
+        for rowid, encrypted_filename in batch:
+            last_rowid = rowid
+            try:
+                (files_dir / encrypted_filename).unlink(missing_ok=True)
+                removed.append(encrypted_filename)
+            except OSError as e:
+                failed.append((encrypted_filename, str(e)))
+        if not complete_pending_unlinks(vault_name, removed, failed):
+            break
+        removed_count += len(removed)
+        failed_count += len(failed)
+    if removed_count or failed_count:
+        print(f"'{vault_name}' silme kuyruğu: {removed_count} dosya silindi, {failed_count} dosya silinemedi.")
+    return removed_count, failed_count
+
+
+class _UnlinkWorker:
+    """Kasa adlarını sırayla işleyen tek arka plan thread'i (ilk istekte başlar)."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._due: Dict[str, float] = {} # Kasa adı -> en erken işlenme zamanı (monotonic)
+        self._thread = None
+
+    def schedule(self, vault_name: str, delay: float = 0.0):
+        due = time.monotonic() + delay
+        with self._condition:
+            # Daha erken bir istek varsa onu koru
+            if vault_name not in self._due or due < self._due[vault_name]:
+                self._due[vault_name] = due
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="kcEnc-unlink", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._due:
+                        vault_name, due = min(self._due.items(), key=lambda item: item[1])
+                        wait = due - time.monotonic()
+                        if wait <= 0:
+                            del self._due[vault_name]
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+            try:
+                _, failed = drain_pending_unlinks(vault_name)
+            except Exception as e:
+                print(f"HATA: '{vault_name}' silme kuyruğu işlenirken beklenmedik hata: {e}")
+                failed = 1
+            if failed:
+                self.schedule(vault_name, RETRY_DELAY_SECONDS)
+
+
+_worker = _UnlinkWorker()
+
+
+def schedule_pending_unlinks(vault_name: str, delay: float = 0.0):
+    """Kasanın silme kuyruğunun arka planda işlenmesini ister (hemen döner)."""
+    _worker.schedule(vault_name, delay)
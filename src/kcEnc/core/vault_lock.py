@@ -0,0 +1,109 @@
+import contextlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError: # Windows: flock yok, kilit yalnızca süreç içinde geçerli olur
+    fcntl = None
+
+from ..utils.file_utils import get_vault_path
+
+# Kasa düzeyinde kilit protokolü:
+#  - Okuyucular kilit almaz. metadata.db WAL kipindedir (okuyucular yazarı beklemez,
+#    tutarlı bir anlık görüntü okur) ve .enc dosyaları yazıldıktan sonra değişmez
+#    (silme önce DB kaydını kaldırır; açık tanıtıcılar silinen dosyayı okumaya devam eder).
+#  - Yazarlar (ekleme, silme, uzlaştırma, yapılandırma değişikliği) kasa dizinindeki
+#    WRITE_LOCK_FILE üzerinde özel flock alır: süreçler arasında aynı anda tek yazar.
+#    Aynı sürecin thread'leri kilidi paylaşır (ör. paralel ekleme), böylece süreç
+#    içi paralellik korunur.
+WRITE_LOCK_FILE = ".write.lock"
+DEFAULT_WRITE_LOCK_TIMEOUT = 30.0 # saniye
+LOCK_POLL_INTERVAL = 0.05
+
+
+class VaultBusyError(Exception):
+    """Kasa, zaman aşımı süresince başka bir süreç tarafından yazılıyordu."""
+
+
+class _ProcessWriteLock:
+    """Bir kasa için süreç genelinde paylaşılan (sayaçlı) özel flock."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._holders = 0
+        self._mutex = threading.Lock()
+
+    def acquire(self, timeout: float):
+        with self._mutex:
+            if self._holders == 0:
+                self._fd = self._lock_file(timeout)
+            self._holders += 1
+
+    def release(self):
+        with self._mutex:
+            self._holders -= 1
+            if self._holders == 0 and self._fd is not None:
+                if fcntl:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+
+    def _lock_file(self, timeout: float) -> int:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is None:
+            return fd
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise VaultBusyError(f"Kasa başka bir işlem tarafından yazılıyor: {self.path.parent.name}")
+                time.sleep(LOCK_POLL_INTERVAL)
+            except OSError:
+                os.close(fd)
+                raise
+
+
+_write_locks: Dict[Path, _ProcessWriteLock] = {}
+_write_locks_mutex = threading.Lock()
+
+
+def _get_write_lock(vault_name: str) -> _ProcessWriteLock:
+    path = get_vault_path(vault_name) / WRITE_LOCK_FILE
+    with _write_locks_mutex:
+        lock = _write_locks.get(path)
+        if lock is None:
+            lock = _write_locks[path] = _ProcessWriteLock(path)
+        return lock
+
+
+def acquire_write_lock(vault_name: str, timeout: float = DEFAULT_WRITE_LOCK_TIMEOUT):
+    """Kasanın yazar kilidini alır; süre dolarsa VaultBusyError fırlatır."""
+    _get_write_lock(vault_name).acquire(timeout)
+
+
+def release_write_lock(vault_name: str):
+    _get_write_lock(vault_name).release()
+
+
+@contextlib.contextmanager
+def vault_write_lock(vault_name: str, timeout: float = DEFAULT_WRITE_LOCK_TIMEOUT) -> Iterator[None]:
+    """Kasaya yazan işlemleri saran bağlam yöneticisi (bkz. modül açıklaması).
+
+    Kullanım:
+        with vault_write_lock(vault_name):
+            ...  # files/ ve metadata.db değişiklikleri
+    """
+    acquire_write_lock(vault_name, timeout)
+    try:
+        yield
+    finally:
+        release_write_lock(vault_name)
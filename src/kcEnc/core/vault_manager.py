@@ -2,9 +2,13 @@ import os
 import json
 import base64
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Set, Iterable
 import uuid # Encrypted filename için
 import sqlite3 # create_vault içinde hata yakalama için
+import threading
+import mmap
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 from ..utils.file_utils import get_vaults_dir, ensure_vaults_dir_exists, get_vault_path
 from .crypto_utils import (
@@ -14,44 +18,114 @@ from .crypto_utils import (
     verify_check_block,
     encrypt_data, # Adım 4 için eklendi
     decrypt_data, # Adım 5 için eklendi
+    generate_iv,
+    ChunkCipher,
+    derive_file_key,
+    generate_file_key_salt,
+    generate_data_key,
+    wrap_key,
+    unwrap_key,
+    generate_recovery_key,
+    parse_recovery_key,
+    derive_recovery_kek,
+    choose_fastest_cipher,
+    DEFAULT_CIPHER,
+    SUPPORTED_CIPHERS,
     DEFAULT_ITERATIONS,
+    STREAM_CHUNK_SIZE,
+    encrypted_chunk_size,
     InvalidTag
 )
+from .buffer_pool import get_buffer_pool
+from .progress import ProgressToken, OperationCancelled
+from .vault_lock import vault_write_lock, acquire_write_lock, release_write_lock, VaultBusyError
+from .metadata_crypto import register_metadata_keys, get_metadata_keys, forget_metadata_keys
+from .metadata_cache import forget_cached_metadata
+from .unlink_queue import drain_pending_unlinks, schedule_pending_unlinks
+from .file_stream import DecryptedFileStream, ChunkedFileStream, BufferedFileStream
+from .file_listing import FileListing
 # Database manager import edildi
 from .database_manager import (
     initialize_database,
     add_file_record,
-    get_all_files,
+    get_file_listing,
+    fetch_file_rows,
+    decode_file_rows,
     get_file_metadata,
-    delete_file_record,
+    find_files_by_name,
+    find_files_by_type,
+    encrypt_plaintext_metadata,
+    delete_file_records,
+    delete_files_and_queue_unlinks,
+    get_pending_unlink_names,
+    get_encrypted_filename_map,
     get_db_path # Dosya silme onayı için eklendi
 )
 
 VAULT_CONFIG_FILE = "vault_config.json"
 VAULT_FILES_DIR = "files"
 ENCRYPTED_FILE_SUFFIX = ".enc"
+# Çıkarılan dosyalar tamamlanana kadar bu uzantıyla yazılır, sonra hedefin üzerine taşınır
+PARTIAL_FILE_SUFFIX = ".part"
+# create_vault için: algoritmayı bu makinedeki hız testine göre seç
+CIPHER_AUTO = "auto"
+# vault_config.json'daki anahtar slotu türleri
+KEY_SLOT_PASSWORD = "password"
+KEY_SLOT_RECOVERY = "recovery"
+
+# Kasa adı -> yeni dosyalarda kullanılan şifreleme algoritması
+_vault_cipher_cache: Dict[str, str] = {}
+
+# Kasa adı -> bu süreçte şifrelenmiş ama kaydı henüz commit edilmemiş .enc dosyaları.
+# Ekleyen işlemler (tekli ekleme, içe aktarma, klasör izleme) şifrelemeden commit'e
+# kadar yazar kilidini tutar; başka süreçlerin yarım eklemeleri bu yüzden uzlaştırmayla
+# çakışmaz. Aynı sürecin thread'leri kilidi paylaştığından onların dosyaları burada izlenir.
+_uncommitted_files: Dict[str, Set[str]] = {}
+_uncommitted_files_lock = threading.Lock()
+
+def _writes_vault(failure_result):
+    """Kasaya yazan fonksiyonu kasanın yazar kilidiyle sarar (ilk argüman kasa adıdır).
+
+    Kilit alınamazsa (zaman aşımı veya kilit dosyası hatası) hata basılır ve
+    failure_result döndürülür. Fonksiyonun kendi hataları olduğu gibi yukarı iletilir.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(vault_name: str, *args, **kwargs):
+            try:
+                acquire_write_lock(vault_name)
+            except VaultBusyError as e:
+                print(f"HATA: {e}")
+                return failure_result
+            except OSError as e:
+                print(f"HATA: '{vault_name}' yazar kilidi alınamadı: {e}")
+                return failure_result
+            try:
+                return func(vault_name, *args, **kwargs)
+            finally:
+                release_write_lock(vault_name)
+        return wrapper
+    return decorator
 
 def list_vaults() -> List[str]:
-    """Mevcut kasaların isimlerini listeler."""
-    vaults_base_dir = get_vaults_dir()
-    ensure_vaults_dir_exists() # Dizin yoksa oluştur
-    try:
-        # Sadece içinde config dosyası olan dizinleri geçerli kasa sayalım
-        valid_vaults = []
-        for d in vaults_base_dir.iterdir():
-            if d.is_dir() and (d / VAULT_CONFIG_FILE).is_file():
-                valid_vaults.append(d.name)
-        return valid_vaults
-    except OSError as e:
-        print(f"HATA: Kasa dizini okunamadı: {vaults_base_dir}\n{e}")
-        return []
+    """Mevcut kasaların isimlerini listeler (kasa indeksinden, bkz. vault_registry)."""
+    from .vault_registry import get_vault_summaries # Döngüsel import'u önlemek için
+    return [summary["name"] for summary in get_vault_summaries()]
+
+def create_vault(vault_name: str, password: str, cipher: str = CIPHER_AUTO) -> bool:
+    """Yeni bir kasa oluşturur.
 
-def create_vault(vault_name: str, password: str) -> bool:
-    """Yeni bir kasa oluşturur."""
+    cipher: crypto_utils.SUPPORTED_CIPHERS içinden bir algoritma kimliği veya
+    CIPHER_AUTO (AES-256-GCM ile ChaCha20-Poly1305 arasından bu makinede hızlı olan).
+    """
     if not vault_name or not password:
         print("HATA: Kasa adı ve parola boş olamaz.")
         return False
 
+    if cipher != CIPHER_AUTO and cipher not in SUPPORTED_CIPHERS:
+        print(f"HATA: Desteklenmeyen şifreleme algoritması: {cipher}")
+        return False
+
     vault_path = get_vault_path(vault_name)
     if vault_path.exists():
         print(f"HATA: '{vault_name}' isimli kasa zaten mevcut.")
@@ -63,14 +137,15 @@ def create_vault(vault_name: str, password: str) -> bool:
         files_dir.mkdir(parents=True, exist_ok=True)
 
         # Kriptografik işlemleri yap
-        salt = generate_salt()
-        key = derive_key(password, salt, DEFAULT_ITERATIONS)
-        check_iv, check_ciphertext = encrypt_check_block(key)
+        if cipher == CIPHER_AUTO:
+            cipher = choose_fastest_cipher()
+        key = generate_data_key()
+        check_iv, check_ciphertext = encrypt_check_block(key, cipher)
 
         # Yapılandırma dosyasını oluştur
         config_data = {
-            "salt": base64.b64encode(salt).decode('ascii'),
-            "iterations": DEFAULT_ITERATIONS,
+            "cipher": cipher,
+            "key_slots": [_make_password_slot(password, key, cipher)],
             "check_iv": base64.b64encode(check_iv).decode('ascii'),
             "check_ciphertext": base64.b64encode(check_ciphertext).decode('ascii')
         }
@@ -80,6 +155,7 @@ def create_vault(vault_name: str, password: str) -> bool:
 
         # Veritabanını başlat (Adım 3)
         initialize_database(vault_name)
+        _vault_cipher_cache[vault_name] = cipher
 
         print(f"Kasa '{vault_name}' başarıyla oluşturuldu: {vault_path}")
         del key
@@ -107,7 +183,9 @@ def load_vault_config(vault_name: str) -> Optional[Dict]:
         with open(config_path, 'r') as f:
             config_data = json.load(f)
         # Temel alanların varlığını kontrol et
-        if not all(k in config_data for k in ["salt", "iterations", "check_iv", "check_ciphertext"]):
+        # Zarf formatı: key_slots; eski format: salt + iterations
+        has_key_source = "key_slots" in config_data or all(k in config_data for k in ["salt", "iterations"])
+        if not has_key_source or not all(k in config_data for k in ["check_iv", "check_ciphertext"]):
             print(f"HATA: '{vault_name}' yapılandırma dosyası eksik alan içeriyor.")
             return None
         return config_data
@@ -118,22 +196,108 @@ def load_vault_config(vault_name: str) -> Optional[Dict]:
         print(f"HATA: '{vault_name}' yapılandırma dosyası okunurken hata: {e}")
         return None
 
+def _write_vault_config(vault_name: str, config_data: Dict) -> bool:
+    """Yapılandırmayı geçici dosyaya yazıp atomik olarak değiştirir (yarım yazılmış anahtar kalmaz)."""
+    config_path = get_vault_path(vault_name) / VAULT_CONFIG_FILE
+    tmp_path = config_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(config_data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, config_path)
+        return True
+    except OSError as e:
+        print(f"HATA: '{vault_name}' yapılandırma dosyası yazılamadı: {e}")
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+def _make_password_slot(password: str, data_key: bytes, cipher: str, iterations: int = DEFAULT_ITERATIONS) -> Dict[str, Any]:
+    salt = generate_salt()
+    kek = derive_key(password, salt, iterations)
+    iv, wrapped_key = wrap_key(kek, data_key, KEY_SLOT_PASSWORD, cipher)
+    return {
+        "type": KEY_SLOT_PASSWORD,
+        "salt": base64.b64encode(salt).decode('ascii'),
+        "iterations": iterations,
+        "iv": base64.b64encode(iv).decode('ascii'),
+        "wrapped_key": base64.b64encode(wrapped_key).decode('ascii'),
+    }
+
+def _make_recovery_slot(recovery_key: bytes, data_key: bytes, cipher: str) -> Dict[str, Any]:
+    salt = generate_salt()
+    kek = derive_recovery_kek(recovery_key, salt)
+    iv, wrapped_key = wrap_key(kek, data_key, KEY_SLOT_RECOVERY, cipher)
+    return {
+        "type": KEY_SLOT_RECOVERY,
+        "salt": base64.b64encode(salt).decode('ascii'),
+        "iv": base64.b64encode(iv).decode('ascii'),
+        "wrapped_key": base64.b64encode(wrapped_key).decode('ascii'),
+    }
+
+def _open_key_slot(slot: Dict[str, Any], kek: bytes, cipher: Optional[str]) -> Optional[bytes]:
+    iv = base64.b64decode(slot['iv'])
+    wrapped_key = base64.b64decode(slot['wrapped_key'])
+    return unwrap_key(kek, iv, wrapped_key, slot['type'], cipher)
+
+def _with_password_slot(config: Dict, password: str, data_key: bytes) -> Dict:
+    """Parola slotunu yenisiyle değiştirilmiş yapılandırma döndürür (eski format zarf formatına çevrilir)."""
+    cipher = config.get('cipher') or DEFAULT_CIPHER
+    slots = [slot for slot in config.get('key_slots', []) if slot.get('type') != KEY_SLOT_PASSWORD]
+    new_config = {k: v for k, v in config.items() if k not in ("salt", "iterations", "key_slots")}
+    new_config["key_slots"] = [_make_password_slot(password, data_key, cipher)] + slots
+    return new_config
+
 def unlock_vault(vault_name: str, password: str) -> Optional[bytes]:
-    """Kasayı açmayı dener ve başarılı olursa anahtarı döndürür."""
+    """Kasayı açmayı dener ve başarılı olursa veri anahtarını (DEK) döndürür.
+
+    Parola yerine kasanın kurtarma anahtarı da girilebilir. Eski formatta
+    (paroladan türetilen anahtarın doğrudan dosyaları şifrelediği) kasalar ilk açılışta
+    zarf formatına çevrilir: türetilen anahtar DEK olarak kalır, dosyalar yeniden şifrelenmez.
+    """
     config = load_vault_config(vault_name)
     if not config:
         return None # Hata mesajı load_vault_config içinde verildi
 
+    cipher = config.get('cipher')
+    key = None
     try:
-        salt = base64.b64decode(config['salt'])
-        iterations = int(config['iterations'])
         check_iv = base64.b64decode(config['check_iv'])
         check_ciphertext = base64.b64decode(config['check_ciphertext'])
+        upgrade = False
+
+        if "key_slots" in config:
+            slots = config['key_slots']
+            recovery_key = parse_recovery_key(password)
+            if recovery_key is not None:
+                for slot in slots:
+                    if slot.get('type') == KEY_SLOT_RECOVERY:
+                        kek = derive_recovery_kek(recovery_key, base64.b64decode(slot['salt']))
+                        key = _open_key_slot(slot, kek, cipher)
+                        if key:
+                            break
+            if key is None:
+                for slot in slots:
+                    if slot.get('type') == KEY_SLOT_PASSWORD:
+                        iterations = int(slot['iterations'])
+                        kek = derive_key(password, base64.b64decode(slot['salt']), iterations)
+                        key = _open_key_slot(slot, kek, cipher)
+                        if key:
+                            # KDF maliyeti artırıldıysa sadece sarmalamayı yenile
+                            upgrade = iterations < DEFAULT_ITERATIONS
+                            break
+        else:
+            # Eski format: paroladan türetilen anahtar doğrudan veri anahtarıdır
+            salt = base64.b64decode(config['salt'])
+            iterations = int(config['iterations'])
+            key = derive_key(password, salt, iterations)
+            upgrade = True
 
-        key = derive_key(password, salt, iterations)
-
-        if verify_check_block(key, check_iv, check_ciphertext):
+        if key is not None and verify_check_block(key, check_iv, check_ciphertext, cipher):
             print(f"Kasa '{vault_name}' kilidi başarıyla açıldı.")
+            if upgrade:
+                _upgrade_key_slots(vault_name, config, password, key)
+            _activate_metadata_keys(vault_name, key)
             return key
         else:
             print(f"HATA: '{vault_name}' için geçersiz parola.")
@@ -142,78 +306,295 @@ def unlock_vault(vault_name: str, password: str) -> Optional[bytes]:
     except (ValueError, TypeError, KeyError, base64.binascii.Error) as e:
         print(f"HATA: '{vault_name}' yapılandırma verisi işlenirken veya parola doğrulanırken hata: {e}")
         # Anahtar türetilmişse temizleyelim
-        if 'key' in locals(): del key
+        del key
         return None
     except Exception as e:
         print(f"HATA: Kasa kilidi açılırken beklenmedik hata: {e}")
-        if 'key' in locals(): del key
+        del key
         return None
 
-# --- Adım 4: Dosya Ekleme --- #
+def _upgrade_key_slots(vault_name: str, config: Dict, password: str, vault_key: bytes):
+    """Eski formatı/düşük iterasyonlu slotu yeniler. Kasaya başka süreç yazıyorsa
+    beklenmez; yükseltme bir sonraki açılışta tekrar denenir."""
+    try:
+        with vault_write_lock(vault_name, timeout=0):
+            if _write_vault_config(vault_name, _with_password_slot(config, password, vault_key)):
+                print(f"'{vault_name}' anahtar sarmalaması güncellendi.")
+    except (VaultBusyError, OSError):
+        pass
+
+def _activate_metadata_keys(vault_name: str, vault_key: bytes):
+    """Meta veri anahtarlarını kaydeder ve eski düz metin ad/tür kayıtlarını şifreler."""
+    register_metadata_keys(vault_name, vault_key)
+    try:
+        with vault_write_lock(vault_name, timeout=0):
+            encrypt_plaintext_metadata(vault_name)
+    except (VaultBusyError, OSError):
+        pass # Başka süreç yazıyor; eski kayıtlar bir sonraki açılışta şifrelenir
+
+def unlock_vault_and_list_files(vault_name: str, password: str) -> Tuple[Optional[bytes], Optional[FileListing]]:
+    """unlock_vault ile aynıdır; ek olarak kasanın dosya listesini de döndürür.
+
+    Anahtar türetilirken metadata.db ayrı bir thread'de açılır, şema kontrol
+    edilir ve listeleme satırları okunur. Satırlar ancak kontrol bloğu doğrulandıktan
+    (ve meta veri anahtarları kaydedildikten) sonra çözülüp döndürülür; parola
+    yanlışsa (None, None) döner. Ön okuma başarısız olursa liste normal yoldan alınır.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kcEnc-warmup")
+    try:
+        rows_future = executor.submit(fetch_file_rows, vault_name)
+        key = unlock_vault(vault_name, password)
+        if key is None:
+            return None, None
+        rows = rows_future.result()
+    finally:
+        executor.shutdown(wait=False) # Başarısız denemede ön okumanın bitmesi beklenmez
+    # Ad/tür şifreleme (eski kayıtlar) unlock_vault içinde yapıldıysa okunan satırlar
+    # düz metin adlar içerir; çözümleme ikisini de aynı sonuca çevirir.
+    files = decode_file_rows(vault_name, rows) if rows is not None else get_file_listing(vault_name)
+    return key, files
+
+def lock_vault(vault_name: str):
+    """Kasanın bellekte tutulan meta veri anahtarlarını ve önbelleğini unutur (veri anahtarını çağıran bırakır)."""
+    forget_metadata_keys(vault_name)
+    forget_cached_metadata(vault_name)
+
+def _load_config_for_key(vault_name: str, vault_key: bytes) -> Optional[Dict]:
+    """Yapılandırmayı yükler ve verilen anahtarın bu kasaya ait olduğunu doğrular."""
+    config = load_vault_config(vault_name)
+    if not config:
+        return None
+    try:
+        check_iv = base64.b64decode(config['check_iv'])
+        check_ciphertext = base64.b64decode(config['check_ciphertext'])
+    except (ValueError, base64.binascii.Error) as e:
+        print(f"HATA: '{vault_name}' yapılandırma verisi işlenirken hata: {e}")
+        return None
+    if not verify_check_block(vault_key, check_iv, check_ciphertext, config.get('cipher')):
+        print(f"HATA: Anahtar '{vault_name}' kasasına ait değil.")
+        return None
+    return config
 
-def add_file_to_vault(vault_name: str, vault_key: bytes, source_file_path: Path) -> Optional[str]:
-    """Bir dosyayı kasaya şifreleyerek ekler."""
-    if not source_file_path.is_file():
-        print(f"HATA: Kaynak dosya bulunamadı: {source_file_path}")
+@_writes_vault(False)
+def change_password(vault_name: str, vault_key: bytes, new_password: str) -> bool:
+    """Kasanın parolasını değiştirir; yalnızca veri anahtarının sarmalaması yenilenir."""
+    if not new_password:
+        print("HATA: Parola boş olamaz.")
+        return False
+    config = _load_config_for_key(vault_name, vault_key)
+    if not config:
+        return False
+    if not _write_vault_config(vault_name, _with_password_slot(config, new_password, vault_key)):
+        return False
+    print(f"'{vault_name}' kasasının parolası değiştirildi.")
+    return True
+
+@_writes_vault(None)
+def create_recovery_key(vault_name: str, vault_key: bytes) -> Optional[str]:
+    """Kasa için yeni bir kurtarma anahtarı oluşturur (varsa öncekini geçersiz kılar).
+
+    Döndürülen metin yalnızca bir kez gösterilmelidir; kasada sadece sarmalanmış
+    veri anahtarı saklanır.
+    """
+    config = _load_config_for_key(vault_name, vault_key)
+    if not config:
+        return None
+    if "key_slots" not in config:
+        print(f"HATA: '{vault_name}' kasası henüz eski formatta; önce parola ile açılmalı.")
+        return None
+    recovery_text, recovery_key = generate_recovery_key()
+    cipher = config.get('cipher') or DEFAULT_CIPHER
+    config["key_slots"] = [slot for slot in config["key_slots"] if slot.get('type') != KEY_SLOT_RECOVERY]
+    config["key_slots"].append(_make_recovery_slot(recovery_key, vault_key, cipher))
+    if not _write_vault_config(vault_name, config):
         return None
+    print(f"'{vault_name}' için kurtarma anahtarı oluşturuldu.")
+    return recovery_text
+
+def has_recovery_key(vault_name: str) -> bool:
+    config = load_vault_config(vault_name) or {}
+    return any(slot.get('type') == KEY_SLOT_RECOVERY for slot in config.get('key_slots', []))
+
+def get_vault_cipher(vault_name: str) -> str:
+    """Kasada yeni dosyalar için kullanılan algoritmayı döndürür (eski kasalarda AES-256-GCM)."""
+    cipher = _vault_cipher_cache.get(vault_name)
+    if cipher is None:
+        config = load_vault_config(vault_name) or {}
+        cipher = config.get('cipher') or DEFAULT_CIPHER
+        _vault_cipher_cache[vault_name] = cipher
+    return cipher
 
-    try:
-        # Dosya içeriğini oku
-        plaintext = source_file_path.read_bytes()
-        original_filename = source_file_path.name
-        file_type = source_file_path.suffix
-        size_bytes = source_file_path.stat().st_size
+# --- Adım 4: Dosya Ekleme --- #
+
+def encrypt_file_into_vault(vault_name: str, vault_key: bytes, source_file_path: Path,
+                            progress: Optional[ProgressToken] = None) -> Optional[Dict[str, Any]]:
+    """Dosyayı parçalı formatta şifreleyip files/ dizinine yazar; DB'ye eklenecek file_info sözlüğünü döndürür.
 
-        # Şifrele
-        iv, ciphertext_with_tag = encrypt_data(vault_key, plaintext)
+    Kaynak dosya STREAM_CHUNK_SIZE'lık parçalar halinde, havuzdan alınan yeniden
+    kullanılabilir tamponlara okunur (readinto); şifreli parça da havuzdaki bir
+    tampona yazılır. Sadece dosya G/Ç ve kriptografi yapar, veritabanına dokunmaz.
 
-        # Şifreli dosya adını oluştur
-        encrypted_filename = str(uuid.uuid4()) + ENCRYPTED_FILE_SUFFIX
-        encrypted_file_path = get_vault_path(vault_name) / VAULT_FILES_DIR / encrypted_filename
+    Çağıran yazar kilidini tutmalı ve kayıt commit edilince release_uncommitted_files,
+    edilemezse discard_encrypted_file çağırmalıdır; o zamana kadar dosya reconcile_vault
+    tarafından yetim sayılmaz.
+    """
+    if not source_file_path.is_file():
+        print(f"HATA: Kaynak dosya bulunamadı: {source_file_path}")
+        return None
 
-        # Şifreli dosyayı yaz
-        encrypted_file_path.write_bytes(ciphertext_with_tag)
+    # Şifreli dosya adını oluştur
+    encrypted_filename = str(uuid.uuid4()) + ENCRYPTED_FILE_SUFFIX
+    encrypted_file_path = get_vault_path(vault_name) / VAULT_FILES_DIR / encrypted_filename
+    with _uncommitted_files_lock:
+        _uncommitted_files.setdefault(vault_name, set()).add(encrypted_filename)
 
-        # Meta veriyi DB'ye kaydet
-        file_info = {
-            "original_filename": original_filename,
+    try:
+        iv = generate_iv()
+        key_salt = generate_file_key_salt()
+        cipher_id = get_vault_cipher(vault_name)
+        cipher = ChunkCipher(derive_file_key(vault_key, key_salt), iv, cipher_id)
+        size_bytes = 0
+
+        plain_pool = get_buffer_pool(STREAM_CHUNK_SIZE)
+        out_pool = get_buffer_pool(encrypted_chunk_size(STREAM_CHUNK_SIZE))
+
+        # Şifrele ve yaz: son parçayı bilmek için bir parça ileriden oku
+        with open(source_file_path, 'rb') as src, open(encrypted_file_path, 'wb') as dst, \
+                plain_pool.borrow() as current, plain_pool.borrow() as ahead, out_pool.borrow() as out:
+            out_view = memoryview(out)
+            index = 0
+            length = _read_full(src, current)
+            while True:
+                next_length = _read_full(src, ahead) if length == STREAM_CHUNK_SIZE else 0
+                is_last = next_length == 0
+                written = cipher.encrypt_chunk_into(index, memoryview(current)[:length], is_last, out_view)
+                dst.write(out_view[:written])
+                size_bytes += length
+                if progress:
+                    progress.advance(length)
+                    progress.check()
+                if is_last:
+                    break
+                current, ahead = ahead, current
+                length = next_length
+                index += 1
+
+        return {
+            "original_filename": source_file_path.name,
             "encrypted_filename": encrypted_filename,
             "iv": iv,
-            "file_type": file_type,
-            "size_bytes": size_bytes
+            "file_type": source_file_path.suffix,
+            "size_bytes": size_bytes,
+            "chunk_size": STREAM_CHUNK_SIZE,
+            "cipher": cipher_id,
+            "key_salt": key_salt
         }
-        file_id = add_file_record(vault_name, file_info)
-
-        if file_id:
-            print(f"Dosya '{original_filename}' kasaya başarıyla eklendi.")
-            return file_id
-        else:
-            # DB hatası olduysa şifreli dosyayı sil (rollback)
-            print(f"HATA: Veritabanı kaydı başarısız olduğu için şifreli dosya siliniyor: {encrypted_file_path}")
-            encrypted_file_path.unlink(missing_ok=True)
-            return None
 
+    except OperationCancelled:
+        print(f"Dosya ekleme iptal edildi: {source_file_path.name}")
     except OSError as e:
         print(f"HATA: Dosya okuma/yazma hatası ('{source_file_path.name}'): {e}")
-        return None
     except Exception as e:
         # crypto_utils'den InvalidTag gelmemeli ama diğer hatalar olabilir
         print(f"HATA: Dosya eklenirken beklenmedik hata ('{source_file_path.name}'): {e}")
+    # Yarım kalan şifreli dosyayı bırakma
+    try:
+        encrypted_file_path.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"HATA: Yarım şifreli dosya silinemedi: {encrypted_file_path}\n{e}")
+    release_uncommitted_files(vault_name, [encrypted_filename])
+    return None
+
+def _read_full(f, buffer: bytearray) -> int:
+    """Tamponu dolana veya dosya bitene kadar readinto ile okur (kısa okumalara karşı)."""
+    view = memoryview(buffer)
+    total = 0
+    while total < len(view):
+        n = f.readinto(view[total:])
+        if not n:
+            break
+        total += n
+    return total
+
+def release_uncommitted_files(vault_name: str, encrypted_filenames: Iterable[str]):
+    """Kayıtları commit edilen (veya silinen) şifreli dosyaları bekleyenlerden çıkarır."""
+    with _uncommitted_files_lock:
+        pending = _uncommitted_files.get(vault_name)
+        if pending is None:
+            return
+        pending.difference_update(encrypted_filenames)
+        if not pending:
+            del _uncommitted_files[vault_name]
+
+def get_uncommitted_files(vault_name: str) -> Set[str]:
+    """Bu süreçte şifrelenmiş, kaydı henüz commit edilmemiş dosya adlarının kopyası."""
+    with _uncommitted_files_lock:
+        return set(_uncommitted_files.get(vault_name, ()))
+
+def discard_encrypted_file(vault_name: str, encrypted_filename: str):
+    """DB kaydı oluşturulamayan şifreli dosyayı siler (rollback)."""
+    encrypted_file_path = get_vault_path(vault_name) / VAULT_FILES_DIR / encrypted_filename
+    print(f"HATA: Veritabanı kaydı başarısız olduğu için şifreli dosya siliniyor: {encrypted_file_path}")
+    try:
+        encrypted_file_path.unlink(missing_ok=True)
+    except OSError as e:
+        # Silinemezse reconcile_vault daha sonra temizler
+        print(f"HATA: Şifreli dosya silinemedi: {encrypted_file_path}\n{e}")
+    release_uncommitted_files(vault_name, [encrypted_filename])
+
+@_writes_vault(None)
+def add_file_to_vault(vault_name: str, vault_key: bytes, source_file_path: Path,
+                      progress: Optional[ProgressToken] = None) -> Optional[str]:
+    """Bir dosyayı kasaya şifreleyerek ekler.
+
+    progress verilirse şifrelenen her parça için byte, dosya tamamlanınca bir öğe
+    ilerlemesi bildirilir; iptal edilirse yarım şifreli dosya silinir ve None döner.
+    """
+    if get_metadata_keys(vault_name) is None:
+        # Anahtar unlock_vault dışında elde edildiyse: ad/tür yine şifreli saklansın
+        register_metadata_keys(vault_name, vault_key)
+    if find_files_by_name(vault_name, source_file_path.name):
+        print(f"Uyarı: Kasada '{source_file_path.name}' adlı bir dosya zaten var; yeni kopya ekleniyor.")
+
+    file_info = encrypt_file_into_vault(vault_name, vault_key, source_file_path, progress)
+    if not file_info:
         return None
 
-# --- Adım 5: Dosya Listeleme, Çözme, Silme --- #
+    # Meta veriyi DB'ye kaydet
+    file_id = add_file_record(vault_name, file_info)
 
-def list_files_in_vault(vault_name: str) -> List[Dict[str, Any]]:
-    """Kasadaki dosyaların listesini (meta veri) döndürür."""
-    return get_all_files(vault_name)
-
-def get_decrypted_file_data(vault_name: str, vault_key: bytes, file_id: str) -> Optional[bytes]:
-    """Belirli bir dosyanın şifresini çözüp içeriğini döndürür."""
-    metadata = get_file_metadata(vault_name, file_id)
-    if not metadata:
-        print(f"HATA: Dosya meta verisi bulunamadı (ID: {file_id})")
+    if file_id:
+        release_uncommitted_files(vault_name, [file_info['encrypted_filename']])
+        print(f"Dosya '{file_info['original_filename']}' kasaya başarıyla eklendi.")
+        if progress:
+            progress.advance(done_items=1)
+        return file_id
+    else:
+        # DB hatası olduysa şifreli dosyayı sil (rollback)
+        discard_encrypted_file(vault_name, file_info['encrypted_filename'])
         return None
 
+# --- Adım 5: Dosya Listeleme, Çözme, Silme --- #
+
+def list_files_in_vault(vault_name: str) -> FileListing:
+    """Kasadaki dosyaların ada göre sıralı listesini (sütun tabanlı, bkz. FileListing) döndürür."""
+    return get_file_listing(vault_name)
+
+def get_file_key(vault_key: bytes, metadata: Dict[str, Any]) -> bytes:
+    """Dosyanın şifrelendiği anahtarı döndürür (key_salt yoksa eski dosya: kasa anahtarı)."""
+    key_salt = metadata.get('key_salt')
+    if key_salt:
+        return derive_file_key(vault_key, key_salt)
+    return vault_key
+
+def open_decrypted_stream(vault_name: str, vault_key: bytes, metadata: Dict[str, Any]) -> Optional[DecryptedFileStream]:
+    """Dosya için rastgele erişimli bir çözme akışı açar (DB'ye dokunmaz).
+
+    Parçalı formatta yalnızca okunan aralıktaki parçalar çözülür; eski tek parça
+    formatta içerik açılışta bir kez çözülür. Akış kullanıldıktan sonra kapatılmalıdır.
+    Okuma sırasında bozuk bir parça InvalidTag fırlatır.
+    """
+    file_id = metadata.get('id')
     encrypted_filename = metadata.get('encrypted_filename')
     iv = metadata.get('iv')
 
@@ -222,19 +603,130 @@ def get_decrypted_file_data(vault_name: str, vault_key: bytes, file_id: str) ->
         return None
 
     encrypted_file_path = get_vault_path(vault_name) / VAULT_FILES_DIR / encrypted_filename
+    chunk_size = metadata.get('chunk_size')
+    file_key = get_file_key(vault_key, metadata)
 
     try:
-        # Şifreli içeriği oku
-        ciphertext_with_tag = encrypted_file_path.read_bytes()
+        if chunk_size:
+            return ChunkedFileStream(encrypted_file_path, file_key, iv, chunk_size, metadata.get('cipher'))
+        # Eski format: tek AES-GCM bloğu (algoritma seçimi bu formattan sonra geldi).
+        # Şifreli içerik belleğe kopyalanmadan eşlenip çözülür.
+        with open(encrypted_file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            plaintext = decrypt_data(file_key, iv, mapped)
+        return BufferedFileStream(plaintext, STREAM_CHUNK_SIZE)
+
+    except FileNotFoundError:
+        print(f"HATA: Şifreli dosya bulunamadı: {encrypted_file_path}")
+        return None
+    except InvalidTag:
+        print(f"HATA: Dosya şifre çözme hatası (InvalidTag - bozuk dosya veya yanlış anahtar?) (ID: {file_id})")
+        return None
+    except (OSError, ValueError) as e:
+         # ValueError: boş dosya mmap ile eşlenemez (eski formatta geçerli dosya boş olamaz)
+         print(f"HATA: Şifreli dosya okunurken hata (ID: {file_id}): {e}")
+         return None
+
+def _iter_plaintext_blocks(stream: DecryptedFileStream):
+    """Akışın tamamını sırayla verir; parçalı formatta havuzdan alınan tek tampon yeniden kullanılır."""
+    if isinstance(stream, ChunkedFileStream):
+        with get_buffer_pool(stream.chunk_size).borrow() as buffer:
+            yield from stream.iter_chunks_into(buffer)
+    else:
+        yield from stream.iter_range()
+
+def write_decrypted_file(vault_name: str, vault_key: bytes, metadata: Dict[str, Any], target_path: Path,
+                         progress: Optional[ProgressToken] = None) -> bool:
+    """Dosyayı çözerek target_path'e yazar; içerik hiçbir zaman tamamen belleğe alınmaz.
+
+    Çıktı önce yanına `.part` uzantılı geçici dosyaya yazılır ve yalnızca tamamı
+    doğrulanınca hedefin üzerine taşınır; iptal veya hata durumunda hedef değişmez.
+    """
+    file_id = metadata.get('id')
+    stream = open_decrypted_stream(vault_name, vault_key, metadata)
+    if stream is None:
+        return False
 
-        # Şifreyi çöz
-        plaintext = decrypt_data(vault_key, iv, ciphertext_with_tag)
+    part_path = target_path.with_name(target_path.name + PARTIAL_FILE_SUFFIX)
+    try:
+        with stream, open(part_path, 'wb') as dst:
+            for block in _iter_plaintext_blocks(stream):
+                dst.write(block)
+                if progress:
+                    progress.advance(len(block))
+                    progress.check()
+        os.replace(part_path, target_path)
+        if progress:
+            progress.advance(done_items=1)
+        return True
+    except OperationCancelled:
+        print(f"Dosya çıkarma iptal edildi: {target_path}")
+    except InvalidTag:
+        print(f"HATA: Dosya şifre çözme hatası (InvalidTag - bozuk dosya veya yanlış anahtar?) (ID: {file_id})")
+    except OSError as e:
+        print(f"HATA: Dosya yazılamadı: {target_path}\n{e}")
+    # Yarım yazılmış çıktıyı bırakma
+    try:
+        part_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return False
+
+def verify_file(vault_name: str, vault_key: bytes, metadata: Dict[str, Any],
+                progress: Optional[ProgressToken] = None) -> bool:
+    """Dosyanın tüm parçalarının bütünlüğünü doğrular (çözülen veri saklanmaz)."""
+    file_id = metadata.get('id')
+    stream = open_decrypted_stream(vault_name, vault_key, metadata)
+    if stream is None:
+        return False
+    try:
+        with stream:
+            for block in _iter_plaintext_blocks(stream):
+                if progress:
+                    progress.advance(len(block))
+                    progress.check()
+        if progress:
+            progress.advance(done_items=1)
+        return True
+    except OperationCancelled:
+        print(f"Doğrulama iptal edildi (ID: {file_id})")
+        return False
+    except InvalidTag:
+        print(f"HATA: Dosya bütünlük doğrulaması başarısız (ID: {file_id})")
+        return False
+    except OSError as e:
+        print(f"HATA: Şifreli dosya okunurken hata (ID: {file_id}): {e}")
+        return False
+
+def decrypt_file_from_metadata(vault_name: str, vault_key: bytes, metadata: Dict[str, Any],
+                               progress: Optional[ProgressToken] = None) -> Optional[bytes]:
+    """Meta verisi zaten alınmış bir dosyanın şifresini çözer (DB'ye dokunmaz)."""
+    file_id = metadata.get('id')
+    stream = open_decrypted_stream(vault_name, vault_key, metadata)
+    if stream is None:
+        return None
+
+    try:
+        with stream:
+            if progress is None:
+                plaintext = stream.read()
+            else:
+                # Parçalı akışta bloklar aynı havuz tamponunun görünümleridir; her biri
+                # hemen önceden ayrılmış çıktıya kopyalanmalıdır
+                output = bytearray(stream.size)
+                position = 0
+                for block in _iter_plaintext_blocks(stream):
+                    output[position:position + len(block)] = block
+                    position += len(block)
+                    progress.advance(len(block))
+                    progress.check()
+                plaintext = bytes(output)
+                progress.advance(done_items=1)
         print(f"Dosya '{metadata['original_filename']}' başarıyla çözüldü.")
         return plaintext
 
-    except FileNotFoundError:
-        print(f"HATA: Şifreli dosya bulunamadı: {encrypted_file_path}")
-        # DB kaydını temizlemek düşünülebilir (tutarsızlık)
+    except OperationCancelled:
+        print(f"Dosya çözme iptal edildi (ID: {file_id})")
         return None
     except InvalidTag:
         print(f"HATA: Dosya şifre çözme hatası (InvalidTag - bozuk dosya veya yanlış anahtar?) (ID: {file_id})")
@@ -246,33 +738,120 @@ def get_decrypted_file_data(vault_name: str, vault_key: bytes, file_id: str) ->
         print(f"HATA: Dosya çözülürken beklenmedik hata (ID: {file_id}): {e}")
         return None
 
-def remove_file_from_vault(vault_name: str, file_id: str) -> bool:
-    """Bir dosyayı kasadan (fiziksel dosya ve DB kaydı) siler."""
+def get_decrypted_file_data(vault_name: str, vault_key: bytes, file_id: str,
+                            progress: Optional[ProgressToken] = None) -> Optional[bytes]:
+    """Belirli bir dosyanın şifresini çözüp içeriğini döndürür."""
     metadata = get_file_metadata(vault_name, file_id)
     if not metadata:
-        print(f"Uyarı: Silinecek dosya için meta veri bulunamadı (ID: {file_id})")
-        # Belki sadece DB'den silmeyi deneyebiliriz?
-        return delete_file_record(vault_name, file_id)
+        print(f"HATA: Dosya meta verisi bulunamadı (ID: {file_id})")
+        return None
+    return decrypt_file_from_metadata(vault_name, vault_key, metadata, progress)
 
-    encrypted_filename = metadata.get('encrypted_filename')
-    if not encrypted_filename:
-         print(f"HATA: Meta veride şifreli dosya adı eksik (ID: {file_id})")
-         return False # Fiziksel dosyayı silemeyiz
+@_writes_vault(False)
+def remove_file_from_vault(vault_name: str, file_id: str, progress: Optional[ProgressToken] = None) -> bool:
+    """Bir dosyayı kasadan siler (bkz. remove_files_from_vault); kayıt silindiyse True döndürür."""
+    if progress and progress.is_cancelled:
+        return False
+    if not remove_files_from_vault(vault_name, [file_id]):
+        print(f"Uyarı: Silinecek dosya kaydı bulunamadı (ID: {file_id})")
+        return False
+    if progress:
+        progress.advance(done_items=1)
+    return True
+
+@_writes_vault([])
+def remove_files_from_vault(vault_name: str, file_ids: List[str]) -> List[str]:
+    """Dosyaların kayıtlarını tek transaction'da siler ve silinen ID'leri döndürür.
+
+    Şifreli dosyalar aynı transaction'da kalıcı silme kuyruğuna (pending_unlinks)
+    eklenir ve arka planda silinir; fonksiyon dosya silmelerini beklemez.
+    Silinemeyen dosyalar kuyrukta kalıp yeniden denenir (bkz. unlink_queue).
+    """
+    deleted = delete_files_and_queue_unlinks(vault_name, file_ids)
+    if deleted is None:
+        return []
+    if deleted:
+        schedule_pending_unlinks(vault_name)
+    return deleted
 
+def unlink_encrypted_file(vault_name: str, encrypted_filename: str) -> bool:
+    """files/ altındaki şifreli dosyayı siler (DB'ye dokunmaz)."""
     encrypted_file_path = get_vault_path(vault_name) / VAULT_FILES_DIR / encrypted_filename
+    try:
+        encrypted_file_path.unlink(missing_ok=True) # Dosya yoksa hata verme
+        print(f"Fiziksel dosya silindi: {encrypted_file_path}")
+        return True
+    except OSError as e:
+        print(f"HATA: Fiziksel dosya silinirken hata: {encrypted_file_path}\n{e}")
+        # DB kaydı silindi ama fiziksel dosya silinemedi. Bu durum loglanmalı.
+        return False
 
-    # Önce DB kaydını silmeyi dene (başarısız olursa fiziksel dosyayı silme)
-    db_deleted = delete_file_record(vault_name, file_id)
-
-    if db_deleted:
-        try:
-            encrypted_file_path.unlink(missing_ok=True) # Dosya yoksa hata verme
-            print(f"Fiziksel dosya silindi: {encrypted_file_path}")
-            return True
-        except OSError as e:
-            print(f"HATA: Fiziksel dosya silinirken hata: {encrypted_file_path}\n{e}")
-            # DB kaydı silindi ama fiziksel dosya silinemedi. Bu durum loglanmalı.
-            return False # Tam başarı değil
-    else:
-        # DB silme başarısız oldu
-        return False 
\ No newline at end of file
+# --- Uzlaştırma: files/ dizini ile metadata.db karşılaştırması --- #
+
+@_writes_vault(None)
+def reconcile_vault(vault_name: str, remove_orphans: bool = True, prune_dangling: bool = False) -> Optional[Dict[str, Any]]:
+    """files/ dizinini metadata.db ile tek geçişte karşılaştırır.
+
+    Yetim dosyalar (DB kaydı olmayan .enc dosyaları) ve sahipsiz kayıtlar
+    (dosyası olmayan DB satırları) küme farkıyla bulunur; satır başına sorgu yapılmaz.
+    Bu süreçte eklenmekte olan (kaydı henüz commit edilmemiş) dosyalar yetim sayılmaz.
+    Yetim dosyalar silinerek disk alanı geri kazanılır, sahipsiz kayıtlar ise
+    yalnızca prune_dangling=True ise silinir. Rapor sözlüğü veya hata durumunda None döndürür.
+    """
+    files_dir = get_vault_path(vault_name) / VAULT_FILES_DIR
+    db_map = get_encrypted_filename_map(vault_name)
+    pending_unlinks = get_pending_unlink_names(vault_name)
+    if db_map is None or pending_unlinks is None:
+        return None
+
+    try:
+        with os.scandir(files_dir) as it:
+            disk_entries = {entry.name: entry for entry in it
+                            if entry.name.endswith(ENCRYPTED_FILE_SUFFIX) and entry.is_file()}
+    except OSError as e:
+        print(f"HATA: '{vault_name}' dosya dizini okunamadı: {files_dir}\n{e}")
+        return None
+
+    # Silme kuyruğundakiler yetim sayılmaz; onları arka plan işçisi siler. Eklenmekte
+    # olanlar taramadan sonra alınır: taranan bir dosya o an artık bekleyenlerde değilse
+    # ya silinmiştir ya da kaydı commit edilmiştir; ikincisi için DB yeniden sorulur
+    orphan_names = disk_entries.keys() - db_map.keys() - pending_unlinks - get_uncommitted_files(vault_name)
+    if orphan_names:
+        committed_since = get_encrypted_filename_map(vault_name)
+        if committed_since is None:
+            return None
+        orphan_names -= committed_since.keys()
+    dangling_names = db_map.keys() - disk_entries.keys()
+
+    report = {
+        "orphans": sorted(orphan_names),
+        "dangling": sorted(db_map[name] for name in dangling_names),
+        "removed_orphans": 0,
+        "reclaimed_bytes": 0,
+        "pruned_records": 0,
+    }
+
+    if remove_orphans and orphan_names:
+        for name in orphan_names:
+            entry = disk_entries[name]
+            try:
+                st = entry.stat()
+                os.unlink(entry.path)
+                report["removed_orphans"] += 1
+                report["reclaimed_bytes"] += st.st_size
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"HATA: Yetim dosya silinemedi: {entry.path}\n{e}")
+
+    if remove_orphans and pending_unlinks:
+        schedule_pending_unlinks(vault_name) # Önceki oturumdan kalan veya başarısız olan silmeler
+
+    if prune_dangling and report["dangling"]:
+        report["pruned_records"] = delete_file_records(vault_name, report["dangling"])
+
+    if orphan_names or dangling_names:
+        print(f"Kasa '{vault_name}' uzlaştırıldı: {len(orphan_names)} yetim dosya "
+              f"({report['removed_orphans']} silindi, {report['reclaimed_bytes']} bytes), "
+              f"{len(dangling_names)} sahipsiz kayıt ({report['pruned_records']} silindi).")
+    return report
@@ -0,0 +1,142 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.file_utils import get_vaults_dir, ensure_vaults_dir_exists
+from .database_manager import METADATA_DB_FILE, get_vault_stats
+from .vault_manager import VAULT_CONFIG_FILE
+
+# İndeks kendi alt dizininde tutulur: dosyanın yeniden yazılması Vaults/ dizininin
+# mtime'ını değiştirmez, böylece dizin mtime'ı yalnızca kasa eklenip silindiğinde değişir.
+REGISTRY_DIR_NAME = ".kcEnc-index"
+REGISTRY_FILE_NAME = "registry.json"
+REGISTRY_FORMAT_VERSION = 1
+
+# SQLite WAL kipinde değişiklikler önce bu yan dosyalara yazılır
+_DB_SIDE_FILE_SUFFIXES = ("", "-wal")
+
+# Aynı süreç içinde diske tekrar gitmemek için son okunan indeks
+_cached_registry: Optional[Dict[str, Any]] = None
+
+
+def get_registry_path() -> Path:
+    return get_vaults_dir() / REGISTRY_DIR_NAME / REGISTRY_FILE_NAME
+
+
+def _stat_signature(path: Path) -> Optional[List[int]]:
+    """Değişiklik tespiti için (mtime_ns, size, nlink) imzası; dosya yoksa None."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_nlink]
+
+
+def _db_signature(vault_dir: Path) -> List[Optional[List[int]]]:
+    db_path = vault_dir / METADATA_DB_FILE
+    return [_stat_signature(Path(str(db_path) + suffix)) for suffix in _DB_SIDE_FILE_SUFFIXES]
+
+
+def _load_registry() -> Dict[str, Any]:
+    global _cached_registry
+    if _cached_registry is not None:
+        return _cached_registry
+    try:
+        with open(get_registry_path(), 'r') as f:
+            data = json.load(f)
+        if data.get("version") == REGISTRY_FORMAT_VERSION:
+            _cached_registry = data
+            return data
+    except (OSError, ValueError):
+        pass # İndeks yok veya bozuk: baştan oluşturulacak
+    return {"version": REGISTRY_FORMAT_VERSION, "vaults_dir": None, "names": [], "vaults": {}}
+
+
+def _save_registry(data: Dict[str, Any]):
+    global _cached_registry
+    _cached_registry = data
+    registry_path = get_registry_path()
+    tmp_path = registry_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        registry_path.parent.mkdir(exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, registry_path)
+    except OSError as e:
+        # İndeks yalnızca önbellek; yazılamaması listelemeyi engellemez
+        print(f"Uyarı: Kasa indeksi yazılamadı: {registry_path}\n{e}")
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def _scan_vault_names(vaults_dir: Path) -> List[str]:
+    """Sadece içinde config dosyası olan dizinleri geçerli kasa sayar."""
+    names = []
+    with os.scandir(vaults_dir) as it:
+        for entry in it:
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            if os.path.isfile(os.path.join(entry.path, VAULT_CONFIG_FILE)):
+                names.append(entry.name)
+    return sorted(names, key=str.casefold)
+
+
+def get_vault_summaries() -> List[Dict[str, Any]]:
+    """Kasaları özet istatistikleriyle döndürür: name, file_count, total_size, last_modified.
+
+    Kasa adları Vaults/ dizininin mtime'ı değişmedikçe indeksten okunur; bir kasanın
+    istatistikleri de yalnızca metadata.db (veya WAL dosyası) değiştiyse yeniden sorgulanır.
+    """
+    vaults_dir = get_vaults_dir()
+    dir_signature = _stat_signature(vaults_dir)
+    if dir_signature is None:
+        ensure_vaults_dir_exists() # İlk çalıştırma: dizini oluştur
+        dir_signature = _stat_signature(vaults_dir)
+
+    registry = _load_registry()
+    changed = False
+    if registry["vaults_dir"] != dir_signature:
+        try:
+            registry["names"] = _scan_vault_names(vaults_dir)
+        except OSError as e:
+            print(f"HATA: Kasa dizini okunamadı: {vaults_dir}\n{e}")
+            return []
+        registry["vaults_dir"] = dir_signature
+        changed = True
+
+    cached_vaults = registry["vaults"]
+    summaries = []
+    fresh_vaults = {}
+    for name in registry["names"]:
+        signature = _db_signature(vaults_dir / name)
+        entry = cached_vaults.get(name)
+        if entry is None or entry["db"] != signature:
+            stats = get_vault_stats(name) if signature[0] is not None else None
+            entry = {
+                "db": signature,
+                "file_count": stats["file_count"] if stats else None,
+                "total_size": stats["total_size"] if stats else None,
+                "last_modified": str(stats["last_modified"]) if stats and stats["last_modified"] else None,
+            }
+            changed = True
+        fresh_vaults[name] = entry
+        summaries.append({
+            "name": name,
+            "file_count": entry["file_count"],
+            "total_size": entry["total_size"],
+            "last_modified": entry["last_modified"],
+        })
+
+    if changed or fresh_vaults.keys() != cached_vaults.keys():
+        registry["vaults"] = fresh_vaults
+        _save_registry(registry)
+    return summaries
+
+
+def invalidate_registry():
+    """Bellekteki indeksi unutur; bir sonraki çağrıda diskten/dizinden yeniden okunur."""
+    global _cached_registry
+    _cached_registry = None
@@ -0,0 +1,258 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from . import vault_manager
+from .database_manager import add_file_records
+from .metadata_crypto import get_metadata_keys, register_metadata_keys
+from .progress import ProgressToken
+from .vault_lock import vault_write_lock, VaultBusyError
+
+DEFAULT_POLL_INTERVAL = 2.0   # saniye
+DEFAULT_SETTLE_SECONDS = 3.0  # Boyutu/zamanı bu kadar değişmeyen dosya "yazımı bitti" sayılır
+DEFAULT_BATCH_SIZE = 32
+# Tarayıcı ve indirme araçlarının yarım dosyaları; tamamlanınca yeniden adlandırılırlar
+IGNORED_SUFFIXES = (vault_manager.PARTIAL_FILE_SUFFIX, ".crdownload", ".download", ".tmp")
+
+# (boyut, mtime_ns): dosyanın yazımının sürüp sürmediğini anlamak için imza
+_FileSignature = Tuple[int, int]
+
+
+class IngestReport(NamedTuple):
+    added: List[Tuple[Path, str]]  # (kaynak, dosya ID)
+    failed: List[Path]
+    removed: List[Path]            # Doğrulanıp silinen düz metin kaynaklar
+
+
+class WatchFolderIngest:
+    """Açık bir kasa için izlenen klasöre bırakılan dosyaları otomatik ekler.
+
+    Klasör `poll_interval` saniyede bir taranır (alt klasörler ve gizli dosyalar
+    atlanır). Boyutu ve değişiklik zamanı `settle_seconds` boyunca sabit kalan
+    dosyalar `batch_size`'lık gruplar halinde paralel şifrelenir; her grubun
+    kayıtları tek bir metadata transaction'ı ile eklenir. remove_sources açıksa
+    şifreli kopya baştan sona doğrulandıktan sonra düz metin kaynak silinir.
+
+    on_batch her grup sonunda izleme thread'inden IngestReport ile çağrılır.
+
+    Kullanım:
+        watcher = WatchFolderIngest("Kasam", key, Path("~/Gelen").expanduser(), remove_sources=True)
+        watcher.start()
+        ...
+        watcher.stop()
+    """
+
+    def __init__(self, vault_name: str, vault_key: bytes, folder: Path, remove_sources: bool = False,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_workers: Optional[int] = None,
+                 on_batch: Optional[Callable[[IngestReport], None]] = None):
+        self.vault_name = vault_name
+        self.folder = folder
+        self.remove_sources = remove_sources
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._vault_key = vault_key
+        self._on_batch = on_batch
+        # Yol -> (imza, imzanın ilk görüldüğü an); yazımı süren dosyalar
+        self._pending: Dict[Path, Tuple[_FileSignature, float]] = {}
+        # Eklenen veya eklenemeyen dosyaların imzası: değişmedikçe tekrar denenmez
+        self._handled: Dict[Path, _FileSignature] = {}
+        self._token = ProgressToken() # stop() bunu iptal eder; yarım şifreli dosyalar silinir
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running or self._stopped.is_set():
+            return
+        self._thread = threading.Thread(target=self._run, name="kcEnc-watch", daemon=True)
+        self._thread.start()
+        print(f"Klasör izleniyor: {self.folder} -> '{self.vault_name}'")
+
+    def stop(self):
+        """İzlemeyi durdurur; süren şifrelemeler iptal edilir ve thread beklenir (yeniden başlatılamaz)."""
+        self._stopped.set()
+        self._token.cancel()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._vault_key = None
+        print(f"Klasör izleme durduruldu: {self.folder}")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"HATA: Klasör izlenirken beklenmedik hata: {e}")
+            self._stopped.wait(self.poll_interval)
+
+    # --- Tarama --- #
+
+    def scan(self) -> List[Path]:
+        """Klasörü bir kez tarar ve yazımı tamamlanmış (eklenmeye hazır) dosyaları döndürür."""
+        now = time.monotonic()
+        ready = []
+        seen = set()
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError as e:
+            print(f"HATA: İzlenen klasör okunamadı: {self.folder}\n{e}")
+            return ready
+        for entry in entries:
+            if entry.name.startswith('.') or entry.name.endswith(IGNORED_SUFFIXES):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue # Tarama sırasında silinmiş olabilir
+            path = Path(entry.path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            seen.add(path)
+            if self._handled.get(path) == signature:
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                self._pending[path] = (signature, now) # Yeni veya hâlâ büyüyor: süreyi baştan başlat
+            elif now - pending[1] >= self.settle_seconds:
+                ready.append(path)
+        # Klasörden kaybolan dosyaları unut
+        for path in list(self._pending):
+            if path not in seen:
+                del self._pending[path]
+        for path in list(self._handled):
+            if path not in seen:
+                del self._handled[path]
+        ready.sort(key=lambda p: p.name)
+        return ready
+
+    def run_once(self) -> Optional[IngestReport]:
+        """Tek bir tarama yapar ve hazır dosyaları gruplar halinde ekler; hiçbir şey yoksa None döndürür."""
+        ready = self.scan()
+        if not ready:
+            return None
+        total = IngestReport([], [], [])
+        for start in range(0, len(ready), self.batch_size):
+            if self._token.is_cancelled:
+                break
+            report = self.ingest_batch(ready[start:start + self.batch_size])
+            if report is None:
+                break # Kasa meşgul: kalanlar bir sonraki taramada denenir
+            for combined, part in zip(total, report):
+                combined.extend(part)
+            if self._on_batch and any(report):
+                self._on_batch(report)
+        return total
+
+    # --- Ekleme --- #
+
+    def ingest_batch(self, paths: List[Path]) -> Optional[IngestReport]:
+        """Dosyaları paralel şifreler ve kayıtlarını tek transaction'da ekler.
+
+        Kasa başka bir süreç tarafından yazılıyorsa None döndürür (dosyalar bekleyen kalır).
+        """
+        vault_key = self._vault_key
+        if vault_key is None:
+            return None
+        if get_metadata_keys(self.vault_name) is None:
+            register_metadata_keys(self.vault_name, vault_key)
+        try:
+            with vault_write_lock(self.vault_name, timeout=self.poll_interval):
+                return self._ingest_locked(paths, vault_key)
+        except VaultBusyError as e:
+            print(f"Uyarı: {e}; izlenen dosyalar daha sonra eklenecek.")
+        except OSError as e:
+            print(f"HATA: '{self.vault_name}' yazar kilidi alınamadı: {e}")
+        return None
+
+    def _ingest_locked(self, paths: List[Path], vault_key: bytes) -> IngestReport:
+        signatures = {path: self._pending[path][0] for path in paths}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths)), thread_name_prefix="kcEnc-watch") as executor:
+            infos = list(executor.map(
+                lambda path: vault_manager.encrypt_file_into_vault(self.vault_name, vault_key, path, self._token), paths))
+
+        encrypted: List[Tuple[Path, dict]] = []
+        failed: List[Path] = []
+        for path, info in zip(paths, infos):
+            if info is None:
+                if not self._token.is_cancelled:
+                    failed.append(path)
+            elif _signature(path) != signatures[path]:
+                # Şifreleme sırasında değişti: bu kopyayı at, dosya tekrar oturunca eklenir
+                vault_manager.discard_encrypted_file(self.vault_name, info['encrypted_filename'])
+            else:
+                encrypted.append((path, info))
+        for path in failed:
+            self._mark_handled(path, signatures[path])
+
+        if self._token.is_cancelled:
+            # İptalden önce tamamlanan şifreli kopyalar da eklenmez
+            for _, info in encrypted:
+                vault_manager.discard_encrypted_file(self.vault_name, info['encrypted_filename'])
+            return IngestReport([], failed, [])
+
+        if not encrypted:
+            return IngestReport([], failed, [])
+
+        file_ids = add_file_records(self.vault_name, [info for _, info in encrypted])
+        if file_ids is None:
+            for path, info in encrypted:
+                vault_manager.discard_encrypted_file(self.vault_name, info['encrypted_filename'])
+                self._mark_handled(path, signatures[path])
+                failed.append(path)
+            return IngestReport([], failed, [])
+
+        vault_manager.release_uncommitted_files(self.vault_name, [info['encrypted_filename'] for _, info in encrypted])
+        added = []
+        for (path, _), file_id in zip(encrypted, file_ids):
+            self._mark_handled(path, signatures[path])
+            added.append((path, file_id))
+        print(f"İzlenen klasörden {len(added)} dosya '{self.vault_name}' kasasına eklendi.")
+
+        removed = []
+        if self.remove_sources:
+            jobs = [(path, dict(info, id=file_id), signatures[path])
+                    for (path, info), file_id in zip(encrypted, file_ids)]
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs)), thread_name_prefix="kcEnc-watch") as executor:
+                results = list(executor.map(lambda job: self._remove_verified_source(vault_key, *job), jobs))
+            removed = [path for (path, _, _), ok in zip(jobs, results) if ok]
+        return IngestReport(added, failed, removed)
+
+    def _remove_verified_source(self, vault_key: bytes, path: Path, metadata: dict, signature: _FileSignature) -> bool:
+        """Şifreli kopya doğrulanırsa ve kaynak o sırada değişmediyse kaynağı siler."""
+        if not vault_manager.verify_file(self.vault_name, vault_key, metadata, self._token):
+            if not self._token.is_cancelled:
+                print(f"HATA: Şifreli kopya doğrulanamadı, kaynak silinmedi: {path}")
+            return False
+        if metadata['size_bytes'] != signature[0] or _signature(path) != signature:
+            print(f"Uyarı: Kaynak eklendikten sonra değişti, silinmedi: {path}")
+            return False
+        try:
+            path.unlink()
+            self._handled.pop(path, None)
+            return True
+        except OSError as e:
+            print(f"HATA: Kaynak dosya silinemedi: {path}\n{e}")
+            return False
+
+    def _mark_handled(self, path: Path, signature: _FileSignature):
+        self._pending.pop(path, None)
+        self._handled[path] = signature
+
+
+def _signature(path: Path) -> Optional[_FileSignature]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
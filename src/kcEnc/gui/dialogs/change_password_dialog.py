@@ -0,0 +1,49 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QLineEdit, QDialogButtonBox, QFormLayout
+)
+
+class ChangePasswordDialog(QDialog):
+    def __init__(self, vault_name: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Parolayı Değiştir: {vault_name}")
+
+        self.layout = QVBoxLayout(self)
+        self.form_layout = QFormLayout()
+
+        self.password_input = QLineEdit()
+        self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.confirm_password_input = QLineEdit()
+        self.confirm_password_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.error_label = QLabel("") # Parola uyuşmazlığı için
+        self.error_label.setStyleSheet("color: red")
+
+        self.form_layout.addRow("Yeni Parola:", self.password_input)
+        self.form_layout.addRow("Yeni Parola Tekrar:", self.confirm_password_input)
+
+        self.layout.addLayout(self.form_layout)
+        self.layout.addWidget(self.error_label)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        self.layout.addWidget(self.button_box)
+
+        self.ok_button = self.button_box.button(QDialogButtonBox.StandardButton.Ok)
+        self.ok_button.setEnabled(False)
+        self.password_input.textChanged.connect(self.validate_input)
+        self.confirm_password_input.textChanged.connect(self.validate_input)
+
+    def validate_input(self):
+        pw = self.password_input.text()
+        confirm_pw = self.confirm_password_input.text()
+        passwords_match = (pw == confirm_pw)
+
+        if pw and confirm_pw and not passwords_match:
+            self.error_label.setText("Parolalar uyuşmuyor!")
+        else:
+            self.error_label.setText("")
+
+        self.ok_button.setEnabled(bool(pw) and passwords_match)
+
+    def get_password(self) -> str:
+        return self.password_input.text()
@@ -1,8 +1,11 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QLineEdit, QDialogButtonBox, QPushButton, QFormLayout
+    QDialog, QVBoxLayout, QLabel, QLineEdit, QDialogButtonBox, QPushButton, QFormLayout, QComboBox
 )
 from PyQt6.QtCore import pyqtSignal
 
+from ...core.crypto_utils import SUPPORTED_CIPHERS, CIPHER_DISPLAY_NAMES
+from ...core.vault_manager import CIPHER_AUTO
+
 class CreateVaultDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -16,12 +19,18 @@ class CreateVaultDialog(QDialog):
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
         self.confirm_password_input = QLineEdit()
         self.confirm_password_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.cipher_combo = QComboBox()
+        self.cipher_combo.addItem("Otomatik (hız testi)", CIPHER_AUTO)
+        for cipher in SUPPORTED_CIPHERS:
+            self.cipher_combo.addItem(CIPHER_DISPLAY_NAMES[cipher], cipher)
+        self.cipher_combo.setToolTip("AES donanım hızlandırması olmayan cihazlarda ChaCha20-Poly1305 genellikle daha hızlıdır.")
         self.error_label = QLabel("") # Parola uyuşmazlığı için
         self.error_label.setStyleSheet("color: red")
 
         self.form_layout.addRow("Kasa Adı:", self.name_input)
         self.form_layout.addRow("Parola:", self.password_input)
         self.form_layout.addRow("Parola Tekrar:", self.confirm_password_input)
+        self.form_layout.addRow("Şifreleme:", self.cipher_combo)
 
         self.layout.addLayout(self.form_layout)
         self.layout.addWidget(self.error_label)
@@ -64,4 +73,7 @@ class CreateVaultDialog(QDialog):
             self.error_label.setText("Lütfen tüm alanları doğru doldurun.")
 
     def get_details(self) -> tuple[str, str]:
-        return self.name_input.text().strip(), self.password_input.text() 
\ No newline at end of file
+        return self.name_input.text().strip(), self.password_input.text()
+
+    def get_cipher(self) -> str:
+        return self.cipher_combo.currentData() 
\ No newline at end of file
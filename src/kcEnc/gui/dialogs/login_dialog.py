@@ -9,7 +9,7 @@ class LoginDialog(QDialog):
 
         self.layout = QVBoxLayout(self)
 
-        self.label = QLabel(f"Lütfen '{vault_name}' kasasının parolasını girin:")
+        self.label = QLabel(f"Lütfen '{vault_name}' kasasının parolasını (veya kurtarma anahtarını) girin:")
         self.password_input = QLineEdit()
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
 
@@ -0,0 +1,91 @@
+from typing import Any, Callable
+
+from PyQt6.QtWidgets import QProgressDialog
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+
+from ...core.progress import ProgressToken, ProgressSnapshot, format_progress
+
+PROGRESS_STEPS = 1000 # Çubuğun çözünürlüğü (byte sayıları int aralığını aşabilir)
+
+
+class OperationWorker(QThread):
+    """Verilen işlemi belirteçle birlikte arka planda çalıştırır; sonucu `result`'ta saklar."""
+    progressed = pyqtSignal(object) # ProgressSnapshot
+
+    def __init__(self, operation: Callable[[ProgressToken], Any], token: ProgressToken, parent=None):
+        super().__init__(parent)
+        self._operation = operation
+        self.token = token
+        self.result = None
+
+    def run(self):
+        try:
+            self.result = self._operation(self.token)
+        except Exception as e:
+            print(f"HATA: Arka plan işlemi beklenmedik şekilde sonlandı: {e}")
+            self.result = None
+
+
+class OperationProgressDialog(QProgressDialog):
+    """Uzun süren bir kasa işlemini ilerleme çubuğu ve İptal düğmesiyle yürütür.
+
+    İşlem `operation(token)` biçiminde verilir ve GUI thread'i dışında çalışır;
+    İptal'e basılınca belirteç iptal edilir, işlem yarım çıktısını temizleyip döner.
+
+    Kullanım:
+        result, cancelled = OperationProgressDialog.run(parent, "Ekleniyor...", op,
+                                                        total_bytes=n, total_items=k)
+    """
+
+    def __init__(self, title: str, operation: Callable[[ProgressToken], Any],
+                 total_bytes: int = 0, total_items: int = 0, parent=None):
+        super().__init__(title, "İptal", 0, PROGRESS_STEPS, parent)
+        self.setWindowTitle(title)
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(0)
+        self.setMinimumWidth(420)
+
+        self.token = ProgressToken(total_bytes, total_items, callback=self._report_from_worker)
+        self._worker = OperationWorker(operation, self.token, self)
+        self._worker.progressed.connect(self._on_progress)
+        self._worker.finished.connect(self._on_finished)
+        self.canceled.connect(self._on_cancel_requested)
+
+    def _report_from_worker(self, snapshot: ProgressSnapshot):
+        # İşçi thread'den çağrılır: GUI güncellemesi sinyalle ana thread'e aktarılır
+        self._worker.progressed.emit(snapshot)
+
+    def _on_progress(self, snapshot: ProgressSnapshot):
+        fraction = snapshot.fraction
+        if fraction is None:
+            self.setMaximum(0) # Toplam bilinmiyor: belirsiz çubuk
+        else:
+            self.setValue(int(fraction * PROGRESS_STEPS))
+        self.setLabelText(format_progress(snapshot))
+
+    def _on_cancel_requested(self):
+        self.token.cancel()
+        self.setLabelText("İptal ediliyor...")
+
+    def _on_finished(self):
+        self.done(0)
+
+    def exec(self) -> int:
+        self._worker.start()
+        result = super().exec()
+        self._worker.wait()
+        return result
+
+    @classmethod
+    def run(cls, parent, title: str, operation: Callable[[ProgressToken], Any],
+            total_bytes: int = 0, total_items: int = 0):
+        """İşlemi diyalogla çalıştırır ve (sonuç, iptal_edildi_mi) döndürür."""
+        dialog = cls(title, operation, total_bytes, total_items, parent)
+        dialog.exec()
+        result = dialog._worker.result
+        cancelled = dialog.token.is_cancelled
+        dialog._worker.progressed.disconnect() # Kuyrukta kalan bildirimler silinen diyaloğa ulaşmasın
+        dialog.deleteLater()
+        return result, cancelled
@@ -0,0 +1,146 @@
+import bisect
+from typing import Callable, List
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QHeaderView
+)
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+
+from ...core.search import search_vaults, search_result_sort_key
+
+
+class SearchWorker(QThread):
+    """Aramayı arka planda yürütür; her kasa tamamlandıkça sonuçları sinyalle iletir."""
+    results_ready = pyqtSignal(int, str, list) # generation, vault_name, results
+
+    def __init__(self, generation: int, vault_names: List[str], query: str, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self._vault_names = vault_names
+        self._query = query
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        for vault_name, results in search_vaults(self._vault_names, self._query,
+                                                 is_cancelled=lambda: self._cancelled):
+            if self._cancelled:
+                return
+            self.results_ready.emit(self.generation, vault_name, results)
+
+
+class SearchDialog(QDialog):
+    """Açık tüm kasalarda dosya adına göre arama yapar.
+
+    Sonuçlar kasalardan geldikçe sıralı konumlarına eklenir (akan sonuç görünümü).
+    """
+    request_open_file = pyqtSignal(str, str) # vault_name, file_id
+
+    SEARCH_DELAY_MS = 250 # Yazarken her tuşta arama başlatmamak için
+
+    def __init__(self, get_vault_names: Callable[[], List[str]], parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Açık Kasalarda Ara")
+        self.resize(700, 450)
+        self._get_vault_names = get_vault_names
+        self._generation = 0
+        self._workers: List[SearchWorker] = []
+        self._sort_keys = [] # Tablodaki satırların sıralama anahtarları (satır sırasıyla)
+        self._pending_vaults = 0
+
+        self.layout = QVBoxLayout(self)
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Dosya adı...")
+        self.query_input.setClearButtonEnabled(True)
+        self.layout.addWidget(self.query_input)
+
+        self.result_table = QTableWidget()
+        self.result_table.setColumnCount(4)
+        self.result_table.setHorizontalHeaderLabels(["Dosya Adı", "Kasa", "Tür", "Boyut (bytes)"])
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.result_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.result_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.result_table.verticalHeader().setVisible(False)
+        self.result_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.result_table.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.layout.addWidget(self.result_table)
+
+        self.status_layout = QHBoxLayout()
+        self.status_label = QLabel("")
+        self.status_layout.addWidget(self.status_label)
+        self.layout.addLayout(self.status_layout)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.start_search)
+        self.query_input.textChanged.connect(lambda _: self._search_timer.start())
+
+    def start_search(self):
+        self._cancel_workers()
+        self._generation += 1
+        self.result_table.setRowCount(0)
+        self._sort_keys = []
+
+        query = self.query_input.text().strip()
+        vault_names = self._get_vault_names()
+        if not query:
+            self.status_label.setText("")
+            return
+        if not vault_names:
+            self.status_label.setText("Açık kasa yok.")
+            return
+
+        self._pending_vaults = len(vault_names)
+        self.status_label.setText(f"{len(vault_names)} kasada aranıyor...")
+        worker = SearchWorker(self._generation, vault_names, query, self)
+        worker.results_ready.connect(self.on_results_ready)
+        worker.finished.connect(lambda w=worker: self._on_worker_finished(w))
+        self._workers.append(worker)
+        worker.start()
+
+    def on_results_ready(self, generation: int, vault_name: str, results: list):
+        if generation != self._generation:
+            return # Eski aramanın sonucu
+        for result in results:
+            key = search_result_sort_key(result)
+            row = bisect.bisect_right(self._sort_keys, key)
+            self._sort_keys.insert(row, key)
+            self.result_table.insertRow(row)
+
+            item_name = QTableWidgetItem(result['original_filename'])
+            item_name.setData(Qt.ItemDataRole.UserRole, (vault_name, result['id']))
+            self.result_table.setItem(row, 0, item_name)
+            self.result_table.setItem(row, 1, QTableWidgetItem(vault_name))
+            self.result_table.setItem(row, 2, QTableWidgetItem(result.get('file_type') or ''))
+            self.result_table.setItem(row, 3, QTableWidgetItem(str(result.get('size_bytes', ''))))
+
+        self._pending_vaults -= 1
+        if self._pending_vaults <= 0:
+            self.status_label.setText(f"{self.result_table.rowCount()} sonuç bulundu.")
+        else:
+            self.status_label.setText(f"{self.result_table.rowCount()} sonuç, {self._pending_vaults} kasa bekleniyor...")
+
+    def on_item_double_clicked(self, item: QTableWidgetItem):
+        id_item = self.result_table.item(item.row(), 0)
+        if id_item:
+            vault_name, file_id = id_item.data(Qt.ItemDataRole.UserRole)
+            self.request_open_file.emit(vault_name, file_id)
+
+    def _cancel_workers(self):
+        for worker in self._workers:
+            worker.cancel()
+
+    def _on_worker_finished(self, worker: SearchWorker):
+        if worker in self._workers:
+            self._workers.remove(worker)
+        worker.deleteLater()
+
+    def closeEvent(self, event):
+        self._cancel_workers()
+        for worker in list(self._workers):
+            worker.wait()
+        super().closeEvent(event)
@@ -13,12 +13,28 @@ from .widgets.vault_list_widget import VaultListWidget
 from .widgets.unlocked_vault_widget import UnlockedVaultWidget
 from .dialogs.login_dialog import LoginDialog
 from .dialogs.create_vault_dialog import CreateVaultDialog
+from .dialogs.search_dialog import SearchDialog
+from .dialogs.change_password_dialog import ChangePasswordDialog
+from .dialogs.progress_dialog import OperationProgressDialog, OperationWorker
 from ..core import vault_manager
+from ..core.sessions import VaultSessions
+from ..core.http_server import VaultHttpServer
+from ..core.bulk_extract import extract_files
+from ..core.file_listing import FileListing
+from ..core import import_jobs
+from ..core.watch_folder import WatchFolderIngest, IngestReport
+from ..core.crypto_utils import CIPHER_DISPLAY_NAMES
+from ..core.buffer_pool import clear_buffer_pools
+from ..core.metadata_crypto import clear_metadata_keys
+from ..core.metadata_cache import clear_metadata_cache
+from ..core.progress import ProgressToken
 from ..utils.file_utils import ensure_vaults_dir_exists
 
 class MainWindow(QMainWindow):
     # Kasa kilidi açıldığında veya kilitlendiğinde sinyal gönderebiliriz
     vault_state_changed = pyqtSignal(bool, str) # is_unlocked, vault_name
+    # İzlenen klasörden bir grup eklendiğinde (izleme thread'inden, kuyrukla iletilir)
+    watch_batch_ingested = pyqtSignal(object) # IngestReport
 
     def __init__(self):
         super().__init__()
@@ -26,7 +42,12 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 850, 650) # Boyutu biraz büyütelim
 
         self._active_vault_name: str | None = None
-        self._vault_key: bytes | None = None
+        # Aynı anda birden fazla kasa açık tutulabilir; görünen kasa _active_vault_name
+        self._sessions = VaultSessions()
+        self._search_dialog: SearchDialog | None = None
+        self._http_server: VaultHttpServer | None = None # Yerel salt okunur HTTP sunucusu
+        self._folder_watcher: WatchFolderIngest | None = None # Klasör izleyerek otomatik ekleme
+        self._reconcile_workers: list[OperationWorker] = [] # Açılışta arka planda çalışan uzlaştırmalar
 
         # Eylemleri (Actions) oluştur
         self._create_actions()
@@ -61,9 +82,11 @@ class MainWindow(QMainWindow):
         self.unlocked_vault_view.request_add_file.connect(self.add_file)
         self.unlocked_vault_view.request_view_file.connect(self.view_file)
         self.unlocked_vault_view.request_save_as.connect(self.save_file_as)
-        self.unlocked_vault_view.request_delete_file.connect(self.delete_file)
+        self.unlocked_vault_view.request_extract_files.connect(self.extract_files)
+        self.unlocked_vault_view.request_delete_files.connect(self.delete_files)
         # Kasa durumu değiştikçe araç çubuğu eylemlerini güncelle
         self.vault_state_changed.connect(self.update_actions_state)
+        self.watch_batch_ingested.connect(self._on_watch_batch_ingested)
 
         # Uygulama destek dizinini kontrol et/oluştur
         try:
@@ -84,6 +107,36 @@ class MainWindow(QMainWindow):
         self.lock_vault_action.setShortcut("Ctrl+L")
         self.lock_vault_action.triggered.connect(self.lock_vault)
 
+        self.show_vault_list_action = QAction(style.standardIcon(style.StandardPixmap.SP_FileDialogListView), "Kasa &Listesi", self)
+        self.show_vault_list_action.setShortcut("Ctrl+Shift+O")
+        self.show_vault_list_action.setToolTip("Açık kasayı kilitlemeden kasa listesine dön")
+        self.show_vault_list_action.triggered.connect(self.show_vault_list_view)
+
+        self.lock_all_action = QAction(style.standardIcon(style.StandardPixmap.SP_BrowserStop), "&Tümünü Kilitle", self)
+        self.lock_all_action.setShortcut("Ctrl+Shift+L")
+        self.lock_all_action.triggered.connect(self.lock_all_vaults)
+
+        self.search_action = QAction(style.standardIcon(style.StandardPixmap.SP_FileDialogContentsView), "Kasalarda &Ara...", self)
+        self.search_action.setShortcut("Ctrl+F")
+        self.search_action.triggered.connect(self.show_search_dialog)
+
+        self.http_server_action = QAction(style.standardIcon(style.StandardPixmap.SP_DriveNetIcon), "Yerel &Sunucu", self)
+        self.http_server_action.setCheckable(True)
+        self.http_server_action.setToolTip("Açık kasadaki dosyaları yalnızca bu bilgisayardan erişilebilen bir HTTP sunucusuyla paylaş")
+        self.http_server_action.toggled.connect(self.toggle_http_server)
+
+        self.watch_folder_action = QAction(style.standardIcon(style.StandardPixmap.SP_DirOpenIcon), "Klasörü &İzle...", self)
+        self.watch_folder_action.setCheckable(True)
+        self.watch_folder_action.setToolTip("Seçilen klasöre bırakılan dosyaları açık kasaya otomatik olarak ekle")
+        self.watch_folder_action.toggled.connect(self.toggle_folder_watch)
+
+        self.change_password_action = QAction(style.standardIcon(style.StandardPixmap.SP_DialogApplyButton), "&Parolayı Değiştir...", self)
+        self.change_password_action.setToolTip("Sadece anahtar sarmalaması yenilenir; dosyalar yeniden şifrelenmez")
+        self.change_password_action.triggered.connect(self.prompt_change_password)
+
+        self.recovery_key_action = QAction(style.standardIcon(style.StandardPixmap.SP_DialogSaveButton), "&Kurtarma Anahtarı Oluştur...", self)
+        self.recovery_key_action.triggered.connect(self.create_recovery_key)
+
         self.exit_action = QAction(style.standardIcon(style.StandardPixmap.SP_DialogCloseButton), "&Çıkış", self)
         self.exit_action.setShortcut("Ctrl+Q")
         self.exit_action.triggered.connect(self.close) # closeEvent tetiklenir
@@ -92,6 +145,13 @@ class MainWindow(QMainWindow):
         self.fileToolBar = self.addToolBar("Dosya")
         self.fileToolBar.addAction(self.add_file_action)
         self.fileToolBar.addAction(self.lock_vault_action)
+        self.fileToolBar.addAction(self.show_vault_list_action)
+        self.fileToolBar.addAction(self.lock_all_action)
+        self.fileToolBar.addAction(self.search_action)
+        self.fileToolBar.addAction(self.http_server_action)
+        self.fileToolBar.addAction(self.watch_folder_action)
+        self.fileToolBar.addAction(self.change_password_action)
+        self.fileToolBar.addAction(self.recovery_key_action)
         # self.fileToolBar.addAction(self.exit_action) # Çıkış genellikle menüde olur
 
         # Başlangıçta durumlarını ayarla
@@ -99,25 +159,53 @@ class MainWindow(QMainWindow):
 
     def update_actions_state(self, is_unlocked: bool, vault_name: str):
         """Kasa durumuna göre eylemlerin etkinliğini ayarlar."""
+        has_sessions = len(self._sessions) > 0
         self.add_file_action.setEnabled(is_unlocked)
         self.lock_vault_action.setEnabled(is_unlocked)
+        self.show_vault_list_action.setEnabled(is_unlocked)
+        self.change_password_action.setEnabled(is_unlocked)
+        self.recovery_key_action.setEnabled(is_unlocked)
+        self.lock_all_action.setEnabled(has_sessions)
+        self.search_action.setEnabled(has_sessions)
+        # Çalışan sunucu kasa listesindeyken de durdurulabilmeli
+        self.http_server_action.setEnabled(is_unlocked or self._http_server is not None)
+        self.watch_folder_action.setEnabled(is_unlocked or self._folder_watcher is not None)
+
+    @property
+    def _vault_key(self) -> bytes | None:
+        """Görünen (aktif) kasanın anahtarı."""
+        if not self._active_vault_name:
+            return None
+        return self._sessions.get_key(self._active_vault_name)
 
     def show_vault_list_view(self):
-        self._clear_sensitive_data() # Anahtarı temizle
+        # Açık kasalar kilitlenmez; sadece görünüm değişir
         self._active_vault_name = None
+        self.unlocked_vault_view.clear_preview()
         self.setWindowTitle("kcEnc - Kasa Seçimi")
-        self.vault_list_view.refresh_vault_list() # Listeyi yenile
+        self.vault_list_view.refresh_vault_list(self._sessions.names()) # Listeyi yenile
         self.view_stack.setCurrentIndex(0)
         self.vault_state_changed.emit(False, "")
 
-    def show_unlocked_vault_view(self, vault_name: str):
+    def show_unlocked_vault_view(self, vault_name: str, files: FileListing | None = None):
         self._active_vault_name = vault_name
-        self.setWindowTitle(f"kcEnc - Kasa: {vault_name}")
-        self.unlocked_vault_view.load_files(vault_name)
+        self._update_window_title()
+        self.unlocked_vault_view.load_files(vault_name, files)
         self.view_stack.setCurrentIndex(1)
         self.vault_state_changed.emit(True, vault_name)
 
+    def _update_window_title(self):
+        title = f"kcEnc - Kasa: {self._active_vault_name}"
+        open_count = len(self._sessions)
+        if open_count > 1:
+            title += f" ({open_count} açık kasa)"
+        self.setWindowTitle(title)
+
     def prompt_unlock_vault(self, vault_name: str):
+        if vault_name in self._sessions:
+            # Zaten açık: parola sormadan göster
+            self.show_unlocked_vault_view(vault_name)
+            return
         dialog = LoginDialog(vault_name, self)
         if dialog.exec():
             password = dialog.get_password()
@@ -125,27 +213,37 @@ class MainWindow(QMainWindow):
             self.unlock_vault(vault_name, password)
 
     def unlock_vault(self, vault_name: str, password: str):
-        # Kilit açma işlemi biraz sürebilir, belki ileride thread kullanılabilir
+        # Anahtar türetilirken veritabanı arka planda açılıp liste satırları okunur
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            key = vault_manager.unlock_vault(vault_name, password)
+            key, files = vault_manager.unlock_vault_and_list_files(vault_name, password)
             QApplication.restoreOverrideCursor()
             if key:
-                self._vault_key = key
-                self.show_unlocked_vault_view(vault_name)
+                self._start_reconcile(vault_name)
+                self._sessions.add(vault_name, key)
+                self.show_unlocked_vault_view(vault_name, files)
+                self._offer_import_resume(vault_name)
             else:
                 self.show_error_message("Kilit Açma Hatası", "Geçersiz parola veya kasa yapılandırma hatası.")
         except Exception as e:
             QApplication.restoreOverrideCursor()
             self.show_error_message("Kilit Açma Hatası", f"Beklenmedik bir hata oluştu:\n{e}")
 
+    def _start_reconcile(self, vault_name: str):
+        """files/ ile metadata.db arasındaki tutarsızlıkları arka planda temizler (GUI beklemez)."""
+        worker = OperationWorker(lambda token: vault_manager.reconcile_vault(vault_name), ProgressToken(), self)
+        worker.finished.connect(lambda: self._reconcile_workers.remove(worker))
+        worker.finished.connect(worker.deleteLater)
+        self._reconcile_workers.append(worker)
+        worker.start()
+
     def prompt_create_vault(self):
         dialog = CreateVaultDialog(self)
         if dialog.exec():
             vault_name, password = dialog.get_details()
-            self.create_vault(vault_name, password)
+            self.create_vault(vault_name, password, dialog.get_cipher())
 
-    def create_vault(self, vault_name: str, password: str):
+    def create_vault(self, vault_name: str, password: str, cipher: str = vault_manager.CIPHER_AUTO):
         # İsim geçerliliğini kontrol et (örn. /, \ içermemeli)
         if not vault_name or '/' in vault_name or '\\' in vault_name:
              self.show_error_message("Geçersiz Kasa Adı", "Kasa adı boş olamaz ve / veya \\ karakterlerini içeremez.")
@@ -157,10 +255,11 @@ class MainWindow(QMainWindow):
 
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            success = vault_manager.create_vault(vault_name, password)
+            success = vault_manager.create_vault(vault_name, password, cipher)
             QApplication.restoreOverrideCursor()
             if success:
-                 QMessageBox.information(self, "Başarılı", f"'{vault_name}' kasası başarıyla oluşturuldu.")
+                 cipher_name = CIPHER_DISPLAY_NAMES.get(vault_manager.get_vault_cipher(vault_name), "")
+                 QMessageBox.information(self, "Başarılı", f"'{vault_name}' kasası başarıyla oluşturuldu.\nŞifreleme: {cipher_name}")
                  # Kasa listesini yenilemek için tekrar vault list view'e dön
                  self.show_vault_list_view()
             else:
@@ -172,29 +271,197 @@ class MainWindow(QMainWindow):
             self.show_error_message("Oluşturma Hatası", f"Beklenmedik bir hata oluştu:\n{e}")
 
     def lock_vault(self):
-        print("Kasa kilitleniyor...")
+        """Görünen kasayı kilitler; diğer açık kasalar açık kalır."""
+        if self._active_vault_name:
+            print(f"Kasa kilitleniyor: {self._active_vault_name}")
+            self._lock_session(self._active_vault_name)
+        self.show_vault_list_view()
+
+    def lock_all_vaults(self):
+        print("Tüm kasalar kilitleniyor...")
+        self._clear_sensitive_data()
         self.show_vault_list_view()
 
+    def _lock_session(self, vault_name: str):
+        """Tek bir kasanın anahtarını ve ona bağlı kaynakları (sunucu, önizleme) bırakır."""
+        if self._http_server and self._http_server.vault_name == vault_name:
+            self._stop_http_server()
+        if self._folder_watcher and self._folder_watcher.vault_name == vault_name:
+            self._stop_folder_watch()
+        self._sessions.remove(vault_name)
+        vault_manager.lock_vault(vault_name)
+        if vault_name == self._active_vault_name:
+            # Açık kasa görünümündeki önizlemeyi de temizle
+            self.unlocked_vault_view.clear_preview()
+
     def _clear_sensitive_data(self):
-        if self._vault_key:
-            try:
-                # ctypes ile daha güvenli silme denenebilir ama şimdilik bu
-                key_len = len(self._vault_key)
-                self._vault_key = os.urandom(key_len) # Rastgele veri yaz
-            except Exception:
-                pass # Hata olsa bile None yap
-            finally:
-                 self._vault_key = None
+        self._stop_http_server()
+        self._stop_folder_watch()
+        # Anahtarlar VaultSessions'tan silinir; bytes değiştirilemez olduğundan
+        # üzerine yazmak mümkün değil, referansları bırakmak yeterli
+        self._sessions.clear()
+        clear_metadata_keys()
+        clear_metadata_cache() # Çözülmüş dosya adları
+        clear_buffer_pools() # Havuzdaki tamponlarda düz metin parçaları kalmış olabilir
         self._active_vault_name = None
         # Açık kasa görünümündeki önizlemeyi de temizle
         self.unlocked_vault_view.clear_preview()
 
     def closeEvent(self, event):
+        if self._search_dialog:
+            self._search_dialog.close()
         self._clear_sensitive_data()
+        for worker in list(self._reconcile_workers):
+            worker.wait() # Çalışırken yok edilen QThread uygulamayı sonlandırır
         # UnlockedVaultWidget'taki geçici dosyayı da silmek için
         # onun close metodu çağrılmalı, QMainWindow kapanınca child widgetlar da kapanır
         event.accept()
 
+    # --- Parola ve Kurtarma Anahtarı --- #
+    def prompt_change_password(self):
+        if not self._active_vault_name or not self._vault_key:
+            return
+        dialog = ChangePasswordDialog(self._active_vault_name, self)
+        if not dialog.exec():
+            return
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            success = vault_manager.change_password(self._active_vault_name, self._vault_key, dialog.get_password())
+        finally:
+            QApplication.restoreOverrideCursor()
+        if success:
+            QMessageBox.information(self, "Başarılı", f"'{self._active_vault_name}' kasasının parolası değiştirildi.")
+        else:
+            self.show_error_message("Parola Değiştirme Hatası", "Parola değiştirilemedi. Detaylar için konsol loglarını kontrol edin.")
+
+    def create_recovery_key(self):
+        if not self._active_vault_name or not self._vault_key:
+            return
+        if vault_manager.has_recovery_key(self._active_vault_name):
+            reply = QMessageBox.question(self, "Kurtarma Anahtarı",
+                                         "Bu kasanın zaten bir kurtarma anahtarı var. Yenisi oluşturulursa eskisi geçersiz olur.\n\nDevam edilsin mi?",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                         QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        recovery_key = vault_manager.create_recovery_key(self._active_vault_name, self._vault_key)
+        if not recovery_key:
+            self.show_error_message("Kurtarma Anahtarı Hatası", "Kurtarma anahtarı oluşturulamadı. Detaylar için konsol loglarını kontrol edin.")
+            return
+        box = QMessageBox(QMessageBox.Icon.Information, "Kurtarma Anahtarı",
+                          "Kurtarma anahtarını güvenli bir yere kaydedin; tekrar gösterilmeyecek.\n"
+                          "Parolayı unutursanız kilit açma ekranında parola yerine bu anahtarı girebilirsiniz.\n\n"
+                          f"{recovery_key}", QMessageBox.StandardButton.Ok, self)
+        box.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        box.exec()
+
+    # --- Kasalar Arası Arama --- #
+    def show_search_dialog(self):
+        if self._search_dialog is None:
+            self._search_dialog = SearchDialog(self._sessions.names, self)
+            self._search_dialog.request_open_file.connect(self.open_search_result)
+        self._search_dialog.show()
+        self._search_dialog.raise_()
+        self._search_dialog.activateWindow()
+
+    def open_search_result(self, vault_name: str, file_id: str):
+        if vault_name not in self._sessions:
+            self.show_error_message("Hata", f"'{vault_name}' kasası artık açık değil.")
+            return
+        if vault_name != self._active_vault_name or self.view_stack.currentIndex() != 1:
+            self.show_unlocked_vault_view(vault_name)
+        self.unlocked_vault_view.select_file(file_id)
+        self.view_file(file_id)
+
+    # --- Yerel HTTP Sunucusu --- #
+    def toggle_http_server(self, checked: bool):
+        if not checked:
+            self._stop_http_server()
+            return
+        if not self._active_vault_name or not self._vault_key:
+            self._set_http_server_action_checked(False)
+            return
+        try:
+            self._http_server = VaultHttpServer(self._active_vault_name, self._vault_key)
+            self._http_server.start()
+        except OSError as e:
+            self._http_server = None
+            self._set_http_server_action_checked(False)
+            self.show_error_message("Sunucu Hatası", f"Yerel sunucu başlatılamadı:\n{e}")
+            return
+
+        index_url = self._http_server.index_url
+        QApplication.clipboard().setText(index_url)
+        msg_box = QMessageBox(QMessageBox.Icon.Information, "Yerel Sunucu",
+                              "Kasa yalnızca bu bilgisayardan, aşağıdaki adres ve erişim belirteciyle okunabilir.\n"
+                              "Adres panoya kopyalandı. Kasa kilitlendiğinde sunucu durur.\n\n"
+                              f"{index_url}", parent=self)
+        msg_box.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        msg_box.exec()
+
+    def _stop_http_server(self):
+        if self._http_server:
+            self._http_server.stop()
+            self._http_server = None
+        self._set_http_server_action_checked(False)
+        self.http_server_action.setEnabled(self._vault_key is not None)
+
+    def _set_http_server_action_checked(self, checked: bool):
+        # toggled sinyalini tetiklemeden işareti güncelle
+        self.http_server_action.blockSignals(True)
+        self.http_server_action.setChecked(checked)
+        self.http_server_action.blockSignals(False)
+
+    # --- Klasör İzleme --- #
+    def toggle_folder_watch(self, checked: bool):
+        if not checked:
+            self._stop_folder_watch()
+            return
+        if not self._active_vault_name or not self._vault_key:
+            self._set_watch_folder_action_checked(False)
+            return
+        folder = QFileDialog.getExistingDirectory(self, "İzlenecek Klasörü Seçin")
+        if not folder:
+            self._set_watch_folder_action_checked(False)
+            return
+        reply = QMessageBox.question(self, "Klasörü İzle",
+                                     f"'{folder}' klasörüne bırakılan dosyalar '{self._active_vault_name}' kasasına eklenecek.\n\n"
+                                     "Şifreli kopya doğrulandıktan sonra orijinal (şifresiz) dosyalar silinsin mi?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Cancel:
+            self._set_watch_folder_action_checked(False)
+            return
+        self._folder_watcher = WatchFolderIngest(self._active_vault_name, self._vault_key, Path(folder),
+                                                 remove_sources=reply == QMessageBox.StandardButton.Yes,
+                                                 on_batch=self.watch_batch_ingested.emit)
+        self._folder_watcher.start()
+        self.statusBar().showMessage(f"Klasör izleniyor: {folder}")
+
+    def _on_watch_batch_ingested(self, report: IngestReport):
+        if self._folder_watcher is None:
+            return
+        msg = f"İzlenen klasörden {len(report.added)} dosya eklendi"
+        if report.removed:
+            msg += f", {len(report.removed)} kaynak silindi"
+        if report.failed:
+            msg += f", {len(report.failed)} dosya eklenemedi ({', '.join(p.name for p in report.failed[:3])})"
+        self.statusBar().showMessage(msg + ".", 10000)
+
+    def _stop_folder_watch(self):
+        if self._folder_watcher:
+            self._folder_watcher.stop()
+            self._folder_watcher = None
+            self.statusBar().clearMessage()
+        self._set_watch_folder_action_checked(False)
+        self.watch_folder_action.setEnabled(self._vault_key is not None)
+
+    def _set_watch_folder_action_checked(self, checked: bool):
+        # toggled sinyalini tetiklemeden işareti güncelle
+        self.watch_folder_action.blockSignals(True)
+        self.watch_folder_action.setChecked(checked)
+        self.watch_folder_action.blockSignals(False)
+
     # --- Dosya İşlemleri --- #
     def add_file(self):
         if not self._active_vault_name or not self._vault_key:
@@ -209,67 +476,93 @@ class MainWindow(QMainWindow):
         if file_dialog.exec():
             selected_files = file_dialog.selectedFiles()
             if selected_files:
-                QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-                added_count = 0
-                error_files = []
-                for file_path_str in selected_files:
-                    file_path = Path(file_path_str)
-                    try:
-                        file_id = vault_manager.add_file_to_vault(self._active_vault_name, self._vault_key, file_path)
-                        if file_id:
-                            added_count += 1
-                        else:
-                            error_files.append(file_path.name)
-                    except Exception as e:
-                        print(f"HATA: Dosya eklenirken beklenmedik hata ({file_path.name}): {e}")
-                        error_files.append(f"{file_path.name} (hata: {e})")
-                QApplication.restoreOverrideCursor()
+                file_paths = [Path(p) for p in selected_files]
+                vault_name, vault_key = self._active_vault_name, self._vault_key
+                # İş olarak kaydedilir: uygulama kapanırsa kaldığı yerden devam edilebilir.
+                # Çok sayıda kaynakta işin oluşturulması da sürebilir; o da diyaloğun thread'inde yapılır.
+                self._run_import(lambda token: import_jobs.import_files(vault_name, vault_key, file_paths, token))
+
+    def _run_import_job(self, job_id: str):
+        """Kayıtlı (yarım kalmış) içe aktarma işini çalıştırır."""
+        vault_name, vault_key = self._active_vault_name, self._vault_key
+        self._run_import(lambda token: import_jobs.run_import_job(vault_name, vault_key, job_id, token))
+
+    def _run_import(self, operation):
+        """İçe aktarma işlemini ilerleme diyaloğuyla çalıştırır ve sonucu (ImportSummary) gösterir."""
+        # Bekleyen byte/dosya toplamı run_import_job tarafından belirtece eklenir
+        summary, cancelled = OperationProgressDialog.run(self, "Dosyalar kasaya ekleniyor...", operation)
+        if summary is None:
+            if cancelled:
+                return
+            self.show_error_message("Ekleme Hatası", "İçe aktarma işi oluşturulamadı veya çalıştırılamadı. Detaylar için konsol loglarını kontrol edin.")
+            return
 
-                if added_count > 0:
-                    msg = f"{added_count} dosya başarıyla eklendi."
-                    if error_files:
-                        msg += f"\n\nAşağıdaki dosyalar eklenemedi:\n- {'\n- '.join(error_files)}"
-                        QMessageBox.warning(self, "Ekleme Sonucu", msg)
-                    else:
-                        QMessageBox.information(self, "Ekleme Sonucu", msg)
-                    self.unlocked_vault_view.refresh_file_list()
-                elif error_files:
-                     QMessageBox.critical(self, "Ekleme Hatası", f"Seçilen dosyalar eklenemedi:\n- {'\n- '.join(error_files)}")
-
-    def delete_file(self, file_id: str):
-        if not self._active_vault_name:
-             self.show_error_message("Hata", "Aktif bir kasa yok.")
+        error_files = [Path(source).name for source in summary.failed]
+        msg = f"{summary.added} dosya eklendi."
+        if summary.already_done:
+            msg += f"\n{summary.already_done} dosya önceden eklenmişti, atlandı."
+        if summary.cancelled:
+            QMessageBox.information(self, "Ekleme Yarıda Kaldı",
+                                    msg + "\n\nKalan dosyalar, kasa bir sonraki açılışında kaldığı yerden eklenebilir.")
+        elif error_files:
+            msg += f"\n\nAşağıdaki dosyalar eklenemedi:\n- " + "\n- ".join(error_files)
+            if summary.added or summary.already_done:
+                QMessageBox.warning(self, "Ekleme Sonucu", msg)
+            else:
+                QMessageBox.critical(self, "Ekleme Hatası", msg)
+        else:
+            QMessageBox.information(self, "Ekleme Sonucu", msg)
+
+    def _offer_import_resume(self, vault_name: str):
+        """Kasada yarım kalmış içe aktarma işi varsa devam etmeyi önerir."""
+        for job in import_jobs.get_unfinished_import_jobs(vault_name):
+            done = job['total_items'] - job['pending_items']
+            box = QMessageBox(QMessageBox.Icon.Question, "Yarım Kalan İçe Aktarma",
+                              f"'{vault_name}' kasasına içe aktarma yarıda kalmış: {done}/{job['total_items']} dosya eklendi, "
+                              f"{job['pending_items']} dosya ({job['pending_bytes'] / (1024 * 1024):.1f} MB) bekliyor.\n\n"
+                              "Kaldığı yerden devam edilsin mi?", parent=self)
+            resume_button = box.addButton("Devam Et", QMessageBox.ButtonRole.AcceptRole)
+            discard_button = box.addButton("Vazgeç", QMessageBox.ButtonRole.DestructiveRole)
+            box.addButton("Sonra", QMessageBox.ButtonRole.RejectRole)
+            box.exec()
+            if box.clickedButton() is resume_button:
+                self._run_import_job(job['id'])
+            elif box.clickedButton() is discard_button:
+                import_jobs.discard_import_job(vault_name, job['id'])
+
+    def delete_files(self, file_ids: list):
+        if not self._active_vault_name or not file_ids:
              return
 
-        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-        try:
+        if len(file_ids) == 1:
             # Dosya adını mesajda göstermek için meta veriyi alalım
-            item_text = "Bilinmeyen Dosya"
-            metadata = vault_manager.database_manager.get_file_metadata(self._active_vault_name, file_id)
-            if metadata:
-                item_text = metadata.get('original_filename', item_text)
-            QApplication.restoreOverrideCursor() # Soru sormadan önce imleci düzelt
-
-            reply = QMessageBox.question(self, "Dosyayı Sil",
-                                         f"'{item_text}' dosyasını kalıcı olarak silmek istediğinizden emin misiniz?",
-                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                                         QMessageBox.StandardButton.No)
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-                success = vault_manager.remove_file_from_vault(self._active_vault_name, file_id)
-                QApplication.restoreOverrideCursor()
-                if success:
-                    QMessageBox.information(self, "Başarılı", "Dosya başarıyla silindi.")
-                    self.unlocked_vault_view.refresh_file_list()
-                    self.unlocked_vault_view.clear_preview()
-                else:
-                    self.show_error_message("Silme Hatası", "Dosya silinemedi. Veritabanı veya dosya sistemi hatası olabilir.")
-            # else: Kullanıcı hayır dedi, bir şey yapma
+            metadata = vault_manager.get_file_metadata(self._active_vault_name, file_ids[0])
+            item_text = metadata.get('original_filename', "Bilinmeyen Dosya") if metadata else "Bilinmeyen Dosya"
+            question = f"'{item_text}' dosyasını kalıcı olarak silmek istediğinizden emin misiniz?"
+        else:
+            question = f"Seçili {len(file_ids)} dosyayı kalıcı olarak silmek istediğinizden emin misiniz?"
+        reply = QMessageBox.question(self, "Dosyaları Sil", question,
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
 
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            # Kayıtlar tek transaction'da silinir; şifreli dosyalar arka planda silinir
+            deleted = vault_manager.remove_files_from_vault(self._active_vault_name, file_ids)
         except Exception as e:
             QApplication.restoreOverrideCursor()
-            self.show_error_message("Silme Hatası", f"Dosya silinirken beklenmedik bir hata oluştu:\n{e}")
+            self.show_error_message("Silme Hatası", f"Dosyalar silinirken beklenmedik bir hata oluştu:\n{e}")
+            return
+        QApplication.restoreOverrideCursor()
+
+        if deleted:
+            # Tablo, çekirdeğin değişiklik bildirimiyle satır satır güncellenir
+            self.statusBar().showMessage(f"{len(deleted)} dosya silindi.", 5000)
+        if len(deleted) < len(file_ids):
+            self.show_error_message("Silme Hatası",
+                                    f"{len(file_ids) - len(deleted)} dosya silinemedi. Veritabanı hatası olabilir; detaylar için konsol loglarını kontrol edin.")
 
     def view_file(self, file_id: str):
         if not self._active_vault_name or not self._vault_key:
@@ -278,8 +571,24 @@ class MainWindow(QMainWindow):
 
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            decrypted_data = vault_manager.get_decrypted_file_data(self._active_vault_name, self._vault_key, file_id)
+            metadata = vault_manager.get_file_metadata(self._active_vault_name, file_id)
+            if metadata and self.unlocked_vault_view.preview_supports_stream(metadata.get('file_type')):
+                # Önizleme yalnızca gösterdiği bölümü çözer; dosyanın tamamı belleğe alınmaz
+                stream = vault_manager.open_decrypted_stream(self._active_vault_name, self._vault_key, metadata)
+                QApplication.restoreOverrideCursor()
+                if stream is not None:
+                    self.unlocked_vault_view.show_preview_stream(file_id, stream)
+                else:
+                    self.show_error_message("Görüntüleme Hatası", "Dosya açılamadı veya şifresi çözülemedi.")
+                return
             QApplication.restoreOverrideCursor()
+            vault_name, vault_key = self._active_vault_name, self._vault_key
+            decrypted_data, cancelled = OperationProgressDialog.run(
+                self, "Dosya çözülüyor...",
+                lambda token: vault_manager.get_decrypted_file_data(vault_name, vault_key, file_id, token),
+                total_bytes=(metadata or {}).get('size_bytes') or 0, total_items=1)
+            if cancelled:
+                return
             if decrypted_data is not None: # None gelmesi hata demek
                 self.unlocked_vault_view.show_preview(file_id, decrypted_data)
             else:
@@ -295,7 +604,7 @@ class MainWindow(QMainWindow):
              return
 
         # Önce meta veriyi alıp orijinal dosya adını önerelim
-        metadata = vault_manager.database_manager.get_file_metadata(self._active_vault_name, file_id)
+        metadata = vault_manager.get_file_metadata(self._active_vault_name, file_id)
         original_filename = metadata.get('original_filename', 'encrypted_file') if metadata else 'encrypted_file'
 
         file_dialog = QFileDialog(self, "Dosyayı Farklı Kaydet")
@@ -306,22 +615,53 @@ class MainWindow(QMainWindow):
             target_path_str = file_dialog.selectedFiles()[0]
             if target_path_str:
                 target_path = Path(target_path_str)
-                QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-                try:
-                    decrypted_data = vault_manager.get_decrypted_file_data(self._active_vault_name, self._vault_key, file_id)
-                    if decrypted_data is not None:
-                         target_path.write_bytes(decrypted_data)
-                         QApplication.restoreOverrideCursor()
-                         QMessageBox.information(self, "Başarılı", f"Dosya başarıyla kaydedildi:\n{target_path}")
-                    else:
-                         QApplication.restoreOverrideCursor()
-                         self.show_error_message("Kaydetme Hatası", "Dosya verisi alınamadı veya şifresi çözülemedi.")
-                except OSError as e:
-                    QApplication.restoreOverrideCursor()
-                    self.show_error_message("Kaydetme Hatası", f"Dosya kaydedilirken hata oluştu:\n{e}")
-                except Exception as e:
-                    QApplication.restoreOverrideCursor()
-                    self.show_error_message("Kaydetme Hatası", f"Dosya kaydedilirken beklenmedik bir hata oluştu:\n{e}")
+                if not metadata:
+                    self.show_error_message("Kaydetme Hatası", "Dosya verisi alınamadı veya şifresi çözülemedi.")
+                    return
+                vault_name, vault_key = self._active_vault_name, self._vault_key
+                # Dosya parça parça çözülüp diske yazılır; tamamı belleğe alınmaz.
+                # İptal edilirse hedef dosyaya dokunulmaz (yazım .part dosyasına yapılır).
+                saved, cancelled = OperationProgressDialog.run(
+                    self, "Dosya kaydediliyor...",
+                    lambda token: vault_manager.write_decrypted_file(vault_name, vault_key, metadata, target_path, token),
+                    total_bytes=metadata.get('size_bytes') or 0, total_items=1)
+                if cancelled:
+                    return
+                if saved:
+                    QMessageBox.information(self, "Başarılı", f"Dosya başarıyla kaydedildi:\n{target_path}")
+                else:
+                    self.show_error_message("Kaydetme Hatası", "Dosya çözülemedi veya hedefe yazılamadı.")
+
+    def extract_files(self, file_ids: list):
+        """Seçili dosyaları (liste boşsa tüm kasayı) seçilen klasöre paralel çıkarır."""
+        if not self._active_vault_name or not self._vault_key:
+            return
+        target_dir = QFileDialog.getExistingDirectory(self, "Dosyaların Çıkarılacağı Klasörü Seçin")
+        if not target_dir:
+            return
+        vault_name, vault_key = self._active_vault_name, self._vault_key
+        selection = file_ids or None
+        # Toplam boyut ve dosya sayısı extract_files tarafından belirtece eklenir
+        report, cancelled = OperationProgressDialog.run(
+            self, "Dosyalar dışa aktarılıyor...",
+            lambda token: extract_files(vault_name, vault_key, Path(target_dir), selection, progress=token))
+        if report is None:
+            self.show_error_message("Dışa Aktarma Hatası", f"Hedef klasöre yazılamadı:\n{target_dir}")
+            return
+
+        mb = 1024 * 1024
+        msg = (f"{report.succeeded}/{len(report.results)} dosya çıkarıldı "
+               f"({report.total_bytes / mb:.1f} MB, {report.elapsed:.1f} s, {report.bytes_per_second / mb:.1f} MB/s).")
+        failed = report.failed
+        if cancelled:
+            QMessageBox.information(self, "Dışa Aktarma İptal Edildi", "İşlem iptal edildi. " + msg)
+        elif failed:
+            names = [r.target.name if r.target else r.file_id for r in failed[:10]]
+            more = f"\n... ve {len(failed) - 10} dosya daha" if len(failed) > 10 else ""
+            QMessageBox.warning(self, "Dışa Aktarma Sonucu",
+                                msg + "\n\nAşağıdaki dosyalar çıkarılamadı:\n- " + "\n- ".join(names) + more)
+        else:
+            QMessageBox.information(self, "Dışa Aktarma Sonucu", msg)
 
     def show_error_message(self, title: str, message: str):
         QMessageBox.critical(self, title, message)
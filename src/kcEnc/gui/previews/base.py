@@ -0,0 +1,40 @@
+from PyQt6.QtWidgets import QWidget
+
+from ...core.file_stream import DecryptedFileStream
+
+
+class PreviewBackend:
+    """Önizleme arka uçlarının temel sınıfı.
+
+    Arka uçlar ilk kullanımda oluşturulur; widget'ları o anda kurulur ve
+    host (UnlockedVaultWidget) önizleme yığınına eklenir.
+
+    supports_stream True olan arka uçlara dosyanın tamamı yerine bir çözme akışı
+    (core.file_stream.DecryptedFileStream) verilir; büyük dosyalar belleğe alınmaz.
+    """
+    supports_stream = False
+
+    def __init__(self, host: QWidget):
+        self.host = host
+        self.widget = self.create_widget()
+
+    def create_widget(self) -> QWidget:
+        """Önizleme yığınına eklenecek widget'ı oluşturur."""
+        raise NotImplementedError
+
+    def show(self, file_type: str, data: bytes) -> bool:
+        """Veriyi önizler. Veri bu arka uçla gösterilemiyorsa False döndürür."""
+        raise NotImplementedError
+
+    def show_stream(self, file_type: str, stream: DecryptedFileStream) -> bool:
+        """Veriyi bir çözme akışından önizler. Akışın sahipliği arka uca geçer (kapatmak ona düşer)."""
+        with stream:
+            data = stream.read()
+        return self.show(file_type, data)
+
+    def clear(self):
+        """Gösterilen içeriği ve geçici kaynakları temizler."""
+
+    def shutdown(self):
+        """Host kapanırken çağrılır."""
+        self.clear()
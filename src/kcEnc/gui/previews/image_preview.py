@@ -0,0 +1,150 @@
+from typing import List, Optional
+
+from PyQt6.QtWidgets import QLabel, QScrollArea, QApplication
+from PyQt6.QtGui import QPixmap, QPalette, QImage, QImageReader
+from PyQt6.QtCore import Qt, QObject, QThread, QBuffer, QByteArray, QIODevice, QSize, QEvent, pyqtSignal
+
+from .base import PreviewBackend
+from ...core.file_stream import DecryptedFileStream, BufferedFileStream
+from ...core.crypto_utils import InvalidTag
+
+
+class ImageDecodeWorker(QThread):
+    """Resmin şifresini çözüp yalnızca gereken çözünürlükte decode eder (GUI thread'i dışında)."""
+    image_ready = pyqtSignal(int, QImage) # generation, image
+    failed = pyqtSignal(int, str)         # generation, message
+
+    def __init__(self, generation: int, stream: DecryptedFileStream, max_size: QSize, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self._stream = stream
+        self._max_size = max_size
+
+    def run(self):
+        try:
+            with self._stream:
+                data = self._stream.read()
+        except (InvalidTag, OSError) as e:
+            self.failed.emit(self.generation, f"Resim verisi çözülemedi: {e}")
+            return
+
+        buffer = QBuffer()
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        reader = QImageReader(buffer)
+        reader.setAutoTransform(True) # EXIF yönlendirmesi
+        original_size = reader.size()
+        if original_size.isValid() and (original_size.width() > self._max_size.width()
+                                         or original_size.height() > self._max_size.height()):
+            # Decoder (örn. JPEG) doğrudan küçük çözünürlükte çözer; tam boyut hiç belleğe alınmaz
+            reader.setScaledSize(original_size.scaled(self._max_size, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            self.failed.emit(self.generation, f"Resim okunamadı: {reader.errorString()}")
+            return
+        self.image_ready.emit(self.generation, image)
+
+
+class _ResizeFilter(QObject):
+    """İzlenen widget yeniden boyutlandığında verilen fonksiyonu çağırır."""
+
+    def __init__(self, parent: QObject, on_resize):
+        super().__init__(parent)
+        self._on_resize = on_resize
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Resize:
+            self._on_resize()
+        return False
+
+
+class ImagePreviewBackend(PreviewBackend):
+    """Resimleri görünür alana sığacak şekilde ölçekleyerek gösterir.
+
+    Şifre çözme ve decode işçi thread'de yapılır; resim en fazla ekran boyutunda
+    bir ara görüntüye decode edilir. Pencere yeniden boyutlandığında görüntü bu
+    ara görüntüden yeniden ölçeklenir, dosya tekrar çözülmez.
+    """
+    supports_stream = True
+
+    def create_widget(self):
+        self._generation = 0
+        self._workers: List[ImageDecodeWorker] = []
+        self._image: Optional[QImage] = None # Ara görüntü (en fazla ekran çözünürlüğünde)
+
+        # --- Resim Önizleme için QScrollArea ---
+        image_scroll_area = QScrollArea()
+        image_scroll_area.setBackgroundRole(QPalette.ColorRole.Window) # Arkaplanı ayarla
+        image_scroll_area.setWidgetResizable(True) # İçindeki widget'ın boyutlanmasını sağla
+        image_scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter) # İçeriği ortala
+
+        self.image_preview_label = QLabel()
+        self.image_preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        image_scroll_area.setWidget(self.image_preview_label) # QLabel'i ScrollArea'ya ekle
+        image_scroll_area.viewport().installEventFilter(_ResizeFilter(image_scroll_area, self._render))
+        return image_scroll_area
+
+    def show(self, file_type: str, data: bytes) -> bool:
+        return self.show_stream(file_type, BufferedFileStream(data, len(data) or 1))
+
+    def show_stream(self, file_type: str, stream: DecryptedFileStream) -> bool:
+        self.clear()
+        self.image_preview_label.setText("Resim yükleniyor...")
+        worker = ImageDecodeWorker(self._generation, stream, self._decode_size_limit(), self.widget)
+        worker.image_ready.connect(self._on_image_ready)
+        worker.failed.connect(self._on_failed)
+        worker.finished.connect(lambda w=worker: self._on_worker_finished(w))
+        self._workers.append(worker)
+        worker.start()
+        return True
+
+    def _decode_size_limit(self) -> QSize:
+        """Ara görüntü sınırı: ekranın fiziksel çözünürlüğü (pencere bundan büyüyemez)."""
+        screen = self.widget.screen() or QApplication.primaryScreen()
+        size = screen.size() * screen.devicePixelRatio()
+        side = max(size.width(), size.height()) # Döndürülmüş (EXIF) resimler için kare sınır
+        return QSize(side, side)
+
+    def _on_image_ready(self, generation: int, image: QImage):
+        if generation != self._generation:
+            return # Eski (iptal edilmiş) önizlemenin sonucu
+        self._image = image
+        self.image_preview_label.setText("")
+        self._render()
+
+    def _on_failed(self, generation: int, message: str):
+        if generation != self._generation:
+            return
+        print(f"HATA: {message}")
+        self.image_preview_label.setText("")
+        self.host.report_preview_error("Önizleme Hatası", message)
+
+    def _render(self):
+        if self._image is None:
+            return
+        viewport = self.widget.viewport()
+        ratio = viewport.devicePixelRatio()
+        target = viewport.size() * ratio
+        if target.isEmpty():
+            return
+        image = self._image
+        if image.width() > target.width() or image.height() > target.height():
+            image = image.scaled(target, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(ratio)
+        self.image_preview_label.setPixmap(pixmap)
+
+    def _on_worker_finished(self, worker: ImageDecodeWorker):
+        if worker in self._workers:
+            self._workers.remove(worker)
+        worker.deleteLater()
+
+    def clear(self):
+        self._generation += 1 # Süren decode'ların sonuçları yok sayılır
+        self._image = None
+        self.image_preview_label.clear()
+
+    def shutdown(self):
+        self.clear()
+        for worker in list(self._workers):
+            worker.wait()
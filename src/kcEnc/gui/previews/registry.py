@@ -0,0 +1,49 @@
+import importlib
+from typing import Dict, Iterable, NamedTuple, Optional, Type
+
+from .base import PreviewBackend
+
+
+class PreviewBackendSpec(NamedTuple):
+    """Bir önizleme arka ucunun tembel yüklenecek tanımı."""
+    module: str      # Modül yolu (bu pakete göre göreli olabilir, örn. ".video_preview")
+    class_name: str  # Modüldeki PreviewBackend alt sınıfının adı
+
+
+# Uzantı -> arka uç eşlemesi. Modüller yalnızca ilgili türde bir dosya ilk kez
+# önizlendiğinde import edilir (örn. QtMultimedia sadece video açılınca yüklenir).
+_BACKENDS_BY_EXTENSION: Dict[str, PreviewBackendSpec] = {}
+_loaded_classes: Dict[PreviewBackendSpec, Type[PreviewBackend]] = {}
+
+
+def register_preview_backend(extensions: Iterable[str], module: str, class_name: str):
+    """Verilen uzantılar için bir önizleme arka ucu kaydeder (sonraki kayıt öncekini ezer)."""
+    spec = PreviewBackendSpec(module, class_name)
+    for ext in extensions:
+        _BACKENDS_BY_EXTENSION[ext.lower()] = spec
+
+
+def get_backend_spec(file_type: Optional[str]) -> Optional[PreviewBackendSpec]:
+    """Dosya uzantısı için kayıtlı arka ucu döndürür, yoksa None."""
+    if not file_type:
+        return None
+    return _BACKENDS_BY_EXTENSION.get(file_type.lower())
+
+
+def load_backend_class(spec: PreviewBackendSpec) -> Type[PreviewBackend]:
+    """Arka uç modülünü (ilk seferde) import eder ve sınıfını döndürür."""
+    backend_class = _loaded_classes.get(spec)
+    if backend_class is None:
+        module = importlib.import_module(spec.module, package=__package__)
+        backend_class = getattr(module, spec.class_name)
+        _loaded_classes[spec] = backend_class
+    return backend_class
+
+
+# --- Yerleşik arka uçlar --- #
+register_preview_backend([".txt", ".md", ".log", ".py", ".json", ".xml", ".ini", ".yaml", ".csv"],
+                         ".text_preview", "TextPreviewBackend")
+register_preview_backend([".png", ".jpg", ".jpeg", ".gif", ".bmp", ".svg"],
+                         ".image_preview", "ImagePreviewBackend")
+register_preview_backend([".mp4", ".mov", ".avi", ".mkv", ".wmv"], # Sistem codec'lerine bağlı
+                         ".video_preview", "VideoPreviewBackend")
@@ -0,0 +1,279 @@
+import codecs
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPlainTextEdit, QLabel
+from PyQt6.QtGui import QTextCursor, QFontDatabase
+
+from .base import PreviewBackend
+from ...core.file_stream import DecryptedFileStream, BufferedFileStream
+from ...core.crypto_utils import InvalidTag
+from ...core.progress import OperationCancelled
+
+ENCODING_SAMPLE_SIZE = 64 * 1024 # Kodlama tahmini için okunan ön ek
+PAGE_SIZE = 256 * 1024           # Bir seferde çözülüp gösterilen byte miktarı (satır sonuna hizalanır)
+WINDOW_PAGES = 4                 # Aynı anda belgede tutulan en fazla sayfa
+SCROLL_MARGIN_LINES = 50         # Kenara bu kadar satır kala komşu sayfa yüklenir
+
+# (BOM, kodlama): BOM'u olan dosyalarda kodlama kesindir
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+
+def detect_text_encoding(sample: bytes, at_eof: bool) -> Tuple[str, int]:
+    """Dosyanın ön ekinden kodlamayı tahmin eder: (kodlama, içeriğin başladığı byte).
+
+    Sırasıyla BOM, utf-8, cp1254 (Türkçe Windows) ve son çare latin-1 denenir.
+    Örnek dosyanın ortasında bitiyorsa sondaki yarım utf-8 karakteri hata sayılmaz.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=at_eof)
+        return "utf-8", 0
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode("cp1254")
+        return "cp1254", 0
+    except UnicodeDecodeError:
+        return "latin-1", 0
+
+
+class _PagedText:
+    """Çözme akışındaki metni satır sonlarına hizalı sayfalara bölerek okur.
+
+    Sayfa sınırları ilk okunuşta kaydedilir; böylece daha önce görülmüş bir sayfa
+    tekrar (örn. yukarı kaydırırken) bağımsız olarak çözülebilir.
+    """
+
+    def __init__(self, stream: DecryptedFileStream):
+        self.stream = stream
+        sample = stream.read(0, ENCODING_SAMPLE_SIZE)
+        self.encoding, content_start = detect_text_encoding(sample, len(sample) >= stream.size)
+        self._newline = "\n".encode(self.encoding)
+        self._starts: List[int] = [content_start] # Sayfa k'nın başladığı byte
+        self._ends: Dict[int, int] = {}
+
+    def has_page(self, index: int) -> bool:
+        # Boş dosyada da 0. sayfa (boş metin) vardır
+        return 0 <= index < len(self._starts) and (index == 0 or self._starts[index] < self.stream.size)
+
+    def read_page(self, index: int) -> Optional[str]:
+        """Sayfa metnini döndürür; sayfa yoksa None."""
+        if not self.has_page(index):
+            return None
+        start = self._starts[index]
+        end = self._ends.get(index)
+        if end is None:
+            data = self.stream.read(start, PAGE_SIZE)
+            end = start + self._aligned_length(data, start + len(data) >= self.stream.size)
+            self._ends[index] = end
+            if index + 1 == len(self._starts):
+                self._starts.append(end)
+            data = data[:end - start]
+        else:
+            data = self.stream.read(start, end - start)
+        text = data.decode(self.encoding, errors="replace")
+        # QPlainTextEdit her satır sonunu tek blok ayırıcı olarak saymalı
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if end < self.stream.size and not text.endswith("\n"):
+            text += "\n" # Sayfadan uzun satır bölündü: sayfalar hep tam satırlarla bitsin
+        return text
+
+    def _aligned_length(self, data: bytes, at_eof: bool) -> int:
+        if at_eof:
+            return len(data)
+        newline_at = data.rfind(self._newline)
+        if newline_at >= 0:
+            return newline_at + len(self._newline)
+        # Satır sonu yok (çok uzun satır): karakterin ortasından bölme
+        length = len(data)
+        if self.encoding == "utf-8":
+            back = 0
+            while back < 3 and length - back > 0 and 0x80 <= data[length - back - 1] < 0xC0:
+                back += 1
+            if length - back > 0 and data[length - back - 1] >= 0xC0:
+                back += 1 # Yarım kalan çok byte'lı karakterin başlangıcı da sonraki sayfaya
+            length -= back
+        elif self.encoding.startswith("utf-16"):
+            length -= length % 2
+        return length or len(data)
+
+    def byte_range(self, first: int, last: int) -> Tuple[int, int]:
+        return self._starts[first], self._ends.get(last, self._starts[first])
+
+
+class PagedTextView(QWidget):
+    """Büyük metin dosyaları için salt okunur, sayfalı görüntüleyici.
+
+    Belgede yalnızca görünen konumun çevresindeki en fazla WINDOW_PAGES sayfa tutulur;
+    kullanıcı kaydırdıkça komşu sayfalar çözülüp eklenir, uzaktakiler atılır.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.text_edit = QPlainTextEdit()
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap) # Kaydırma değeri = satır
+        self.text_edit.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.status_label = QLabel("")
+        layout.addWidget(self.text_edit)
+        layout.addWidget(self.status_label)
+
+        self._pages: Optional[_PagedText] = None
+        self._first = 0                     # Belgedeki ilk sayfa
+        self._line_counts: List[int] = []   # Belgedeki sayfaların satır sayıları
+        self._adjusting = False
+        self._error: Optional[str] = None   # Bir sayfa çözülemediyse sayfalama durur
+        self.text_edit.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    def set_stream(self, stream: DecryptedFileStream):
+        self.clear()
+        self._pages = _PagedText(stream)
+        self._append_page(self._pages.read_page(0)) # İlk sayfanın hatası önizleme hatası olarak gösterilir
+        self._fill_viewport()
+        self._update_status()
+
+    def clear(self):
+        if self._pages is not None:
+            self._pages.stream.close()
+            self._pages = None
+        self._first = 0
+        self._line_counts = []
+        self._error = None
+        self.text_edit.clear()
+        self.status_label.setText("")
+
+    # --- Sayfa penceresi --- #
+
+    @property
+    def _last(self) -> int:
+        return self._first + len(self._line_counts) - 1
+
+    def _append_page(self, text: str):
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+        self._line_counts.append(text.count("\n"))
+
+    def _prepend_page(self, text: str) -> int:
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.insertText(text)
+        lines = text.count("\n")
+        self._line_counts.insert(0, lines)
+        self._first -= 1
+        return lines
+
+    def _drop_first_page(self) -> int:
+        lines = self._line_counts.pop(0)
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.movePosition(QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor, lines)
+        cursor.removeSelectedText()
+        self._first += 1
+        return lines
+
+    def _drop_last_page(self):
+        self._line_counts.pop()
+        # Dosya sonu dışındaki sayfalar satır sonuyla biter: son sayfa bu bloktan başlar
+        document = self.text_edit.document()
+        cursor = QTextCursor(document)
+        cursor.setPosition(document.findBlockByNumber(sum(self._line_counts)).position())
+        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+
+    def _fill_viewport(self):
+        """Metin görünüm alanını doldurmuyorsa (kısa satırlı küçük sayfalar) sonraki sayfaları yükle."""
+        scroll_bar = self.text_edit.verticalScrollBar()
+        while (scroll_bar.maximum() <= SCROLL_MARGIN_LINES and len(self._line_counts) < WINDOW_PAGES
+               and self._load_next()):
+            pass
+
+    def _read_page(self, index: int) -> Optional[str]:
+        """Sayfayı çözer; sayfa yoksa veya çözülemiyorsa None döndürür.
+
+        Kaydırma sırasında (Qt slot'unda) çağrılır: bozuk veri veya okuma hatası
+        yukarı taşınmaz, sayfalama durdurulur ve durum satırında gösterilir.
+        """
+        if self._pages is None or self._error is not None:
+            return None
+        try:
+            return self._pages.read_page(index)
+        except (InvalidTag, OperationCancelled, OSError) as e:
+            print(f"HATA: Metin önizlemesinin {index}. sayfası çözülemedi: {type(e).__name__} {e}")
+            self._error = "Bütünlük hatası: dosyanın bu bölümü çözülemedi (bozuk veri veya okuma hatası)."
+            return None
+
+    def _load_next(self) -> bool:
+        text = self._read_page(self._last + 1)
+        if text is None:
+            return False
+        self._append_page(text)
+        return True
+
+    def _on_scrolled(self, value: int):
+        if self._adjusting or self._pages is None or self._error is not None:
+            return
+        scroll_bar = self.text_edit.verticalScrollBar()
+        self._adjusting = True
+        try:
+            if value >= scroll_bar.maximum() - SCROLL_MARGIN_LINES and self._load_next():
+                if len(self._line_counts) > WINDOW_PAGES:
+                    removed = self._drop_first_page()
+                    scroll_bar.setValue(max(0, value - removed))
+            elif value <= SCROLL_MARGIN_LINES and self._first > 0:
+                text = self._read_page(self._first - 1)
+                if text is not None:
+                    added = self._prepend_page(text)
+                    if len(self._line_counts) > WINDOW_PAGES:
+                        self._drop_last_page()
+                    scroll_bar.setValue(value + added)
+        finally:
+            self._adjusting = False
+        self._update_status()
+
+    def _update_status(self):
+        if self._pages is None:
+            return
+        if self._error is not None:
+            self.status_label.setText(self._error)
+            return
+        start, end = self._pages.byte_range(self._first, self._last)
+        size = self._pages.stream.size
+        self.status_label.setText(
+            f"{self._pages.encoding} · gösterilen bölüm: {_format_offset(start)}–{_format_offset(end)} / {_format_offset(size)}")
+
+
+def _format_offset(value: int) -> str:
+    if value < 1024 * 1024:
+        return f"{value / 1024:.0f} KB"
+    return f"{value / (1024 * 1024):.1f} MB"
+
+
+class TextPreviewBackend(PreviewBackend):
+    """Metin dosyaları için salt okunur, sayfalı önizleme.
+
+    Dosya çözme akışı olarak alınır; yalnızca görünen bölümün çevresindeki
+    parçalar çözülür ve kodlama tahmini için sadece bir ön ek örneklenir.
+    """
+    supports_stream = True
+
+    def create_widget(self):
+        return PagedTextView()
+
+    def show(self, file_type: str, data: bytes) -> bool:
+        return self.show_stream(file_type, BufferedFileStream(data, PAGE_SIZE))
+
+    def show_stream(self, file_type: str, stream: DecryptedFileStream) -> bool:
+        self.widget.set_stream(stream)
+        return True
+
+    def clear(self):
+        self.widget.clear()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+from pathlib import Path
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtMultimedia import QMediaPlayer
+from PyQt6.QtMultimediaWidgets import QVideoWidget
+
+from .base import PreviewBackend
+
+
+class VideoPreviewBackend(PreviewBackend):
+    """Videoları geçici bir dosya üzerinden QMediaPlayer ile oynatır.
+
+    QtMultimedia bu modülle birlikte, yani ilk video önizlemesinde yüklenir.
+    """
+
+    def __init__(self, host):
+        self._temp_file_path: Path | None = None # Video için geçici dosya
+        super().__init__(host)
+        self._media_player = QMediaPlayer()
+        self._media_player.setVideoOutput(self.widget)
+        self._media_player.errorOccurred.connect(self.handle_media_error)
+
+    def create_widget(self):
+        return QVideoWidget()
+
+    def show(self, file_type: str, data: bytes) -> bool:
+        # Önceki videoyu durdur ve geçici dosyasını sil
+        self.clear()
+        # Geçici dosyaya yaz
+        fd, temp_path_str = tempfile.mkstemp(suffix=file_type)
+        self._temp_file_path = Path(temp_path_str)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        print(f"Video geçici dosyaya yazıldı: {self._temp_file_path}")
+
+        self._media_player.setSource(QUrl.fromLocalFile(str(self._temp_file_path)))
+        self._media_player.play()
+        return True
+
+    def handle_media_error(self, error, error_string):
+        print(f"Medya Hatası: {error} - {error_string}")
+        self._delete_temp_file() # Hata durumunda geçici dosyayı sil
+        self.host.report_preview_error("Video Oynatma Hatası",
+                                       f"Video oynatılamadı:\n{error_string}\nSisteminizde gerekli codec'lerin kurulu olduğundan emin olun.")
+
+    def clear(self):
+        # Medya oynatıcıyı durdur ve kaynağı temizle
+        self._media_player.stop()
+        self._media_player.setSource(QUrl())
+        self._delete_temp_file()
+
+    def _delete_temp_file(self):
+        """Varsa geçici video dosyasını siler."""
+        if self._temp_file_path and self._temp_file_path.exists():
+            try:
+                self._temp_file_path.unlink()
+                print(f"Geçici dosya silindi: {self._temp_file_path}")
+                self._temp_file_path = None
+            except OSError as e:
+                print(f"HATA: Geçici dosya silinemedi: {self._temp_file_path}\n{e}")
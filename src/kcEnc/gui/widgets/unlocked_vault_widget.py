@@ -1,20 +1,34 @@
+import bisect
 import sys
-import os
-import tempfile
-from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QAbstractItemView,
-    QTableWidgetItem, QLabel, QTextEdit, QSplitter, QStackedWidget, QMessageBox,
-    QFileDialog, QApplication, QHeaderView, QScrollArea, QSizePolicy
+    QTableWidgetItem, QLabel, QSplitter, QStackedWidget, QMessageBox,
+    QApplication, QHeaderView
 )
-from PyQt6.QtGui import QPixmap, QMovie, QPalette
-from PyQt6.QtCore import Qt, pyqtSignal, QByteArray, QUrl, QTimer
-from PyQt6.QtMultimedia import QMediaPlayer
-from PyQt6.QtMultimediaWidgets import QVideoWidget
+from PyQt6.QtCore import Qt, pyqtSignal, QItemSelection, QItemSelectionModel
 
 from ...core import vault_manager
 from ...core import database_manager # file metadata almak için
+from ..previews import registry as preview_registry
+from ..previews.base import PreviewBackend
+from ...core.file_stream import DecryptedFileStream
+from ...core.file_listing import FileListing
+from ...core.change_events import VaultChange, add_change_listener, remove_change_listener
+
+# Bundan fazla satır eklenecekse liste tek tek ekleme yerine baştan kurulur
+INCREMENTAL_INSERT_LIMIT = 2000
+
+
+def _contiguous_runs(rows: List[int]) -> List[Tuple[int, int]]:
+    """Satır indekslerini artan sırada (başlangıç, uzunluk) bloklarına ayırır."""
+    runs = []
+    for row in sorted(set(rows)):
+        if runs and runs[-1][0] + runs[-1][1] == row:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((row, 1))
+    return runs
 
 class UnlockedVaultWidget(QWidget):
     request_lock = pyqtSignal()
@@ -23,18 +37,25 @@ class UnlockedVaultWidget(QWidget):
     request_add_file = pyqtSignal()
     request_view_file = pyqtSignal(str) # file_id
     request_save_as = pyqtSignal(str) # file_id
-    request_delete_file = pyqtSignal(str) # file_id
-
-    # Desteklenen dosya türleri (önizleme için)
-    TEXT_EXTENSIONS = [".txt", ".md", ".log", ".py", ".json", ".xml", ".ini", ".yaml", ".csv"]
-    IMAGE_EXTENSIONS = [".png", ".jpg", ".jpeg", ".gif", ".bmp", ".svg"]
-    VIDEO_EXTENSIONS = [".mp4", ".mov", ".avi", ".mkv", ".wmv"] # Sistem codec'lerine bağlı
+    request_extract_files = pyqtSignal(list) # file_id listesi (boşsa tüm kasa)
+    request_delete_files = pyqtSignal(list) # file_id listesi (onay MainWindow'da sorulur)
+    # Çekirdek değişiklik bildirimleri herhangi bir thread'den gelebilir; kuyrukla GUI thread'ine aktarılır
+    _vault_changed = pyqtSignal(object) # VaultChange
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._current_vault_name: str | None = None
-        self._media_player = None
-        self._temp_file_path: Path | None = None # Video için geçici dosya
+        # Önizleme arka uçları (previews.registry) ilk kullanımda oluşturulur
+        self._preview_backends: Dict[preview_registry.PreviewBackendSpec, PreviewBackend] = {}
+        self._preview_file_id: str | None = None
+        # Satır sırasıyla sıralama anahtarları (file_sort_key) ve ID -> anahtar: satır
+        # yeri ikili aramayla bulunur, değişiklikler tüm listeyi yeniden kurmadan uygulanır
+        self._row_keys: List[tuple] = []
+        self._sort_keys_by_id: Dict[str, tuple] = {}
+        self._vault_changed.connect(self._on_vault_changed)
+        change_listener = self._vault_changed.emit
+        add_change_listener(change_listener)
+        self.destroyed.connect(lambda: remove_change_listener(change_listener))
 
         self.main_layout = QVBoxLayout(self)
         self.splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -48,6 +69,8 @@ class UnlockedVaultWidget(QWidget):
         self.file_table.setColumnCount(4)
         self.file_table.setHorizontalHeaderLabels(["Dosya Adı", "Tür", "Boyut (bytes)", "Değiştirilme Tarihi"])
         self.file_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        # Ctrl/Shift ile çoklu seçim (toplu silme); görüntüleme tek seçimde etkin
+        self.file_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.file_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.file_table.verticalHeader().setVisible(False)
         self.file_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
@@ -59,18 +82,22 @@ class UnlockedVaultWidget(QWidget):
         self.add_button = QPushButton("Dosya Ekle")
         self.view_button = QPushButton("Görüntüle")
         self.save_as_button = QPushButton("Farklı Kaydet")
+        self.extract_button = QPushButton("Dışa Aktar...")
+        self.extract_button.setToolTip("Seçili dosyaları (seçim yoksa tüm kasayı) bir klasöre çıkar")
         self.delete_button = QPushButton("Sil")
         self.lock_button = QPushButton("Kasayı Kilitle")
 
         self.add_button.clicked.connect(self.request_add_file.emit)
         self.view_button.clicked.connect(self.on_view_clicked)
         self.save_as_button.clicked.connect(self.on_save_as_clicked)
+        self.extract_button.clicked.connect(self.on_extract_clicked)
         self.delete_button.clicked.connect(self.on_delete_clicked)
         self.lock_button.clicked.connect(self.request_lock.emit)
 
         self.button_layout.addWidget(self.add_button)
         self.button_layout.addWidget(self.view_button)
         self.button_layout.addWidget(self.save_as_button)
+        self.button_layout.addWidget(self.extract_button)
         self.button_layout.addWidget(self.delete_button)
         self.button_layout.addStretch()
         self.button_layout.addWidget(self.lock_button)
@@ -82,95 +109,191 @@ class UnlockedVaultWidget(QWidget):
         self.preview_stack = QStackedWidget()
         self.right_layout.addWidget(self.preview_stack)
 
-        # Önizleme widget'ları
+        # Önizleme widget'ları (türe özel olanlar arka uçlarla birlikte sonradan eklenir)
         self.placeholder_label = QLabel("Önizlemek için bir dosya seçin.")
         self.placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.text_preview = QTextEdit()
-        self.text_preview.setReadOnly(True)
-
-        # --- Resim Önizleme için QScrollArea ---
-        self.image_scroll_area = QScrollArea()
-        self.image_scroll_area.setBackgroundRole(QPalette.ColorRole.Window) # Arkaplanı ayarla
-        self.image_scroll_area.setWidgetResizable(True) # İçindeki widget'ın boyutlanmasını sağla
-        self.image_scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter) # İçeriği ortala
-
-        self.image_preview_label = QLabel()
-        self.image_preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        # setScaledContents kaldırıldı, QScrollArea yönetecek
-        self.image_scroll_area.setWidget(self.image_preview_label) # QLabel'i ScrollArea'ya ekle
-        # --- Resim Önizleme Sonu ---
-
-        self.video_preview_widget = QVideoWidget()
         self.unsupported_label = QLabel("Bu dosya türü için uygulama içi önizleme desteklenmiyor.\n'Farklı Kaydet' seçeneğini kullanabilirsiniz.")
         self.unsupported_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.unsupported_label.setWordWrap(True)
         self.loading_label = QLabel("Önizleme yükleniyor...") # Görüntüleme/Çözme sırasında
         self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.preview_stack.addWidget(self.placeholder_label) # index 0
-        self.preview_stack.addWidget(self.text_preview)      # index 1
-        self.preview_stack.addWidget(self.image_scroll_area) # index 2
-        self.preview_stack.addWidget(self.video_preview_widget)# index 3
-        self.preview_stack.addWidget(self.unsupported_label) # index 4
-        self.preview_stack.addWidget(self.loading_label)     # index 5
+        self.preview_stack.addWidget(self.placeholder_label)
+        self.preview_stack.addWidget(self.unsupported_label)
+        self.preview_stack.addWidget(self.loading_label)
 
         self.splitter.addWidget(self.left_widget)
         self.splitter.addWidget(self.right_widget)
         self.splitter.setSizes([400, 400]) # Başlangıç boyutları
 
-        # Medya oynatıcıyı başlat
-        self._init_media_player()
-
         # Başlangıçta butonları devre dışı bırak
         self.update_button_states()
 
-    def _init_media_player(self):
-        self._media_player = QMediaPlayer()
-        self._media_player.setVideoOutput(self.video_preview_widget)
-        self._media_player.errorOccurred.connect(self.handle_media_error)
-
-    def load_files(self, vault_name: str):
+    def load_files(self, vault_name: str, files: FileListing | None = None):
+        """Kasanın listesini gösterir; files verilirse (kilit açılırken önceden okunmuş) veritabanına gidilmez."""
         self._current_vault_name = vault_name
-        self.refresh_file_list()
-        self.preview_stack.setCurrentIndex(0) # Placeholder göster
+        self.file_table.setRowCount(0) # Önceki kasanın seçimi ve kaydırma konumu taşınmasın
+        self.refresh_file_list(files)
+        self.preview_stack.setCurrentWidget(self.placeholder_label)
 
-    def refresh_file_list(self):
+    def refresh_file_list(self, files: FileListing | None = None):
+        """Listeyi veritabanından (veya verilen files listesinden) baştan kurar (seçim ve kaydırma konumu korunur)."""
         if not self._current_vault_name:
             return
+        selected_ids = set(self.get_selected_file_ids())
+        anchor = self._capture_scroll_anchor()
         self.file_table.setRowCount(0) # Listeyi temizle
         self.file_table.clearContents()
+        self._row_keys = []
+        self._sort_keys_by_id = {}
         try:
-            files = vault_manager.list_files_in_vault(self._current_vault_name)
+            if files is None:
+                files = vault_manager.list_files_in_vault(self._current_vault_name)
             self.file_table.setRowCount(len(files))
             for row, file_info in enumerate(files):
-                file_id = file_info['id']
-                item_name = QTableWidgetItem(file_info['original_filename'])
-                item_name.setData(Qt.ItemDataRole.UserRole, file_id) # ID'yi sakla
-
-                item_type = QTableWidgetItem(file_info.get('file_type', 'Bilinmiyor'))
-                item_size = QTableWidgetItem(str(file_info.get('size_bytes', '')))
-                # Tarihi daha okunabilir formatta gösterelim
-                mod_time = file_info.get('modified_at')
-                mod_time_str = mod_time.strftime("%Y-%m-%d %H:%M:%S") if mod_time else ""
-                item_modified = QTableWidgetItem(mod_time_str)
-
-                self.file_table.setItem(row, 0, item_name)
-                self.file_table.setItem(row, 1, item_type)
-                self.file_table.setItem(row, 2, item_size)
-                self.file_table.setItem(row, 3, item_modified)
+                self._set_row_items(row, file_info)
+                key = database_manager.file_sort_key(file_info)
+                self._row_keys.append(key)
+                self._sort_keys_by_id[file_info['id']] = key
         except Exception as e:
              print(f"HATA: Dosya listesi yüklenemedi ({self._current_vault_name}): {e}")
              # Kullanıcıya hata mesajı gösterilebilir
              QMessageBox.warning(self, "Liste Hatası", f"Dosya listesi yüklenirken bir hata oluştu:\n{e}")
+        self._select_rows(self._rows_of(selected_ids))
+        self._restore_scroll_anchor(anchor)
         self.update_button_states()
 
+    def _set_row_items(self, row: int, file_info):
+        # file_info: FileListing satırı (FileEntry) veya get_files_by_ids kaydı (dict)
+        item_name = QTableWidgetItem(file_info['original_filename'])
+        item_name.setData(Qt.ItemDataRole.UserRole, file_info['id']) # ID'yi sakla
+
+        item_type = QTableWidgetItem(file_info.get('file_type', 'Bilinmiyor'))
+        item_size = QTableWidgetItem(str(file_info.get('size_bytes', '')))
+        # Tarihi daha okunabilir formatta gösterelim
+        mod_time = file_info.get('modified_at')
+        mod_time_str = mod_time.strftime("%Y-%m-%d %H:%M:%S") if mod_time else ""
+        item_modified = QTableWidgetItem(mod_time_str)
+
+        self.file_table.setItem(row, 0, item_name)
+        self.file_table.setItem(row, 1, item_type)
+        self.file_table.setItem(row, 2, item_size)
+        self.file_table.setItem(row, 3, item_modified)
+
+    def _on_vault_changed(self, change: VaultChange):
+        """Çekirdekten gelen değişikliği yalnızca ilgili satırlara uygular."""
+        if change.vault_name != self._current_vault_name:
+            return
+        # Aynı toplu bildirimde hem güncellenip hem silinen kayıt yalnızca silinir
+        deleted_ids = set(change.deleted)
+        updated_ids = [file_id for file_id in change.updated if file_id not in deleted_ids]
+        # Güncellenen satırın adı (dolayısıyla yeri) değişmiş olabilir: çıkar ve yeniden ekle
+        removed_ids = [file_id for file_id in dict.fromkeys((*change.deleted, *updated_ids))
+                       if file_id in self._sort_keys_by_id]
+        added_ids = [*change.inserted, *updated_ids]
+        if len(added_ids) > INCREMENTAL_INSERT_LIMIT:
+            self.refresh_file_list() # Çok sayıda tek tek ekleme, baştan kurmaktan yavaş
+            return
+        added = database_manager.get_files_by_ids(self._current_vault_name, added_ids) if added_ids else []
+
+        selection_model = self.file_table.selectionModel()
+        reselect_ids = set(updated_ids) & set(self.get_selected_file_ids())
+        anchor = self._capture_scroll_anchor()
+        # Ara durumlarda seçim sinyali önizlemeyi temizlemesin; sonunda bir kez güncellenir
+        selection_model.blockSignals(True)
+        try:
+            self._remove_rows(self._rows_of(removed_ids))
+            for file_id in removed_ids:
+                del self._sort_keys_by_id[file_id]
+            for file_info in sorted(added, key=database_manager.file_sort_key):
+                if file_info['id'] in self._sort_keys_by_id:
+                    continue # Bu süreçte zaten eklenmiş (yinelenen bildirim)
+                key = database_manager.file_sort_key(file_info)
+                row = bisect.bisect_left(self._row_keys, key)
+                self.file_table.insertRow(row)
+                self._set_row_items(row, file_info)
+                self._row_keys.insert(row, key)
+                self._sort_keys_by_id[file_info['id']] = key
+            self._select_rows(self._rows_of(reselect_ids), clear=False)
+        finally:
+            selection_model.blockSignals(False)
+        self.file_table.viewport().update()
+        self._restore_scroll_anchor(anchor)
+        if self._preview_file_id in deleted_ids:
+            self.clear_preview()
+        self.update_button_states()
+
+    def _rows_of(self, file_ids) -> List[int]:
+        rows = []
+        for file_id in file_ids:
+            key = self._sort_keys_by_id.get(file_id)
+            if key is not None:
+                rows.append(bisect.bisect_left(self._row_keys, key))
+        return rows
+
+    def _remove_rows(self, rows: List[int]):
+        """Satırları ardışık bloklar halinde sondan başa siler (tek tek removeRow yerine)."""
+        model = self.file_table.model()
+        for start, count in reversed(_contiguous_runs(rows)):
+            model.removeRows(start, count)
+            del self._row_keys[start:start + count]
+
+    def _select_rows(self, rows: List[int], clear: bool = True):
+        """Satırları ardışık aralıklar halinde tek bir seçim işlemiyle seçer."""
+        selection = QItemSelection()
+        model = self.file_table.model()
+        last_column = self.file_table.columnCount() - 1
+        for start, count in _contiguous_runs(rows):
+            selection.select(model.index(start, 0), model.index(start + count - 1, last_column))
+        flags = QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+        if clear:
+            flags |= QItemSelectionModel.SelectionFlag.Clear
+        self.file_table.selectionModel().select(selection, flags)
+
+    def _capture_scroll_anchor(self):
+        """Görünen ilk satırın ID'si ve kaydırma değeri (satır eklenip silinince aynı yerde kalmak için)."""
+        top_row = self.file_table.rowAt(0)
+        item = self.file_table.item(top_row, 0) if top_row >= 0 else None
+        return (item.data(Qt.ItemDataRole.UserRole) if item else None,
+                self.file_table.verticalScrollBar().value())
+
+    def _restore_scroll_anchor(self, anchor):
+        file_id, scroll_value = anchor
+        rows = self._rows_of([file_id]) if file_id else []
+        if rows and scroll_value > 0:
+            self.file_table.scrollToItem(self.file_table.item(rows[0], 0), QAbstractItemView.ScrollHint.PositionAtTop)
+        else:
+            self.file_table.verticalScrollBar().setValue(scroll_value)
+
+    def get_selected_file_ids(self) -> List[str]:
+        """Seçili satırların dosya ID'leri (tablo sırasıyla)."""
+        # selectedItems() her hücre için item döndürür; büyük seçimlerde satır indeksleri yeterli
+        rows = sorted(index.row() for index in self.file_table.selectionModel().selectedRows(0))
+        file_ids = []
+        for row in rows:
+            item = self.file_table.item(row, 0)
+            if item:
+                file_ids.append(item.data(Qt.ItemDataRole.UserRole))
+        return file_ids
+
     def get_selected_file_id(self) -> Optional[str]:
-        selected_items = self.file_table.selectedItems()
-        if selected_items:
+        """Tam olarak bir satır seçiliyse onun ID'si, aksi halde None."""
+        selected_rows = self.file_table.selectionModel().selectedRows(0)
+        if len(selected_rows) == 1:
             # İlk sütundaki item'ın UserRole'undan ID'yi al
-            return selected_items[0].data(Qt.ItemDataRole.UserRole)
+            item = self.file_table.item(selected_rows[0].row(), 0)
+            return item.data(Qt.ItemDataRole.UserRole) if item else None
         return None
 
+    def select_file(self, file_id: str) -> bool:
+        """ID'si verilen dosyanın satırını seçer ve görünür yapar."""
+        rows = self._rows_of([file_id])
+        if not rows:
+            return False
+        self.file_table.selectRow(rows[0])
+        self.file_table.scrollToItem(self.file_table.item(rows[0], 0))
+        return True
+
     def on_file_selection_changed(self):
         self.update_button_states()
         # Seçim değiştiğinde önizlemeyi temizle veya yenile?
@@ -178,22 +301,18 @@ class UnlockedVaultWidget(QWidget):
         self.clear_preview()
 
     def update_button_states(self):
-        has_selection = self.get_selected_file_id() is not None
-        self.view_button.setEnabled(has_selection)
-        self.save_as_button.setEnabled(has_selection)
-        self.delete_button.setEnabled(has_selection)
+        has_single_selection = self.get_selected_file_id() is not None
+        self.view_button.setEnabled(has_single_selection)
+        self.save_as_button.setEnabled(has_single_selection)
+        self.delete_button.setEnabled(self.file_table.selectionModel().hasSelection())
+        self.extract_button.setEnabled(self.file_table.rowCount() > 0)
 
     def clear_preview(self):
-        # Medya oynatıcıyı durdur ve kaynağı temizle
-        if self._media_player:
-            self._media_player.stop()
-            self._media_player.setSource(QUrl())
-        # Geçici dosyayı sil
-        self._delete_temp_file()
-        # Önizleme alanlarını temizle
-        self.text_preview.clear()
-        self.image_preview_label.clear()
-        self.preview_stack.setCurrentIndex(0) # Placeholder
+        self._preview_file_id = None
+        # Oluşturulmuş arka uçları temizle (video durur, geçici dosya silinir)
+        for backend in self._preview_backends.values():
+            backend.clear()
+        self.preview_stack.setCurrentWidget(self.placeholder_label)
 
     def on_view_clicked(self):
         file_id = self.get_selected_file_id()
@@ -205,16 +324,13 @@ class UnlockedVaultWidget(QWidget):
         if file_id:
             self.request_save_as.emit(file_id)
 
+    def on_extract_clicked(self):
+        self.request_extract_files.emit(self.get_selected_file_ids())
+
     def on_delete_clicked(self):
-        file_id = self.get_selected_file_id()
-        if file_id:
-            reply = QMessageBox.question(self,
-                                         "Dosyayı Sil",
-                                         f"'{self.file_table.selectedItems()[0].text()}' dosyasını kalıcı olarak silmek istediğinizden emin misiniz?",
-                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                                         QMessageBox.StandardButton.No)
-            if reply == QMessageBox.StandardButton.Yes:
-                self.request_delete_file.emit(file_id)
+        file_ids = self.get_selected_file_ids()
+        if file_ids:
+            self.request_delete_files.emit(file_ids)
 
     def on_item_double_clicked(self, item: QTableWidgetItem):
          # Satırın ilk hücresindeki item'dan ID almamız lazım
@@ -224,90 +340,75 @@ class UnlockedVaultWidget(QWidget):
              if file_id:
                  self.request_view_file.emit(file_id)
 
+    def _get_preview_backend(self, spec: preview_registry.PreviewBackendSpec) -> PreviewBackend:
+        """Arka ucu ilk kullanımda import edip oluşturur ve widget'ını yığına ekler."""
+        backend = self._preview_backends.get(spec)
+        if backend is None:
+            backend_class = preview_registry.load_backend_class(spec)
+            backend = backend_class(self)
+            self.preview_stack.addWidget(backend.widget)
+            self._preview_backends[spec] = backend
+        return backend
+
+    def preview_supports_stream(self, file_type: Optional[str]) -> bool:
+        """Bu tür için önizleme arka ucu tüm veri yerine bir çözme akışı kabul ediyor mu?"""
+        spec = preview_registry.get_backend_spec(file_type)
+        return spec is not None and preview_registry.load_backend_class(spec).supports_stream
+
     def show_preview(self, file_id: str, decrypted_data: bytes):
         """MainWindow'dan gelen çözülmüş veri ile önizlemeyi gösterir."""
-        self.preview_stack.setCurrentIndex(5) # Loading göster
+        self._show_in_backend(file_id, lambda backend, file_type: backend.show(file_type, decrypted_data))
+
+    def show_preview_stream(self, file_id: str, stream: DecryptedFileStream):
+        """Önizlemeyi bir çözme akışından gösterir; akışın sahipliği önizlemeye geçer."""
+        consumed = []
+        def show(backend, file_type):
+            consumed.append(True)
+            return backend.show_stream(file_type, stream)
+        try:
+            self._show_in_backend(file_id, show)
+        finally:
+            if not consumed:
+                stream.close() # Arka uca hiç ulaşmadı
+
+    def _show_in_backend(self, file_id: str, show_func):
+        self.preview_stack.setCurrentWidget(self.loading_label)
         QApplication.processEvents() # Arayüzün güncellenmesini sağla
 
         metadata = database_manager.get_file_metadata(self._current_vault_name, file_id)
         if not metadata:
-            self.preview_stack.setCurrentIndex(4) # Unsupported (hata durumu)
+            self.preview_stack.setCurrentWidget(self.unsupported_label) # Hata durumu
             return
 
-        file_type = metadata.get('file_type', '').lower()
+        file_type = (metadata.get('file_type') or '').lower()
+
+        # Önceki önizlemeyi durdur (video, geçici dosya vb.)
+        for backend in self._preview_backends.values():
+            backend.clear()
 
-        # Medya oynatıcıyı durdur ve önceki geçici dosyayı sil
-        if self._media_player: self._media_player.stop()
-        self._delete_temp_file()
+        self._preview_file_id = file_id
+        spec = preview_registry.get_backend_spec(file_type)
+        if spec is None:
+            self.preview_stack.setCurrentWidget(self.unsupported_label)
+            return
 
         try:
-            if file_type in self.TEXT_EXTENSIONS:
-                # Kodlamayı tahmin etmeye çalış (basitçe utf-8 dene)
-                try:
-                    text = decrypted_data.decode('utf-8')
-                except UnicodeDecodeError:
-                    try:
-                       # Windows varsayılanı
-                       text = decrypted_data.decode('cp1254') # Türkçe için
-                    except UnicodeDecodeError:
-                       text = decrypted_data.decode('latin-1', errors='replace') # Son çare
-                self.text_preview.setPlainText(text)
-                self.preview_stack.setCurrentIndex(1)
-            elif file_type in self.IMAGE_EXTENSIONS:
-                pixmap = QPixmap()
-                if pixmap.loadFromData(decrypted_data):
-                    # ---- Ölçekleme Mantığı ----
-                    # ScrollArea'nın viewport boyutunu al
-                    viewport_size = self.image_scroll_area.viewport().size()
-                    # Pixmap'i viewport'a sığacak şekilde ölçekle (en/boy oranını koru)
-                    scaled_pixmap = pixmap.scaled(viewport_size,
-                                                  Qt.AspectRatioMode.KeepAspectRatio,
-                                                  Qt.TransformationMode.SmoothTransformation)
-                    # Ölçeklenmiş pixmap'i QLabel'e yükle
-                    self.image_preview_label.setPixmap(scaled_pixmap)
-                    # ---- Ölçekleme Sonu ----
-                    self.preview_stack.setCurrentIndex(2)
-                else:
-                    print("HATA: Resim verisi QPixmap ile yüklenemedi.")
-                    self.preview_stack.setCurrentIndex(4) # Unsupported
-            elif file_type in self.VIDEO_EXTENSIONS:
-                # Geçici dosyaya yaz
-                fd, temp_path_str = tempfile.mkstemp(suffix=file_type)
-                self._temp_file_path = Path(temp_path_str)
-                os.write(fd, decrypted_data)
-                os.close(fd)
-                print(f"Video geçici dosyaya yazıldı: {self._temp_file_path}")
-
-                self._media_player.setSource(QUrl.fromLocalFile(str(self._temp_file_path)))
-                self.preview_stack.setCurrentIndex(3) # Video widget
-                self._media_player.play()
+            backend = self._get_preview_backend(spec)
+            if show_func(backend, file_type):
+                self.preview_stack.setCurrentWidget(backend.widget)
             else:
-                self.preview_stack.setCurrentIndex(4) # Unsupported
-
+                self.preview_stack.setCurrentWidget(self.unsupported_label)
         except Exception as e:
             print(f"HATA: Önizleme oluşturulurken hata oluştu ({file_type}): {e}")
-            self.preview_stack.setCurrentIndex(4) # Unsupported
-            # Kullanıcıya hata göster
-            QMessageBox.warning(self, "Önizleme Hatası", f"Dosya önizlemesi oluşturulurken bir hata oluştu:\n{e}")
-
-    def handle_media_error(self, error, error_string):
-        print(f"Medya Hatası: {error} - {error_string}")
-        QMessageBox.warning(self, "Video Oynatma Hatası",
-                          f"Video oynatılamadı:\n{error_string}\nSisteminizde gerekli codec'lerin kurulu olduğundan emin olun.")
-        self.preview_stack.setCurrentIndex(4) # Unsupported göster
-        self._delete_temp_file() # Hata durumunda geçici dosyayı sil
-
-    def _delete_temp_file(self):
-        """Varsa geçici video dosyasını siler."""
-        if self._temp_file_path and self._temp_file_path.exists():
-            try:
-                self._temp_file_path.unlink()
-                print(f"Geçici dosya silindi: {self._temp_file_path}")
-                self._temp_file_path = None
-            except OSError as e:
-                print(f"HATA: Geçici dosya silinemedi: {self._temp_file_path}\n{e}")
+            self.report_preview_error("Önizleme Hatası", f"Dosya önizlemesi oluşturulurken bir hata oluştu:\n{e}")
+
+    def report_preview_error(self, title: str, message: str):
+        """Arka uçlardan gelen hataları gösterir ve desteklenmiyor görünümüne geçer."""
+        self.preview_stack.setCurrentWidget(self.unsupported_label)
+        QMessageBox.warning(self, title, message)
 
     def closeEvent(self, event):
-        """Widget kapanırken geçici dosyayı sil."""
-        self._delete_temp_file()
-        super().closeEvent(event) 
\ No newline at end of file
+        """Widget kapanırken arka uçları kapat (geçici dosyalar silinir)."""
+        for backend in self._preview_backends.values():
+            backend.shutdown()
+        super().closeEvent(event)
@@ -4,7 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSignal, Qt
 
-from ...core import vault_manager
+from ...core import vault_registry
 
 class VaultListWidget(QWidget):
     request_unlock = pyqtSignal(str) # vault_name
@@ -36,13 +36,19 @@ class VaultListWidget(QWidget):
 
         self.refresh_vault_list()
 
-    def refresh_vault_list(self):
+    def refresh_vault_list(self, unlocked_names=()):
+        """Kasa listesini yeniler; unlocked_names içindeki kasalar 'açık' olarak işaretlenir."""
         self.list_widget.clear()
         try:
-            vaults = vault_manager.list_vaults()
+            # İndeksten okunur: değişmeyen kasalar için DB açılmaz
+            vaults = vault_registry.get_vault_summaries()
             if vaults:
-                for vault_name in vaults:
-                    item = QListWidgetItem(vault_name)
+                for summary in vaults:
+                    text = self._format_summary(summary)
+                    if summary["name"] in unlocked_names:
+                        text += "  (açık)"
+                    item = QListWidgetItem(text)
+                    item.setData(Qt.ItemDataRole.UserRole, summary["name"]) # Kasa adını sakla
                     self.list_widget.addItem(item)
                 self.list_widget.setCurrentRow(0) # İlk öğeyi seçili yap
                 self.unlock_button.setEnabled(True)
@@ -55,15 +61,35 @@ class VaultListWidget(QWidget):
             self.list_widget.addItem("Kasa listesi alınırken hata oluştu.")
             self.unlock_button.setEnabled(False)
 
+    @staticmethod
+    def _format_summary(summary: dict) -> str:
+        """Kasa adı ve özet istatistiklerini tek satırda gösterir."""
+        if summary.get("file_count") is None:
+            return summary["name"]
+        size_text = VaultListWidget._format_size(summary.get("total_size") or 0)
+        text = f"{summary['name']}  —  {summary['file_count']} dosya, {size_text}"
+        if summary.get("last_modified"):
+            text += f", son değişiklik: {summary['last_modified']}"
+        return text
+
+    @staticmethod
+    def _format_size(size_bytes: int) -> str:
+        size = float(size_bytes)
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} TB"
+
     def on_unlock_clicked(self):
         selected_item = self.list_widget.currentItem()
         if selected_item:
-            # Ensure the item text is a valid vault name (not the placeholder message)
-            vault_name = selected_item.text()
-            if vault_name != "Henüz kasa oluşturulmadı." and vault_name != "Kasa listesi alınırken hata oluştu.":
+            # Yer tutucu mesajlarda UserRole verisi yoktur
+            vault_name = selected_item.data(Qt.ItemDataRole.UserRole)
+            if vault_name:
                  self.request_unlock.emit(vault_name)
 
     def on_item_double_clicked(self, item: QListWidgetItem):
-         vault_name = item.text()
-         if vault_name != "Henüz kasa oluşturulmadı." and vault_name != "Kasa listesi alınırken hata oluştu.":
+         vault_name = item.data(Qt.ItemDataRole.UserRole)
+         if vault_name:
              self.request_unlock.emit(vault_name) 
\ No newline at end of file
@@ -0,0 +1,550 @@
+"""Büyük kasalar için başsız (offscreen Qt) uçtan uca ölçek testi aracı.
+
+Sentetik kasalar gerçek create_vault/add_file_to_vault yolundan üretilir; senaryolar
+MainWindow ve UnlockedVaultWidget üzerinden çalıştırılıp her biri için duvar saati
+süresi, tepe RSS ve arayüz thread'inin bloke kaldığı süre kaydedilir.
+
+Örnekler:
+    cd src
+    python -m kcEnc.tools.scale_harness generate --home /tmp/kcenc-scale --files 20000 \\
+        --sizes lognormal:32K:1.5 --types txt:50,jpg:10,bin:40
+    python -m kcEnc.tools.scale_harness run --home /tmp/kcenc-scale --repeat 3 --json
+    python -m kcEnc.tools.scale_harness all --files 2000   # geçici dizinde üret + çalıştır
+
+Kasalar --home ile verilen (yoksa geçici) bir HOME altında oluşturulur; kullanıcının
+gerçek kasalarına dokunulmaz.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_VAULT_NAME = "ScaleTest"
+DEFAULT_PASSWORD = "scale-test-password"
+DEFAULT_SIZES = "lognormal:32K:1.5"
+DEFAULT_TYPES = "txt:50,jpg:10,bin:40"
+DEFAULT_SCENARIOS = "unlock,refresh,show_preview_text,show_preview_image,view_text,view_image,view_bin,save_as,add_files"
+
+HEARTBEAT_INTERVAL_MS = 5  # Arayüz thread'i bu aralıkla "nabız" atar
+UI_BLOCK_THRESHOLD_MS = 50 # Bundan uzun nabız boşlukları bloke sayılır
+SCENARIO_TIMEOUT_SECONDS = 300.0
+MAX_IMAGE_SIDE = 8000
+
+_SIZE_SUFFIXES = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+_TEXT_WORDS = ("kasa", "dosya", "şifre", "anahtar", "önizleme", "lorem", "ipsum", "dolor",
+               "sit", "amet", "veri", "satır", "örnek", "çalışma", "ğüşiöç", "test")
+
+
+class HarnessError(Exception):
+    """Kullanıcıya gösterilip çıkılacak hata (geçersiz argüman vb.)."""
+
+
+# --- Dağılımlar --- #
+
+def parse_size(text: str) -> int:
+    """'64K', '2M', '1500' gibi boyutları byte'a çevirir."""
+    text = text.strip().upper()
+    multiplier = _SIZE_SUFFIXES.get(text[-1:], 1)
+    number = text[:-1] if text[-1:] in _SIZE_SUFFIXES else text
+    try:
+        return int(float(number) * multiplier)
+    except ValueError:
+        raise HarnessError(f"Geçersiz boyut: {text}")
+
+
+def make_size_sampler(spec: str, rng: random.Random) -> Callable[[], int]:
+    """Boyut dağılımı: 'fixed:SIZE', 'uniform:MIN:MAX' veya 'lognormal:MEDYAN:SIGMA'."""
+    kind, _, rest = spec.partition(":")
+    parts = rest.split(":") if rest else []
+    if kind == "fixed" and len(parts) == 1:
+        size = parse_size(parts[0])
+        return lambda: size
+    if kind == "uniform" and len(parts) == 2:
+        low, high = parse_size(parts[0]), parse_size(parts[1])
+        return lambda: rng.randint(low, high)
+    if kind == "lognormal" and len(parts) == 2:
+        mu, sigma = math.log(max(parse_size(parts[0]), 1)), float(parts[1])
+        return lambda: int(rng.lognormvariate(mu, sigma))
+    raise HarnessError(f"Geçersiz boyut dağılımı: {spec} (fixed:S, uniform:MIN:MAX, lognormal:MEDYAN:SIGMA)")
+
+
+def parse_type_weights(spec: str) -> Tuple[List[str], List[float]]:
+    """'txt:50,jpg:10,bin:40' -> (['txt', 'jpg', 'bin'], [50, 10, 40])."""
+    types, weights = [], []
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name not in _CONTENT_GENERATORS:
+            raise HarnessError(f"Desteklenmeyen dosya türü: {name} (seçenekler: {', '.join(_CONTENT_GENERATORS)})")
+        try:
+            weights.append(float(weight or 1))
+        except ValueError:
+            raise HarnessError(f"Geçersiz ağırlık: {item}")
+        types.append(name)
+    return types, weights
+
+
+# --- İçerik Üreticileri --- #
+
+def _text_content(size: int, rng: random.Random) -> bytes:
+    lines, length = [], 0
+    while length < size:
+        line = " ".join(rng.choice(_TEXT_WORDS) for _ in range(rng.randint(3, 16)))
+        lines.append(line)
+        length += len(line.encode("utf-8")) + 1
+    return "\n".join(lines).encode("utf-8")[:size]
+
+
+def _binary_content(size: int, rng: random.Random) -> bytes:
+    return rng.randbytes(size)
+
+
+def _jpeg_content(size: int, rng: random.Random) -> bytes:
+    """Yaklaşık olarak `size` piksel alanına sahip bir JPEG (boyut yalnızca çözünürlüğü belirler)."""
+    from PyQt6.QtGui import QImage, QColor
+    from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+    side = max(16, min(MAX_IMAGE_SIDE, int(math.sqrt(max(size, 256) * 4))))
+    image = QImage(side, side * 3 // 4, QImage.Format.Format_RGB32)
+    image.fill(QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "JPG", 85)
+    return bytes(data)
+
+
+_CONTENT_GENERATORS = {
+    "txt": _text_content,
+    "jpg": _jpeg_content,
+    "bin": _binary_content,
+}
+
+
+# --- Kasa Üretimi --- #
+
+def generate_vault(vault_name: str, password: str, file_count: int, size_spec: str, type_spec: str,
+                   seed: int = 0, jobs: int = 4, cipher: Optional[str] = None) -> Dict:
+    """Gerçek ekleme yoluyla sentetik kasa üretir; istatistik sözlüğü döndürür."""
+    from ..core import vault_manager
+
+    rng = random.Random(seed)
+    sampler = make_size_sampler(size_spec, rng)
+    types, weights = parse_type_weights(type_spec)
+    if "jpg" in types:
+        _ensure_qt_application()
+
+    if vault_manager.load_vault_config(vault_name) is None:
+        if not vault_manager.create_vault(vault_name, password, cipher or vault_manager.CIPHER_AUTO):
+            raise HarnessError(f"'{vault_name}' kasası oluşturulamadı.")
+    key = vault_manager.unlock_vault(vault_name, password)
+    if not key:
+        raise HarnessError(f"'{vault_name}' kasası açılamadı (parola farklı mı?).")
+
+    # Planı tek rng ile önceden çıkar: aynı seed her zaman aynı kasayı üretir
+    plan = []
+    for index in range(file_count):
+        file_type = rng.choices(types, weights)[0]
+        plan.append((index, file_type, sampler(), rng.getrandbits(64)))
+
+    source_dir = Path(tempfile.mkdtemp(prefix="kcenc-scale-src-"))
+    stats = {"files": 0, "failed": 0, "bytes": 0}
+
+    def add_one(item) -> Optional[int]:
+        index, file_type, size, content_seed = item
+        content = _CONTENT_GENERATORS[file_type](size, random.Random(content_seed))
+        source_path = source_dir / f"file_{index:07d}.{file_type}"
+        source_path.write_bytes(content)
+        try:
+            return len(content) if vault_manager.add_file_to_vault(vault_name, key, source_path) else None
+        finally:
+            source_path.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for done, added in enumerate(executor.map(add_one, plan), 1):
+                if added is None:
+                    stats["failed"] += 1
+                else:
+                    stats["files"] += 1
+                    stats["bytes"] += added
+                if done % 1000 == 0 or done == file_count:
+                    _status(f"üretildi: {done}/{file_count} dosya")
+    finally:
+        with contextlib.suppress(OSError):
+            source_dir.rmdir()
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+# --- Ölçüm --- #
+
+def _reset_peak_rss() -> bool:
+    """Linux'ta süreç tepe RSS'ini (VmHWM) sıfırlar; başka platformlarda False."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024 # Linux'ta KiB, macOS'ta byte
+
+
+def measure(action: Callable[[], None], is_done: Callable[[], bool],
+            timeout: float = SCENARIO_TIMEOUT_SECONDS) -> Dict:
+    """Eylemi olay döngüsü içinde çalıştırır ve is_done() True olana kadar bekler.
+
+    Arayüz thread'inde HEARTBEAT_INTERVAL_MS aralıklı bir zamanlayıcı çalışır; iki
+    nabız arasındaki UI_BLOCK_THRESHOLD_MS'den uzun boşluklar bloke süre sayılır
+    (eşzamanlı eylemin kendisi ve sonrasında olay döngüsünü tutan işler dahil).
+    """
+    from PyQt6.QtCore import QEventLoop, QTimer, Qt
+
+    loop = QEventLoop()
+    result = {"ui_block_ms": 0.0, "ui_block_max_ms": 0.0, "ui_blocks": 0, "error": None, "timed_out": False}
+    state = {"last": 0.0, "action_done": False}
+
+    def record_gap(now: float):
+        gap_ms = (now - state["last"]) * 1000
+        state["last"] = now
+        if gap_ms > UI_BLOCK_THRESHOLD_MS:
+            result["ui_block_ms"] += gap_ms - HEARTBEAT_INTERVAL_MS
+            result["ui_block_max_ms"] = max(result["ui_block_max_ms"], gap_ms)
+            result["ui_blocks"] += 1
+
+    def heartbeat():
+        now = time.perf_counter()
+        record_gap(now)
+        if state["action_done"] and is_done():
+            loop.quit()
+        elif now - started > timeout:
+            result["timed_out"] = True
+            loop.quit()
+
+    def run_action():
+        try:
+            action()
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        state["action_done"] = True
+
+    timer = QTimer()
+    timer.setTimerType(Qt.TimerType.PreciseTimer)
+    timer.setInterval(HEARTBEAT_INTERVAL_MS)
+    timer.timeout.connect(heartbeat)
+
+    peak_resettable = _reset_peak_rss()
+    started = state["last"] = time.perf_counter()
+    timer.start()
+    QTimer.singleShot(0, run_action)
+    loop.exec()
+    timer.stop()
+    record_gap(time.perf_counter())
+    result["wall_s"] = time.perf_counter() - started
+    result["peak_rss_mib"] = _peak_rss_bytes() / (1024 * 1024)
+    result["peak_rss_is_process_peak"] = not peak_resettable
+    return result
+
+
+# --- Senaryolar --- #
+
+class ScenarioContext:
+    """Senaryoların paylaştığı pencere, kasa bilgisi ve yapay diyalog cevapları."""
+
+    def __init__(self, window, vault_name: str, password: str, work_dir: Path, seed: int):
+        self.window = window
+        self.vault_name = vault_name
+        self.password = password
+        self.work_dir = work_dir
+        self.rng = random.Random(seed)
+        self.dialog_paths: List[str] = [] # QFileDialog.selectedFiles() cevabı
+        self.messages: List[Tuple[str, str]] = []
+
+    @property
+    def view(self):
+        return self.window.unlocked_vault_view
+
+    def pick_file(self, extension: str) -> Optional[str]:
+        """Verilen uzantıdaki en büyük dosyanın ID'si (en kötü durum önizlemesi)."""
+        from ..core import vault_manager
+        candidates = [f for f in vault_manager.list_files_in_vault(self.vault_name)
+                      if (f.get('file_type') or '').lower() == extension]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda f: f.get('size_bytes') or 0)['id']
+
+    def background_work_done(self) -> bool:
+        """Önizleme işçi thread'leri (örn. resim decode) bitti mi?"""
+        from PyQt6.QtCore import QThread
+        return all(not thread.isRunning() for thread in self.view.findChildren(QThread))
+
+
+def _install_dialog_answers(ctx: ScenarioContext):
+    """Modal diyalogları otomatik cevaplar: dosya seçimi ctx.dialog_paths, mesajlar kaydedilir."""
+    from PyQt6.QtWidgets import QFileDialog, QMessageBox
+
+    def record(level):
+        def show(parent, title, text, *args, **kwargs):
+            ctx.messages.append((level, f"{title}: {text}"))
+            return QMessageBox.StandardButton.Yes
+        return staticmethod(show)
+
+    QFileDialog.exec = lambda self: 1
+    QFileDialog.selectedFiles = lambda self: list(ctx.dialog_paths)
+    QMessageBox.information = record("info")
+    QMessageBox.warning = record("warning")
+    QMessageBox.critical = record("error")
+    QMessageBox.question = record("question")
+
+
+def _scenario_unlock(ctx: ScenarioContext):
+    ctx.window.lock_all_vaults()
+    return lambda: ctx.window.unlock_vault(ctx.vault_name, ctx.password), lambda: True
+
+
+def _scenario_refresh(ctx: ScenarioContext):
+    return ctx.view.refresh_file_list, lambda: True
+
+
+def _show_preview_scenario(extension: str):
+    def scenario(ctx: ScenarioContext):
+        from ..core import vault_manager
+        file_id = ctx.pick_file(extension)
+        if file_id is None:
+            return None
+        # Şifre çözme ölçüme dahil değil: yalnızca show_preview'ın maliyeti
+        data = vault_manager.get_decrypted_file_data(ctx.vault_name, ctx.window._vault_key, file_id)
+        return lambda: ctx.view.show_preview(file_id, data), ctx.background_work_done
+    return scenario
+
+
+def _view_scenario(extension: str):
+    def scenario(ctx: ScenarioContext):
+        file_id = ctx.pick_file(extension)
+        if file_id is None:
+            return None
+        return lambda: ctx.window.view_file(file_id), ctx.background_work_done
+    return scenario
+
+
+def _scenario_save_as(ctx: ScenarioContext):
+    file_id = ctx.pick_file(".bin") or ctx.pick_file(".txt") or ctx.pick_file(".jpg")
+    if file_id is None:
+        return None
+    target = ctx.work_dir / "saved.out"
+    ctx.dialog_paths = [str(target)]
+
+    def action():
+        ctx.window.save_file_as(file_id)
+        target.unlink(missing_ok=True)
+    return action, lambda: True
+
+
+def _scenario_add_files(ctx: ScenarioContext):
+    paths = []
+    for index in range(10):
+        path = ctx.work_dir / f"added_{time.time_ns()}_{index}.txt"
+        path.write_bytes(_text_content(256 * 1024, ctx.rng))
+        paths.append(str(path))
+    ctx.dialog_paths = paths
+
+    def action():
+        ctx.window.add_file()
+        for path in paths:
+            Path(path).unlink(missing_ok=True)
+    return action, lambda: True
+
+
+SCENARIOS = {
+    "unlock": _scenario_unlock,
+    "refresh": _scenario_refresh,
+    "show_preview_text": _show_preview_scenario(".txt"),
+    "show_preview_image": _show_preview_scenario(".jpg"),
+    "view_text": _view_scenario(".txt"),
+    "view_image": _view_scenario(".jpg"),
+    "view_bin": _view_scenario(".bin"),
+    "save_as": _scenario_save_as,
+    "add_files": _scenario_add_files,
+}
+
+
+def run_scenarios(vault_name: str, password: str, scenario_names: List[str], repeat: int = 1,
+                  seed: int = 0) -> List[Dict]:
+    """MainWindow'u açıp kasanın kilidini açar ve senaryoları sırayla ölçer."""
+    app = _ensure_qt_application()
+    from ..core.database_manager import get_vault_stats
+    from ..gui.main_window import MainWindow
+
+    stats = get_vault_stats(vault_name)
+    window = MainWindow()
+    window.show()
+    app.processEvents()
+    work_dir = Path(tempfile.mkdtemp(prefix="kcenc-scale-work-"))
+    ctx = ScenarioContext(window, vault_name, password, work_dir, seed)
+    _install_dialog_answers(ctx)
+
+    window.unlock_vault(vault_name, password)
+    if not window._vault_key:
+        raise HarnessError(f"'{vault_name}' kasası açılamadı.")
+
+    results = []
+    try:
+        for name in scenario_names:
+            for run in range(1, repeat + 1):
+                prepared = SCENARIOS[name](ctx)
+                if prepared is None:
+                    _status(f"{name}: uygun dosya yok, atlandı")
+                    break
+                action, is_done = prepared
+                ctx.messages.clear()
+                result = measure(action, is_done)
+                result.update(scenario=name, run=run)
+                errors = [text for level, text in ctx.messages if level in ("warning", "error")]
+                if errors and not result["error"]:
+                    result["error"] = errors[0]
+                results.append(result)
+                _status(f"{name} #{run}: {result['wall_s'] * 1000:.0f} ms, "
+                        f"UI bloke {result['ui_block_ms']:.0f} ms, tepe RSS {result['peak_rss_mib']:.0f} MiB")
+    finally:
+        window.close()
+        app.processEvents()
+        with contextlib.suppress(OSError):
+            work_dir.rmdir()
+    if stats:
+        for result in results:
+            result["vault_files"] = stats.get("file_count")
+    return results
+
+
+# --- Çıktı --- #
+
+def summarize(results: List[Dict]) -> List[Dict]:
+    """Senaryo başına medyan süre/bloke süre ve en yüksek RSS."""
+    summary = []
+    for name in dict.fromkeys(r["scenario"] for r in results):
+        runs = [r for r in results if r["scenario"] == name]
+        summary.append({
+            "scenario": name,
+            "runs": len(runs),
+            "wall_ms_median": round(statistics.median(r["wall_s"] for r in runs) * 1000, 1),
+            "ui_block_ms_median": round(statistics.median(r["ui_block_ms"] for r in runs), 1),
+            "ui_block_max_ms": round(max(r["ui_block_max_ms"] for r in runs), 1),
+            "peak_rss_mib_max": round(max(r["peak_rss_mib"] for r in runs), 1),
+            "errors": sum(1 for r in runs if r["error"] or r["timed_out"]),
+        })
+    return summary
+
+
+def _print_table(summary: List[Dict], out):
+    header = f"{'senaryo':<20} {'tekrar':>6} {'süre ms':>10} {'UI bloke ms':>12} {'en uzun blok':>13} {'tepe RSS MiB':>13} {'hata':>5}"
+    out.write(header + "\n" + "-" * len(header) + "\n")
+    for s in summary:
+        out.write(f"{s['scenario']:<20} {s['runs']:>6} {s['wall_ms_median']:>10.1f} {s['ui_block_ms_median']:>12.1f} "
+                  f"{s['ui_block_max_ms']:>13.1f} {s['peak_rss_mib_max']:>13.1f} {s['errors']:>5}\n")
+
+
+def _status(message: str):
+    print(f"scale-harness: {message}", file=sys.__stderr__)
+
+
+def _ensure_qt_application():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([sys.argv[0]])
+
+
+# --- Komut Satırı --- #
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="kcEnc.tools.scale_harness",
+                                     description="Sentetik kasa üretir ve başsız arayüz senaryolarını ölçer.")
+    parser.add_argument("--home", help="Kasaların oluşturulacağı HOME dizini (varsayılan: geçici dizin)")
+    parser.add_argument("--vault", default=DEFAULT_VAULT_NAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yaz")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Çekirdek log mesajlarını stderr'e yaz")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_generate_options(p):
+        p.add_argument("--files", type=int, default=1000, help="Üretilecek dosya sayısı")
+        p.add_argument("--sizes", default=DEFAULT_SIZES,
+                       help="Boyut dağılımı: fixed:S, uniform:MIN:MAX, lognormal:MEDYAN:SIGMA (K/M/G kabul edilir)")
+        p.add_argument("--types", default=DEFAULT_TYPES, help="Tür ağırlıkları, örn. txt:50,jpg:10,bin:40")
+        p.add_argument("--cipher", help="Kasa algoritması (varsayılan: hız testiyle otomatik)")
+        p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+
+    def add_run_options(p):
+        p.add_argument("--scenarios", default=DEFAULT_SCENARIOS,
+                       help=f"Virgülle ayrılmış senaryolar ({', '.join(SCENARIOS)})")
+        p.add_argument("--repeat", type=int, default=1)
+
+    add_generate_options(subparsers.add_parser("generate", help="Sentetik kasa üret"))
+    add_run_options(subparsers.add_parser("run", help="Mevcut kasada senaryoları ölç"))
+    p = subparsers.add_parser("all", help="Kasa üret ve senaryoları ölç")
+    add_generate_options(p)
+    add_run_options(p)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    home = Path(args.home) if args.home else Path(tempfile.mkdtemp(prefix="kcenc-scale-home-"))
+    home.mkdir(parents=True, exist_ok=True)
+    os.environ["HOME"] = str(home) # Kasa dizini Path.home() altında; gerçek kasalara dokunulmaz
+    _status(f"HOME={home}")
+
+    output = {}
+    log_target = sys.stderr if args.verbose else open(os.devnull, 'w')
+    try:
+        with contextlib.redirect_stdout(log_target):
+            if args.command in ("run", "all"):
+                scenario_names = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+                unknown = [s for s in scenario_names if s not in SCENARIOS]
+                if unknown:
+                    raise HarnessError(f"Bilinmeyen senaryo: {', '.join(unknown)}")
+            if args.command in ("generate", "all"):
+                output["generate"] = generate_vault(args.vault, args.password, args.files, args.sizes, args.types,
+                                                    seed=args.seed, jobs=max(1, args.jobs), cipher=args.cipher)
+                _status(f"kasa üretildi: {output['generate']}")
+            if args.command in ("run", "all"):
+                results = run_scenarios(args.vault, args.password, scenario_names, max(1, args.repeat), args.seed)
+                output["results"] = results
+                output["summary"] = summarize(results)
+    except HarnessError as e:
+        print(f"scale-harness: hata: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if log_target is not sys.stderr:
+            log_target.close()
+
+    if args.json:
+        json.dump(output, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    elif "summary" in output:
+        _print_table(output["summary"], sys.stdout)
+    failed = any(s["errors"] for s in output.get("summary", []))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
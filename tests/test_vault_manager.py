@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from kcEnc.core import vault_manager  # noqa: E402
+from kcEnc.core.crypto_utils import STREAM_CHUNK_SIZE  # noqa: E402
+from kcEnc.core.progress import ProgressToken  # noqa: E402
+
+
+class DecryptWithProgressTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_home = os.environ.get("HOME")
+        os.environ["HOME"] = self._tmp.name
+
+    def tearDown(self):
+        vault_manager.lock_vault("Test")
+        if self._old_home is None:
+            os.environ.pop("HOME", None)
+        else:
+            os.environ["HOME"] = self._old_home
+        self._tmp.cleanup()
+
+    def test_multi_chunk_file_decrypts_same_with_and_without_token(self):
+        # Parçalı akışın blokları tek bir havuz tamponuna yazılır; ilerleme
+        # token'ı verilen yol her bloğu kopyalamazsa çıktı bozulur
+        data = os.urandom(STREAM_CHUNK_SIZE * 3 + 1234)
+        source = Path(self._tmp.name) / "big.bin"
+        source.write_bytes(data)
+
+        self.assertTrue(vault_manager.create_vault("Test", "pw"))
+        key = vault_manager.unlock_vault("Test", "pw")
+        self.assertIsNotNone(key)
+        file_id = vault_manager.add_file_to_vault("Test", key, source)
+        self.assertTrue(file_id)
+
+        without_token = vault_manager.get_decrypted_file_data("Test", key, file_id)
+        token = ProgressToken()
+        with_token = vault_manager.get_decrypted_file_data("Test", key, file_id, token)
+
+        self.assertEqual(without_token, data)
+        self.assertEqual(with_token, data)
+
+
+if __name__ == "__main__":
+    unittest.main()